@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""
+Difficoltà adattiva di Deutschland B2.
+
+Le risposte aggiornano due tabelle di accuratezza per elemento (la chiave è
+quella del ripasso, es. "vocabulary:Lager" o
+"grammar:grammatica-03-verbo-sein-presente"):
+
+* quella dello studente, salvata insieme al suo progresso;
+* quella della popolazione, condivisa da tutti gli studenti dello stesso
+  processo (utile nel server), usata finché lo studente non ha ancora
+  risposto su quell'elemento.
+
+Ogni tabella tiene i contatori in due array compatti (4 byte per elemento e
+contatore) e un dizionario chiave -> posizione, quindi registrare una
+risposta costa O(1) indipendentemente da quanti elementi o studenti ci sono.
+
+L'accuratezza (smussata verso 0.5 finché i tentativi sono pochi) decide:
+
+* se un elemento è ormai facile, e merita distrattori più insidiosi;
+* se è debole, e va riproposto a fine sessione.
+"""
+
+from array import array
+
+HARD_FROM = 0.8    # accuratezza da cui si passa ai distrattori difficili
+WEAK_BELOW = 0.5   # sotto questa soglia l'elemento viene riproposto
+PRIOR_WEIGHT = 2   # tentativi fittizi al 50 % che smussano i primi risultati
+
+
+class AccuracyTable:
+    """Attempts and correct answers per key, in compact arrays."""
+
+    __slots__ = ("slots", "keys", "attempts", "correct")
+
+    def __init__(self):
+        self.slots = {}
+        self.keys = []
+        self.attempts = array("I")
+        self.correct = array("I")
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _slot(self, key):
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = len(self.keys)
+            self.keys.append(key)
+            self.attempts.append(0)
+            self.correct.append(0)
+        return slot
+
+    def record(self, key, ok):
+        slot = self._slot(key)
+        self.attempts[slot] += 1
+        if ok:
+            self.correct[slot] += 1
+
+    def counts(self, key):
+        """Return (attempts, correct) for ``key``."""
+        slot = self.slots.get(key)
+        if slot is None:
+            return 0, 0
+        return self.attempts[slot], self.correct[slot]
+
+    def accuracy(self, key):
+        """Smoothed accuracy of ``key``, or None if it was never answered."""
+        attempts, correct = self.counts(key)
+        if not attempts:
+            return None
+        return (correct + 0.5 * PRIOR_WEIGHT) / (attempts + PRIOR_WEIGHT)
+
+    def to_json(self):
+        return {key: [self.attempts[i], self.correct[i]] for i, key in enumerate(self.keys)}
+
+    @classmethod
+    def from_json(cls, data):
+        table = cls()
+        for key, (attempts, correct) in data.items():
+            slot = table._slot(key)
+            table.attempts[slot] = attempts
+            table.correct[slot] = correct
+        return table
+
+
+def item_key(question_id):
+    """The review key a question ID belongs to ("vocabulary:Lager:plural" -> "vocabulary:Lager")."""
+    return question_id.rsplit(":", 1)[0]
+
+
+def accuracy(learner, population, key):
+    """The learner's accuracy on ``key``, falling back to the population's."""
+    acc = learner.accuracy(key)
+    return population.accuracy(key) if acc is None else acc
+
+
+def is_mastered(acc):
+    return acc is not None and acc >= HARD_FROM
+
+
+def is_weak(acc):
+    return acc is not None and acc < WEAK_BELOW
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Correzione in blocco di fogli di risposte registrati.
+
+Ogni file di input contiene un foglio per riga (JSON), ad esempio:
+
+    {"sheet": "turno-3/anna", "learner": "anna", "track": "grammar", "level": 7,
+     "answers": ["den Hund"]}
+    {"sheet": "k12-0042", "track": "vocabulary", "level": 2, "seed": 42,
+     "answers": ["Paletten", "die", "pallet"]}
+
+"track" è vocabulary, grammar o comprehension; "level" è il numero del
+livello a partire da 0; ogni risposta è il testo dell'opzione scelta o il suo
+indice. "seed" rende riproducibili le domande generate a caso. I fogli dello
+stesso "learner" condividono un progresso in memoria, nell'ordine dei file.
+
+Le sessioni sono le stesse del gioco, guidate da engine.BatchIO senza
+alcun I/O interattivo; il risultato è una riga JSON per foglio:
+
+    python3 batch_grade.py fogli/*.jsonl -o risultati.jsonl
+"""
+
+import argparse
+import functools
+import json
+import random
+import sys
+import time
+
+import game_cli
+from engine import BatchIO, ResultCollector, run_session
+from progress_store import default_progress
+
+SESSIONS = {
+    "vocabulary": game_cli.vocab_level_session,
+    # i fogli registrano le risposte alle sole domande fisse dei livelli,
+    # senza esercizi generati né frasi da completare
+    "grammar": functools.partial(game_cli.grammar_level_session, drills=0),
+    "comprehension": functools.partial(game_cli.comprehension_level_session, cloze=0),
+}
+
+
+def new_progress():
+    progress = default_progress()
+    game_cli.upgrade_progress(progress)
+    return progress
+
+
+def sheet_error(sheet):
+    """Why ``sheet`` cannot be graded, or None."""
+    if not isinstance(sheet, dict):
+        return "il foglio non è un oggetto JSON"
+    if "error" in sheet:
+        return sheet["error"]
+    learner = sheet.get("learner")
+    if learner is not None and not isinstance(learner, str):
+        return f"studente non valido: {learner!r}"
+    if not isinstance(sheet.get("answers", []), list):
+        return "\"answers\" deve essere una lista"
+    if "seed" in sheet and not isinstance(sheet["seed"], (int, str)):
+        return f"seed non valido: {sheet['seed']!r}"
+    return None
+
+
+def grade_sheet(sheet, progress):
+    """Grade one answer sheet; returns its result dict (with "error" on bad input)."""
+    error = sheet_error(sheet)
+    if not isinstance(sheet, dict):
+        return {"sheet": None, "learner": None, "error": error}
+    result = {"sheet": sheet.get("sheet"), "learner": sheet.get("learner")}
+    if error is not None:
+        result["error"] = error
+        return result
+    track = sheet.get("track")
+    level = sheet.get("level")
+    if track not in SESSIONS:
+        result["error"] = f"percorso sconosciuto: {track!r}"
+        return result
+    session = SESSIONS[track]
+    if game_cli.get_registry(track).get(level) is None:
+        result["error"] = f"livello non valido: {level!r}"
+        return result
+    if "seed" in sheet:
+        random.seed(sheet["seed"])
+    collector = ResultCollector()
+    run_session(session(level, progress, adaptive=False), progress, collector, BatchIO(sheet.get("answers", [])))
+    result.update(collector.results[-1])
+    # Il foglio indica il livello per posizione: lo si riporta così com'è.
+    result["level"] = level
+    return result
+
+
+def iter_sheets(paths):
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for lineno, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    sheet = json.loads(line)
+                except ValueError:
+                    yield {"sheet": f"{path}:{lineno}", "error": "riga JSON non valida"}
+                    continue
+                if not isinstance(sheet, dict):
+                    sheet = {"sheet": f"{path}:{lineno}", "error": sheet_error(sheet)}
+                yield sheet
+
+
+def grade_files(paths, out):
+    """Grade every sheet in ``paths``, writing one JSON line per sheet to ``out``."""
+    learners = {}
+    count = 0
+    for sheet in iter_sheets(paths):
+        learner = sheet.get("learner")
+        # uno studente non valido viene segnalato da grade_sheet
+        if not learner or not isinstance(learner, str):
+            progress = new_progress()
+        elif learner in learners:
+            progress = learners[learner]
+        else:
+            progress = learners[learner] = new_progress()
+        out.write(json.dumps(grade_sheet(sheet, progress), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Corregge in blocco fogli di risposte di Deutschland B2")
+    parser.add_argument("files", nargs="+", help="file JSON lines con un foglio per riga")
+    parser.add_argument("-o", "--output", help="file dei risultati (predefinito: standard output)")
+    args = parser.parse_args()
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        count = grade_files(args.files, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"{count} fogli corretti in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark riproducibili per Deutschland B2.
+
+Per ogni scala richiesta (numero di vocaboli; i livelli di grammatica e
+comprensione e la cronologia del progresso crescono in proporzione) il
+benchmark sintetizza un catalogo e un file di progresso, poi misura senza
+alcun I/O interattivo e con un generatore casuale fissato:
+
+* generate_vocab_questions – generazione delle domande di un vocabolo;
+* vocab_questions          – le stesse domande servite dalla banca (LRU);
+* daily_review             – una sessione di ripasso completa (BatchIO);
+* choose_level             – visualizzazione del menu dei livelli;
+* load_progress / save_progress – caricamento e salvataggio del progresso;
+* journal_review           – un ripasso registrato nel giornale
+  (JournalProgressStore, compattazioni periodiche comprese);
+* grammar_drill            – generazione di un esercizio di grammatica
+  (grammar_drills.py) di un tipo a caso.
+
+Per ciascuna misura riporta throughput (operazioni al secondo), latenze
+p50/p95/p99 e picco di memoria allocata (tracemalloc). I risultati possono
+essere salvati come riferimento e confrontati in seguito:
+
+    python3 benchmark.py --scales 100,10000 --save-baseline bench_base.json
+    python3 benchmark.py --scales 100,10000 --compare bench_base.json
+    python3 benchmark.py --scales 100,10000,1000000      # richiede molta RAM
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import game_cli
+from engine import BatchIO, ResultCollector, run_session
+from grammar_drills import DRILL_KINDS
+from progress_store import JournalProgressStore, JsonProgressStore, default_progress
+from records import ComprehensionLevel, GrammarLevel, VocabularyItem, VocabularyLevel
+from scheduler import review_key
+
+DEFAULT_SCALES = (100, 10_000)
+ARTICLES = ("der", "die", "das")
+PLURAL_ENDINGS = ("e", "en", "er", "s", "n", "")
+
+
+# ---------------------- DATI SINTETICI ---------------------- #
+def synth_catalogue(n, rng):
+    """A catalogue with ``n`` words, one vocabulary level per word."""
+    vocab = [
+        VocabularyItem(f"Wort{i}", f"Wort{i}{rng.choice(PLURAL_ENDINGS)}", rng.choice(ARTICLES), f"parola {i}")
+        for i in range(n)
+    ]
+    n_levels = max(1, n // 10)
+    question = {"question": "Domanda?", "options": ["a", "b", "c"], "correct_index": 0}
+    half = n // 2
+    return {
+        "warehouse_vocab": vocab[:half],
+        "general_vocab": vocab[half:],
+        "vocabulary_levels": [VocabularyLevel(f"Vocabolario {i + 1:06d}", [it]) for i, it in enumerate(vocab)],
+        "grammar_levels": [
+            GrammarLevel(f"Grammatica {i + 1:06d}", "Regola.", [question]) for i in range(n_levels)
+        ],
+        "comprehension_levels": [
+            ComprehensionLevel(f"Comprensione {i + 1:06d}", "Text.", [question, question]) for i in range(n_levels)
+        ],
+    }
+
+
+def synth_progress(catalogue, rng, now):
+    """Progress of a learner who completed half of every track, all reviews due."""
+    progress = default_progress()
+    vocab_levels = catalogue["vocabulary_levels"]
+    for i in range(0, len(vocab_levels), 2):
+        progress["vocabulary_completed"].append(vocab_levels[i].key)
+        progress["review_vocab"].append(vocab_levels[i].items[0].word)
+    for key, review, track in (
+        ("grammar_completed", "review_grammar", "grammar_levels"),
+        ("comprehension_completed", "review_comp", "comprehension_levels"),
+    ):
+        for i in range(0, len(catalogue[track]), 2):
+            progress[key].append(catalogue[track][i].key)
+            progress[review].append(catalogue[track][i].key)
+    srs = progress["srs"]
+    for track, key in (("vocabulary", "review_vocab"), ("grammar", "review_grammar"), ("comprehension", "review_comp")):
+        for item_id in progress[key]:
+            srs[review_key(track, item_id)] = [2.5, 1, 1, int(now - rng.randrange(1, 30 * 86400))]
+    return progress
+
+
+# ---------------------- MISURE ---------------------- #
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def measure(op, min_time, max_reps):
+    """Run ``op`` repeatedly; returns latencies in seconds."""
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < max_reps and (not latencies or time.perf_counter() - started < min_time):
+        t0 = time.perf_counter()
+        op()
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def peak_memory(op):
+    tracemalloc.start()
+    try:
+        op()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(latencies, peak):
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "reps": len(latencies),
+        "ops_per_s": len(latencies) / total if total else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+@contextlib.contextmanager
+def headless(answer="b"):
+    """Silence stdout and answer every input() prompt with ``answer``."""
+    real_input = builtins.input
+    builtins.input = lambda prompt="": answer
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = real_input
+
+
+def run_scale(n, seed, min_time, workdir):
+    rng = random.Random(seed)
+    random.seed(seed)
+    now = time.time()
+    catalogue = synth_catalogue(n, rng)
+    game_cli.install_catalogue(catalogue)
+    vocab = catalogue["warehouse_vocab"] + catalogue["general_vocab"]
+
+    store = JsonProgressStore(os.path.join(workdir, f"progress_{n}.json"))
+    store.save(synth_progress(catalogue, rng, now))
+    game_cli.set_progress_store(store)
+    progress = game_cli.load_progress(store)
+    answers = (rng.randrange(3) for _ in iter(int, 1))
+    collector = ResultCollector()
+
+    def gen_questions():
+        game_cli.generate_vocab_questions(vocab[rng.randrange(len(vocab))])
+
+    def bank_questions():
+        game_cli.vocab_questions(vocab[rng.randrange(len(vocab))])
+
+    def review():
+        run_session(game_cli.daily_review_session(progress), progress, collector, BatchIO(answers))
+
+    def menu():
+        with headless():
+            registry = game_cli.get_registry("vocabulary")
+            game_cli.choose_level(registry, registry.completed(progress))
+
+    def load():
+        game_cli.load_progress(JsonProgressStore(store.path))
+
+    def save():
+        # una modifica reale a ogni giro, altrimenti il salvataggio viene saltato
+        progress["last_review"] = str(time.perf_counter())
+        game_cli.save_progress(progress)
+
+    journal = JournalProgressStore(os.path.join(workdir, f"progress_{n}_journal.json"))
+    journal.save(progress)
+    srs_keys = list(progress["srs"])
+
+    def journal_review():
+        progress["last_review"] = str(time.perf_counter())
+        journal.record_review(progress, [srs_keys[rng.randrange(len(srs_keys))]])
+
+    drills = game_cli.get_drill_generator()
+
+    def drill():
+        drills.question(DRILL_KINDS[rng.randrange(len(DRILL_KINDS))], rng)
+
+    # ogni sessione riprogramma fino a 6 elementi scaduti: ci si ferma a metà della scorta
+    review_reps = max(1, len(progress["srs"]) // (2 * game_cli.REVIEW_SESSION_SIZE))
+    ops = (
+        ("generate_vocab_questions", gen_questions, 100_000),
+        ("vocab_questions", bank_questions, 100_000),
+        ("daily_review", review, min(2_000, review_reps)),
+        ("choose_level", menu, 200),
+        ("load_progress", load, 200),
+        ("save_progress", save, 200),
+        ("journal_review", journal_review, 2_000),
+        ("grammar_drill", drill, 100_000),
+    )
+    results = {}
+    for name, op, max_reps in ops:
+        peak = peak_memory(op)
+        results[name] = summarize(measure(op, min_time, max_reps), peak)
+    return results
+
+
+# ---------------------- CONFRONTO ---------------------- #
+def compare(current, baseline, tolerance):
+    """Return regression messages: p50 latency worse than the baseline by > tolerance."""
+    regressions = []
+    for scale, ops in current.items():
+        for name, stats in ops.items():
+            base = baseline.get(scale, {}).get(name)
+            if not base or not base["p50_ms"]:
+                continue
+            ratio = stats["p50_ms"] / base["p50_ms"]
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{name} @ {scale}: p50 {stats['p50_ms']:.3f} ms contro {base['p50_ms']:.3f} ms (x{ratio:.2f})"
+                )
+    return regressions
+
+
+def print_table(results):
+    print(f"{'scala':>9}  {'operazione':<26}{'op/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'picco KiB':>12}")
+    for scale, ops in results.items():
+        for name, s in ops.items():
+            print(
+                f"{scale:>9}  {name:<26}{s['ops_per_s']:>12.1f}{s['p50_ms']:>10.3f}"
+                f"{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}{s['peak_kib']:>12.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark di Deutschland B2")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="numeri di vocaboli separati da virgola (es. 100,10000,1000000)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--min-time", type=float, default=0.5, help="secondi minimi per misura")
+    parser.add_argument("--json", help="scrive i risultati in questo file")
+    parser.add_argument("--save-baseline", help="salva i risultati come riferimento")
+    parser.add_argument("--compare", help="confronta con un riferimento salvato")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="peggioramento relativo della p50 tollerato nel confronto")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in scales:
+            results[str(n)] = run_scale(n, args.seed, args.min_time, workdir)
+    print_table(results)
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for msg in regressions:
+            print(f"REGRESSIONE {msg}")
+        if regressions:
+            sys.exit(1)
+        print("Nessuna regressione rispetto al riferimento.")
+
+
+if __name__ == "__main__":
+    main()
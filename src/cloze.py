@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+"""
+Esercizi di completamento (cloze) dai testi di comprensione di Deutschland B2.
+
+Ogni brano viene diviso in frasi e parole una volta sola, la prima volta che
+serve; per ogni parola si ricordano la posizione nella frase e la categoria,
+quando si riconosce:
+
+* sostantivo – una parola con l'iniziale maiuscola che non apre la frase:
+  un vocabolo del catalogo (singolare o plurale, scritto come nel catalogo,
+  quindi il verbo "arbeiten" non è il plurale di Arbeit) o un altro nome;
+* articolo – der, die, das, den, dem, des, ein, eine... (mai come distrattori
+  gli articoli dello stesso genere e caso: per "einem" né "dem" né "einem");
+* preposizione – in, an, auf, mit, nach...
+
+Una domanda toglie dalla frase una di queste parole e propone come
+distrattori altre parole della stessa categoria: per i vocaboli la stessa
+forma (i singolari con lo stesso articolo, i plurali tra i plurali), per gli
+altri sostantivi prima quelli dello stesso brano. Se davanti al sostantivo
+c'è un articolo (anche dopo uno o due aggettivi, o contratto: im, zur...),
+i distrattori sono sostantivi che lo accettano: per "im _____" solo
+maschili e neutri. La risposta quindi non si indovina dalla grammatica:
+bisogna ricordare il testo.
+
+Le domande si generano in tempo costante rispetto alla dimensione del
+catalogo, quindi ogni sessione può averne di nuove.
+"""
+
+import random
+import re
+
+from grammar_drills import DEFINITE, INDEFINITE, PLURAL
+from passage_index import split_sentences
+
+GAP = "_____"
+ARTICLES = ("der", "die", "das", "den", "dem", "des", "ein", "eine", "einen", "einem", "einer", "eines")
+PREPOSITIONS = (
+    "an", "auf", "aus", "bei", "durch", "für", "gegen", "hinter", "in", "mit", "nach",
+    "neben", "ohne", "seit", "über", "um", "unter", "von", "vor", "zu", "zwischen",
+)
+# maiuscole a metà frase che non sono sostantivi (forma di cortesia)
+_NOT_NOUNS = frozenset(("sie", "ihr", "ihre", "ihnen", "ihren", "ihrem", "ihrer"))
+# preposizione + articolo determinativo
+CONTRACTIONS = {"im": "dem", "am": "dem", "vom": "dem", "zum": "dem", "beim": "dem", "zur": "der", "ins": "das", "ans": "das"}
+_ADJECTIVE_ENDINGS = ("e", "en", "em", "er", "es")
+_WORD = re.compile(r"\w+")
+_ARTICLES = frozenset(ARTICLES)
+_PREPOSITIONS = frozenset(PREPOSITIONS)
+
+
+def _article_slots():
+    # articolo -> (genere, caso) in cui si usa; "der" è maschile nominativo
+    # ma anche femminile dativo e genitivo e plurale genitivo
+    slots = {}
+    for gender in DEFINITE:
+        for case, (definite, indefinite) in enumerate(zip(DEFINITE[gender], INDEFINITE[gender])):
+            slots.setdefault(definite, set()).add((gender, case))
+            slots.setdefault(indefinite, set()).add((gender, case))
+    for case, definite in enumerate(PLURAL):
+        slots.setdefault(definite, set()).add(("plural", case))
+    return slots
+
+
+ARTICLE_SLOTS = _article_slots()
+# articolo -> generi (o "plural") dei sostantivi che può precedere
+ARTICLE_GENDERS = {article: frozenset(g for g, _ in slots) for article, slots in ARTICLE_SLOTS.items()}
+
+
+def _determiner(tokens, i):
+    """The article in front of the noun ``tokens[i]`` (lower case, contractions
+    resolved), skipping up to two adjectives, or None."""
+    for token in reversed(tokens[max(0, i - 3):i]):
+        low = token.lower()
+        if low in _ARTICLES:
+            return low
+        if low in CONTRACTIONS:
+            return CONTRACTIONS[low]
+        if not (token.islower() and token.endswith(_ADJECTIVE_ENDINGS)):
+            return None
+    return None
+
+
+def _sample_other(pool, answer, k, rng):
+    """Up to ``k`` distinct values of ``pool`` other than ``answer`` (case-insensitive)."""
+    picks = rng.sample(pool, min(len(pool), k + 1))
+    low = answer.lower()
+    return [p for p in picks if p.lower() != low][:k]
+
+
+def _like(word, model):
+    # "Die" a inizio frase: i distrattori prendono la stessa maiuscola
+    return word[:1].upper() + word[1:] if model[:1].isupper() else word
+
+
+class ClozeIndex:
+    """Gaps of the comprehension passages and the distractor pools per category."""
+
+    def __init__(self, levels, vocab=()):
+        self.levels = levels
+        # forma, con le maiuscole -> categoria del sostantivo ("der"/"die"/"das" o "plural")
+        self.noun_forms = {}
+        singulars = {}
+        plurals = {}
+        # vocaboli con il plurale uguale al singolare (der/die Lagerarbeiter)
+        self.invariant = set()
+        for it in vocab:
+            self.noun_forms.setdefault(it.word, it.article)
+            singulars.setdefault(it.article, {})[it.word] = None
+            if it.plural != it.word:
+                self.noun_forms.setdefault(it.plural, "plural")
+                plurals[it.plural] = None
+            else:
+                self.invariant.add(it.word)
+        self.pools = {article: list(words) for article, words in singulars.items()}
+        self.pools["plural"] = list(plurals)
+        self.pools["noun"] = [w for words in singulars.values() for w in words]
+        # articolo -> vocaboli che può precedere
+        for article, genders in ARTICLE_GENDERS.items():
+            pool = [w for g in sorted(genders - {"plural"}) for w in self.pools.get(g, ())]
+            if "plural" in genders:
+                # "den" al plurale è solo dativo: den Paletten, non den Pakete
+                dative = ARTICLE_SLOTS[article] & {("plural", c) for c in range(4)} == {("plural", 2)}
+                pool += [w for w in self.pools["plural"] if not dative or w.endswith(("n", "s"))]
+            self.pools["noun:" + article] = pool
+        # livello -> (buchi, sostantivi del brano che non sono vocaboli per articolo)
+        self._levels = {}
+
+    def _category(self, token, first, article=None):
+        low = token.lower()
+        if low in _ARTICLES:
+            return "article"
+        if low in _PREPOSITIONS:
+            return "preposition"
+        # a inizio frase la maiuscola non distingue i sostantivi
+        if first or not token[:1].isupper():
+            return None
+        category = self.noun_forms.get(token)
+        if category is not None:
+            # "die Lager": singolare e plurale uguali, decide l'articolo
+            if article is not None and category not in ARTICLE_GENDERS[article] and token in self.invariant:
+                return "plural"
+            return category
+        if low not in _NOT_NOUNS:
+            # sostantivo fuori catalogo: ne conosciamo solo l'articolo
+            return "noun" if article is None else "noun:" + article
+        return None
+
+    def _level(self, level_id):
+        cached = self._levels.get(level_id)
+        if cached is None:
+            gaps = []
+            nouns = {"noun": {}}
+            for sentence in split_sentences(self.levels[level_id].passage):
+                matches = list(_WORD.finditer(sentence))
+                tokens = [m.group() for m in matches]
+                for i, match in enumerate(matches):
+                    category = self._category(tokens[i], i == 0, _determiner(tokens, i))
+                    if category is not None:
+                        gaps.append((sentence, match.start(), match.end(), category))
+                    if category is not None and category.startswith("noun"):
+                        nouns["noun"][tokens[i]] = None
+                        nouns.setdefault(category, {})[tokens[i]] = None
+            nouns = {category: list(words) for category, words in nouns.items()}
+            cached = self._levels[level_id] = (gaps, nouns)
+        return cached
+
+    def gaps(self, level_id):
+        """(sentence, start, end, category) of every word of the passage that can be a gap."""
+        return self._level(level_id)[0]
+
+    def distractors(self, level_id, category, answer, k, rng=random):
+        """Up to ``k`` words of the same category as ``answer``, never ``answer`` itself."""
+        if category == "article":
+            # determinativo e indeterminativo dello stesso genere e caso
+            # (dem/einem) sarebbero giusti entrambi
+            own = ARTICLE_SLOTS[answer.lower()]
+            pool = [a for a in ARTICLES if ARTICLE_SLOTS[a].isdisjoint(own)]
+            return [_like(w, answer) for w in _sample_other(pool, answer, k, rng)]
+        if category == "preposition":
+            return [_like(w, answer) for w in _sample_other(PREPOSITIONS, answer, k, rng)]
+        if category.startswith("noun"):
+            # prima gli altri sostantivi del brano dopo lo stesso articolo,
+            # poi i vocaboli che lo accettano
+            picks = _sample_other(self._level(level_id)[1].get(category, []), answer, k, rng)
+            if len(picks) < k:
+                picks += [w for w in _sample_other(self.pools[category], answer, k, rng) if w not in picks]
+            return picks[:k]
+        return _sample_other(self.pools.get(category, []), answer, k, rng)
+
+    def questions(self, level_id, n, rng=random, k=2):
+        """Up to ``n`` fill-in-the-gap questions on distinct words of the passage."""
+        gaps = self.gaps(level_id)
+        questions = []
+        for gi in rng.sample(range(len(gaps)), len(gaps)):
+            if len(questions) == n:
+                break
+            sentence, start, end, category = gaps[gi]
+            answer = sentence[start:end]
+            options = [answer] + self.distractors(level_id, category, answer, k, rng)
+            if len(options) < k + 1:
+                continue
+            rng.shuffle(options)
+            questions.append({
+                "id": f"comprehension:{self.levels[level_id].key}:cloze{gi}",
+                "question": f"Completa la frase del testo: {sentence[:start]}{GAP}{sentence[end:]}",
+                "options": options,
+                "correct_index": options.index(answer),
+            })
+        return questions
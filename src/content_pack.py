@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pacchetti di contenuti compilati per Deutschland B2.
+
+Un pacchetto è un unico file binario indicizzato che contiene il catalogo
+(vocaboli, livelli di vocabolario, grammatica e comprensione). Il caricamento
+mappa il file in memoria e legge solo l'intestazione: ogni record viene
+decodificato (nel suo tipo di records.py) la prima volta che serve, quindi
+l'avvio non dipende dalla dimensione del catalogo e i contenuti si
+aggiornano senza toccare il codice.
+
+Formato (interi little-endian):
+
+    magic      8 byte  b"B2PACK1\\n"
+    toc_len    uint32  lunghezza del sommario
+    toc        JSON    {sezione: [posizione tabella offset, numero record]}
+    per sezione:
+      offsets  (n + 1) x uint64, posizioni assolute di inizio/fine dei record
+      records  n record JSON UTF-8 concatenati
+
+Compilazione:
+
+    python3 content_pack.py build                  # dal catalogo di data.py
+    python3 content_pack.py build --from-json catalogo.json -o content_b2.pack
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Sequence
+
+from records import SECTION_TYPES
+
+MAGIC = b"B2PACK1\n"
+SECTIONS = ("warehouse_vocab", "general_vocab", "vocabulary_levels", "grammar_levels", "comprehension_levels")
+DEFAULT_PACK = "content_b2.pack"
+
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+
+class ContentPackError(Exception):
+    """The file is not a valid content pack."""
+
+
+# ---------------------- COMPILAZIONE ---------------------- #
+def _encode(rec):
+    # record del catalogo (records.py) oppure oggetti JSON già pronti
+    data = rec.to_json() if hasattr(rec, "to_json") else rec
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def compile_pack(sections, path):
+    """Write ``sections`` (name -> list of records or JSON objects) to ``path``."""
+    encoded = {name: [_encode(rec) for rec in records] for name, records in sections.items()}
+    # il sommario contiene posizioni assolute, che dipendono dalla sua lunghezza:
+    # si parte da posizioni nulle e si ricalcola finché il sommario è stabile
+    toc = {name: [0, len(recs)] for name, recs in encoded.items()}
+    while True:
+        toc_bytes = json.dumps(toc, separators=(",", ":")).encode("utf-8")
+        pos = len(MAGIC) + _U32.size + len(toc_bytes)
+        new_toc = {}
+        for name, recs in encoded.items():
+            new_toc[name] = [pos, len(recs)]
+            pos += _U64.size * (len(recs) + 1) + sum(len(r) for r in recs)
+        if new_toc == toc:
+            break
+        toc = new_toc
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(_U32.pack(len(toc_bytes)))
+            f.write(toc_bytes)
+            for name, recs in encoded.items():
+                start = toc[name][0] + _U64.size * (len(recs) + 1)
+                offsets = [start]
+                for rec in recs:
+                    offsets.append(offsets[-1] + len(rec))
+                f.write(b"".join(_U64.pack(o) for o in offsets))
+                f.write(b"".join(recs))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# ---------------------- CARICAMENTO ---------------------- #
+class ContentPack:
+    """A memory-mapped content pack; sections are decoded record by record."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ContentPackError(f"{path}: non è un pacchetto di contenuti")
+        (toc_len,) = _U32.unpack_from(self._mm, len(MAGIC))
+        start = len(MAGIC) + _U32.size
+        self.toc = json.loads(self._mm[start:start + toc_len].decode("utf-8"))
+
+    def section(self, name, decode=None):
+        """The records of section ``name``, each passed through ``decode`` if given."""
+        if name not in self.toc:
+            raise ContentPackError(f"{self.path}: sezione mancante {name!r}")
+        table, count = self.toc[name]
+        return LazySection(self, table, count, decode)
+
+    def read_record(self, table, i):
+        start, end = struct.unpack_from("<QQ", self._mm, table + _U64.size * i)
+        return json.loads(self._mm[start:end].decode("utf-8"))
+
+    def close(self):
+        self._mm.close()
+
+
+class LazySection(Sequence):
+    """Read-only sequence that materializes each record on first access."""
+
+    def __init__(self, pack, table, count, decode=None):
+        self._pack = pack
+        self._table = table
+        self._count = count
+        self._decode = decode
+        self._cache = {}
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("indice di record fuori dall'intervallo")
+        rec = self._cache.get(i)
+        if rec is None:
+            rec = self._pack.read_record(self._table, i)
+            if self._decode is not None:
+                rec = self._decode(rec)
+            self._cache[i] = rec
+        return rec
+
+
+def open_pack(path, raw=False):
+    """Return the catalogue sections of the pack at ``path`` as lazy sequences.
+
+    Records are decoded into the types of records.py, or left as the stored
+    JSON objects if ``raw``.
+    """
+    pack = ContentPack(path)
+    return {name: pack.section(name, None if raw else SECTION_TYPES[name].from_json) for name in SECTIONS}
+
+
+def builtin_sections():
+    """The catalogue defined in data.py."""
+    import data
+    return {name: getattr(data, name) for name in SECTIONS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pacchetti di contenuti di Deutschland B2")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compila il catalogo in un pacchetto")
+    build.add_argument("-o", "--output", default=DEFAULT_PACK)
+    build.add_argument("--from-json", help="file JSON con le sezioni del catalogo (predefinito: data.py)")
+    args = parser.parse_args()
+    if args.command == "build":
+        if args.from_json:
+            with open(args.from_json, "r", encoding="utf-8") as f:
+                sections = json.load(f)
+            missing = [name for name in SECTIONS if name not in sections]
+            if missing:
+                parser.error(f"sezioni mancanti in {args.from_json}: {', '.join(missing)}")
+            sections = {name: sections[name] for name in SECTIONS}
+        else:
+            sections = builtin_sections()
+        compile_pack(sections, args.output)
+        counts = ", ".join(f"{name}={len(sections[name])}" for name in SECTIONS)
+        print(f"Pacchetto scritto in {args.output} ({counts})")
+
+
+if __name__ == "__main__":
+    main()
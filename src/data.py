@@ -0,0 +1,760 @@
+# -*- coding: utf-8 -*-
+
+"""
+Catalogo dei contenuti di Deutschland B2.
+
+Definisce i vocaboli (magazzino e uso generale), i livelli di vocabolario,
+grammatica e comprensione del testo. Il gioco importa questo modulo solo se
+non trova un pacchetto di contenuti compilato (vedi content_pack.py).
+"""
+
+from level_builder import build_vocabulary_levels
+from records import ComprehensionLevel, GrammarLevel, VocabularyItem
+
+# ---------------------- DATI DI VOCABOLARIO ---------------------- #
+
+warehouse_vocab = [
+    VocabularyItem("Gabelstapler", "Gabelstapler", "der", "carrello elevatore"),
+    VocabularyItem("Lager", "Lager", "das", "magazzino"),
+    VocabularyItem("Palette", "Paletten", "die", "pallet"),
+    VocabularyItem("Lagerarbeiter", "Lagerarbeiter", "der", "magazziniere"),
+    VocabularyItem("Regal", "Regale", "das", "scaffale"),
+    VocabularyItem("Kiste", "Kisten", "die", "cassa/scatola"),
+    VocabularyItem("Paket", "Pakete", "das", "pacco"),
+    VocabularyItem("Waage", "Waagen", "die", "bilancia"),
+    VocabularyItem("Verpackung", "Verpackungen", "die", "imballaggio"),
+    VocabularyItem("Karton", "Kartons", "der", "cartone"),
+    VocabularyItem("Schachtel", "Schachteln", "die", "scatola"),
+    VocabularyItem("Lieferung", "Lieferungen", "die", "consegna"),
+    VocabularyItem("Lagerhaus", "Lagerhäuser", "das", "deposito"),
+    VocabularyItem("Versand", "Versände", "der", "spedizione"),
+    VocabularyItem("Wareneingang", "Wareneingänge", "der", "arrivo merci"),
+    VocabularyItem("Warenausgang", "Warenausgänge", "der", "uscita merci"),
+    VocabularyItem("Gut", "Güter", "das", "bene/merce"),
+    VocabularyItem("Warensendung", "Warensendungen", "die", "spedizione"),
+    VocabularyItem("Kommissionierer", "Kommissionierer", "der", "addetto al picking"),
+    VocabularyItem("Kommissionierung", "Kommissionierungen", "die", "picking"),
+    VocabularyItem("Lagerverwaltung", "Lagerverwaltungen", "die", "gestione del magazzino"),
+    VocabularyItem("Gepäck", "Gepäcke", "das", "bagaglio"),
+    VocabularyItem("Förderband", "Förderbänder", "das", "nastro trasportatore"),
+    VocabularyItem("Hubwagen", "Hubwagen", "der", "transpallet"),
+    VocabularyItem("Transporter", "Transporter", "der", "furgone"),
+    VocabularyItem("Container", "Container", "der", "container"),
+    VocabularyItem("Laderampe", "Laderampen", "die", "rampa di carico"),
+    VocabularyItem("Aufzug", "Aufzüge", "der", "ascensore"),
+    VocabularyItem("Arbeitskleidung", "Arbeitskleidungen", "die", "abbigliamento da lavoro"),
+    VocabularyItem("Staplerfahrer", "Staplerfahrer", "der", "carrellista"),
+]
+
+general_vocab = [
+    VocabularyItem("Haus", "Häuser", "das", "casa"),
+    VocabularyItem("Auto", "Autos", "das", "auto"),
+    VocabularyItem("Straße", "Straßen", "die", "strada"),
+    VocabularyItem("Familie", "Familien", "die", "famiglia"),
+    VocabularyItem("Freund", "Freunde", "der", "amico"),
+    VocabularyItem("Stadt", "Städte", "die", "città"),
+    VocabularyItem("Arbeit", "Arbeiten", "die", "lavoro"),
+    VocabularyItem("Zimmer", "Zimmer", "das", "stanza"),
+    VocabularyItem("Buch", "Bücher", "das", "libro"),
+    VocabularyItem("Tisch", "Tische", "der", "tavolo"),
+    VocabularyItem("Stuhl", "Stühle", "der", "sedia"),
+    VocabularyItem("Fenster", "Fenster", "das", "finestra"),
+    VocabularyItem("Baum", "Bäume", "der", "albero"),
+    VocabularyItem("Tür", "Türen", "die", "porta"),
+    VocabularyItem("Computer", "Computer", "der", "computer"),
+    VocabularyItem("Handy", "Handys", "das", "cellulare"),
+    VocabularyItem("Uhr", "Uhren", "die", "orologio"),
+    VocabularyItem("Flasche", "Flaschen", "die", "bottiglia"),
+    VocabularyItem("Hund", "Hunde", "der", "cane"),
+    VocabularyItem("Katze", "Katzen", "die", "gatto"),
+]
+
+# Build vocabulary levels (30 warehouse + 20 general = 50)
+vocabulary_levels = build_vocabulary_levels(warehouse_vocab, general_vocab)
+
+# ---------------------- DATI DI GRAMMATICA ---------------------- #
+grammar_levels = [
+    GrammarLevel(
+        name="Grammatica 01 – Articoli determinativi",
+        explanation="Gli articoli determinativi sono der (maschile), die (femminile e plurale) e das (neutro).",
+        questions=[
+            {
+                "question": "Quale articolo determinativo è corretto per una parola femminile al singolare?",
+                "options": ["der", "die", "das"],
+                "correct_index": 1,
+            },
+        ],
+        drills=["nominative"],
+    ),
+    GrammarLevel(
+        name="Grammatica 02 – Articoli indeterminativi",
+        explanation="Gli articoli indeterminativi sono ein (maschile/neutro) e eine (femminile). Non esistono in plurale.",
+        questions=[
+            {
+                "question": "Come si dice 'una casa' in tedesco?",
+                "options": ["ein Haus", "eine Haus", "einen Haus"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 03 – Verbo sein (presente)",
+        explanation="Il verbo sein (essere) si coniuga: ich bin, du bist, er/sie/es ist, wir sind, ihr seid, sie/Sie sind.",
+        questions=[
+            {
+                "question": "Qual è la forma corretta per 'noi siamo'?",
+                "options": ["wir sind", "wir seid", "wir sindet"],
+                "correct_index": 0,
+            }
+        ],
+        drills=["sein"],
+    ),
+    GrammarLevel(
+        name="Grammatica 04 – Verbo haben (presente)",
+        explanation="Il verbo haben (avere) si coniuga: ich habe, du hast, er/sie/es hat, wir haben, ihr habt, sie/Sie haben.",
+        questions=[
+            {
+                "question": "Qual è la forma corretta per 'lui ha'?",
+                "options": ["er habt", "er hat", "er habe"],
+                "correct_index": 1,
+            }
+        ],
+        drills=["haben"],
+    ),
+    GrammarLevel(
+        name="Grammatica 05 – Verbi regolari al presente",
+        explanation="I verbi regolari aggiungono le desinenze -e, -st, -t, -en, -t, -en.",
+        questions=[
+            {
+                "question": "Quale desinenza si usa con 'du' per un verbo regolare?",
+                "options": ["-st", "-t", "-en"],
+                "correct_index": 0,
+            }
+        ],
+        drills=["regular_verbs"],
+    ),
+    GrammarLevel(
+        name="Grammatica 06 – Verbi modali",
+        explanation="I verbi modali comuni sono können (potere), wollen (volere), müssen (dovere), dürfen (permesso), sollen (dovere).",
+        questions=[
+            {
+                "question": "Quale verbo modale esprime un obbligo (dovere)?",
+                "options": ["können", "müssen", "wollen"],
+                "correct_index": 1,
+            }
+        ],
+        drills=["modal_verbs"],
+    ),
+    GrammarLevel(
+        name="Grammatica 07 – Pronomi personali (nominativo)",
+        explanation="I pronomi personali al nominativo sono: ich, du, er/sie/es, wir, ihr, sie, Sie.",
+        questions=[
+            {
+                "question": "Qual è il pronome corrispondente a 'voi' in tedesco?",
+                "options": ["wir", "ihr", "sie"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 08 – Casi nominativo e accusativo",
+        explanation="Il nominativo è usato per il soggetto; l'accusativo per l'oggetto diretto. Alcuni articoli cambiano: der→den, ein→einen.",
+        questions=[
+            {
+                "question": "Qual è la forma accusativa di 'der Hund'?",
+                "options": ["der Hund", "den Hund", "dem Hund"],
+                "correct_index": 1,
+            }
+        ],
+        drills=["nominative", "accusative"],
+    ),
+    GrammarLevel(
+        name="Grammatica 09 – Caso dativo",
+        explanation="Il dativo indica il complemento di termine. Gli articoli cambiano: der→dem, die→der, das→dem, die(plur.)→den + -n.",
+        questions=[
+            {
+                "question": "Qual è l'articolo dativo per una parola femminile?",
+                "options": ["der", "dem", "die"],
+                "correct_index": 0,
+            }
+        ],
+        drills=["dative"],
+    ),
+    GrammarLevel(
+        name="Grammatica 10 – Pronomi possessivi",
+        explanation="I pronomi possessivi variano con genere e numero: mein/meine, dein/deine, sein/seine, unser/unsere, euer/eure, ihr/ihre.",
+        questions=[
+            {
+                "question": "Quale pronome possessivo corrisponde a 'nostro' per un sostantivo neutro?",
+                "options": ["unser", "unsere", "euer"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 11 – Formazione del plurale",
+        explanation="Le regole del plurale variano: -e, -er (spesso con umlaut), -n/-en, -s, o nessuna desinenza.",
+        questions=[
+            {
+                "question": "Quale forma plurale è corretta per 'Buch'?",
+                "options": ["Buche", "Bücher", "Buchen"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 12 – Perfekt con haben",
+        explanation="Il Perfekt si forma con haben e il participio passato: ich habe gearbeitet.",
+        questions=[
+            {
+                "question": "Qual è il participio passato di 'arbeiten'?",
+                "options": ["arbeitet", "gearbeitet", "arbeitete"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 13 – Perfekt con sein",
+        explanation="Alcuni verbi di movimento o cambiamento usano sein come ausiliare: ich bin gegangen.",
+        questions=[
+            {
+                "question": "Quale ausiliare si usa per 'gehen' al perfetto?",
+                "options": ["haben", "sein", "werden"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 14 – Präteritum di sein e haben",
+        explanation="Il Präteritum di sein è ich war, du warst, er war...; di haben è ich hatte, du hattest, er hatte...",
+        questions=[
+            {
+                "question": "Come si dice 'noi eravamo' in tedesco?",
+                "options": ["wir waren", "wir seid", "wir wären"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 15 – Negazione con nicht",
+        explanation="Nicht si posiziona alla fine della frase principale o davanti all'elemento da negare.",
+        questions=[
+            {
+                "question": "In quale posizione si colloca 'nicht' in 'Ich sehe den Mann' quando si nega il complemento?",
+                "options": ["Ich sehe nicht den Mann", "Ich nicht sehe den Mann", "Nicht ich sehe den Mann"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 16 – Comparativo e superlativo",
+        explanation="Il comparativo aggiunge -er, il superlativo usa am + -sten: schnell, schneller, am schnellsten.",
+        questions=[
+            {
+                "question": "Quale frase esprime il superlativo di 'klein'?",
+                "options": ["am kleinsten", "kleiner", "kleinste"],
+                "correct_index": 0,
+            }
+        ],
+        drills=["comparative"],
+    ),
+    GrammarLevel(
+        name="Grammatica 17 – Preposizioni con accusativo",
+        explanation="Preposizioni wie durch, für, gegen, ohne, um richiedono l'accusativo.",
+        questions=[
+            {
+                "question": "Quale preposizione richiede l'accusativo?",
+                "options": ["mit", "für", "aus"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 18 – Preposizioni con dativo",
+        explanation="Preposizioni come aus, bei, mit, nach, seit, von, zu richiedono il dativo.",
+        questions=[
+            {
+                "question": "Quale preposizione richiede il dativo?",
+                "options": ["durch", "zu", "für"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 19 – Preposizioni duali",
+        explanation="Preposizioni an, auf, in, über, unter ecc. richiedono accusativo (moto) o dativo (stato).",
+        questions=[
+            {
+                "question": "Quando si usa l'accusativo con le preposizioni duali?",
+                "options": ["per il moto a luogo", "per lo stato in luogo", "mai"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 20 – Verbi separabili",
+        explanation="I verbi con prefisso separabile pongono il prefisso alla fine: anrufen → ich rufe dich an.",
+        questions=[
+            {
+                "question": "Qual è la forma corretta di 'anrufen' con 'ich'?",
+                "options": ["ich anrufe", "ich rufe an", "ich rufen an"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 21 – Verbi inseparabili",
+        explanation="I prefissi be-, ent-, er-, ver-, zer-, miss- non si separano: verstehen → ich verstehe.",
+        questions=[
+            {
+                "question": "Quale frase è corretta per 'verstehen' con 'wir'?",
+                "options": ["wir stehen ver", "wir verstehe", "wir verstehen"],
+                "correct_index": 2,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 22 – Ordine delle parole (verbo in seconda posizione)",
+        explanation="Nelle frasi principali il verbo coniugato è in seconda posizione: Heute gehe ich ins Kino.",
+        questions=[
+            {
+                "question": "Quale frase rispetta l'ordine corretto?",
+                "options": ["Heute ich gehe ins Kino", "Heute gehe ich ins Kino", "Ich gehe oggi Kino ins"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 23 – Congiunzioni subordinanti",
+        explanation="Le congiunzioni weil, dass, obwohl ecc. mandano il verbo alla fine della proposizione subordinata.",
+        questions=[
+            {
+                "question": "Quale frase è corretta?",
+                "options": ["Ich bleibe zu Hause, weil regnet es.", "Ich bleibe zu Hause, weil es regnet.", "Ich bleibe weil es regnet zu Hause."],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 24 – Futuro con werden",
+        explanation="Il futuro si forma con werden + infinito alla fine: ich werde gehen.",
+        questions=[
+            {
+                "question": "Come si traduce 'lei andrà'?",
+                "options": ["sie wird gehen", "sie geht werden", "sie wird gehet"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 25 – Perfekt vs Präteritum",
+        explanation="Il Perfekt si usa nel parlato, il Präteritum nello scritto e nei racconti.",
+        questions=[
+            {
+                "question": "Quale tempo si usa di solito nel parlato quotidiano?",
+                "options": ["Perfekt", "Präteritum", "Plusquamperfekt"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 26 – Aggettivi con articolo determinativo",
+        explanation="Gli aggettivi con articolo determinativo prendono desinenze deboli (-e/-en): der große Hund.",
+        questions=[
+            {
+                "question": "Qual è la forma corretta?",
+                "options": ["der groß Hund", "der große Hund", "den großen Hund"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 27 – Aggettivi senza articolo",
+        explanation="Senza articolo, l'aggettivo ha desinenze forti: großer Hund, große Katze.",
+        questions=[
+            {
+                "question": "Come si dice 'cane grande' senza articolo?",
+                "options": ["großer Hund", "große Hund", "groß Hund"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 28 – Pronomi relativi",
+        explanation="I pronomi relativi der, die, das concordano con il genere/numero dell'antecedente.",
+        questions=[
+            {
+                "question": "Quale pronome relativo si usa per un nome neutro al nominativo?",
+                "options": ["der", "die", "das"],
+                "correct_index": 2,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 29 – Clausole infinitive con zu",
+        explanation="Le frasi con zu + infinito mettono il verbo all'ultimo: Ich hoffe, dich bald zu sehen.",
+        questions=[
+            {
+                "question": "Quale frase è corretta?",
+                "options": ["Ich freue mich, dich zu treffen.", "Ich freue mich dich treffen zu.", "Ich freue mich, zu treffen dich."],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 30 – Voce passiva (Präsens)",
+        explanation="La passiva presente: werden + participio passato: Das Paket wird geliefert.",
+        questions=[
+            {
+                "question": "Come si forma la passiva di 'Der Kurier liefert das Paket' (presente)?",
+                "options": ["Der Paket wird geliefert vom Kurier.", "Das Paket wird vom Kurier geliefert.", "Das Paket ist geliefert vom Kurier."],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 31 – Voce passiva (Perfekt)",
+        explanation="La passiva del Perfekt usa sein + participio passato + worden: Das Paket ist geliefert worden.",
+        questions=[
+            {
+                "question": "Quale forma è corretta?",
+                "options": ["Das Paket ist geliefert worden.", "Das Paket wurde geliefert worden.", "Das Paket hat geliefert worden."],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 32 – Konjunktiv II (cortesia)",
+        explanation="Il Konjunktiv II esprime desideri/cortesia: ich würde gehen, ich hätte, ich wäre.",
+        questions=[
+            {
+                "question": "Come si dice 'Vorrei un caffè'?",
+                "options": ["Ich hätte einen Kaffee", "Ich habe einen Kaffee", "Ich war einen Kaffee"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 33 – Konjunktiv II (ipotesi)",
+        explanation="Konjunktiv II per situazioni ipotetiche: Wenn ich Zeit hätte, würde ich reisen.",
+        questions=[
+            {
+                "question": "Quale frase usa correttamente il Konjunktiv II?",
+                "options": ["Wenn ich Geld hätte, würde ich ein Auto kaufen.", "Wenn ich Geld habe, kaufe ich ein Auto.", "Wenn ich Geld hätte, ich kaufe ein Auto."],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 34 – Genitivo",
+        explanation="Il genitivo indica possesso: des Autos, der Freundin.",
+        questions=[
+            {
+                "question": "Quale forma genitiva è corretta per 'das Auto'?",
+                "options": ["des Autos", "des Auto", "der Autos"],
+                "correct_index": 0,
+            }
+        ],
+        drills=["genitive"],
+    ),
+    GrammarLevel(
+        name="Grammatica 35 – Espressioni di tempo",
+        explanation="Preposizioni temporali: seit (da), vor (fa), nach (dopo), in (tra).",
+        questions=[
+            {
+                "question": "Quale preposizione indica 'da due anni'?",
+                "options": ["seit", "vor", "nach"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 36 – Connettivi avversativi",
+        explanation="Aber, sondern, jedoch introducono un contrasto; non cambiano l'ordine del verbo.",
+        questions=[
+            {
+                "question": "Quale congiunzione significa 'ma' e non altera l'ordine del verbo?",
+                "options": ["aber", "weil", "dass"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 37 – Ordine TMP (tempo-modo-luogo)",
+        explanation="L'ordine degli avverbi è tempo-modo-luogo: Ich arbeite morgen gern im Lager.",
+        questions=[
+            {
+                "question": "Quale ordine è corretto in 'Ich arbeite morgen gerne im Lager'?",
+                "options": ["Tempo-Modo-Luogo", "Modo-Luogo-Tempo", "Luogo-Tempo-Modo"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 38 – Partizip I e II come aggettivi",
+        explanation="Il Partizip I/II può essere usato come aggettivo: die laufende Maschine, die geschlossene Tür.",
+        questions=[
+            {
+                "question": "Quale frase usa il Partizip II come aggettivo?",
+                "options": ["die laufende Maschine", "die geschlossene Tür", "die spielende Kinder"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 39 – Verbi con preposizioni fisse",
+        explanation="Alcuni verbi richiedono preposizioni: warten auf (+akk), helfen bei (+dat).",
+        questions=[
+            {
+                "question": "Quale preposizione si usa con 'warten'?",
+                "options": ["auf", "mit", "zu"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 40 – Futuro composto",
+        explanation="Futuro composto: werden + participio passato + haben/sein: Ich werde gearbeitet haben.",
+        questions=[
+            {
+                "question": "Quale forma è corretta?",
+                "options": ["Ich werde gearbeitet haben", "Ich habe arbeiten werden", "Ich werde haben gearbeitet"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 41 – Sostantivazione di verbi e aggettivi",
+        explanation="I verbi e aggettivi possono diventare sostantivi: das Lesen, das Neue.",
+        questions=[
+            {
+                "question": "Quale parola è una sostantivazione corretta?",
+                "options": ["lesen", "Lesen", "lesung"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 42 – Verbi riflessivi",
+        explanation="I verbi riflessivi usano un pronome riflessivo: ich wasche mich.",
+        questions=[
+            {
+                "question": "Quale forma è corretta per 'noi ci laviamo'?",
+                "options": ["wir waschen uns", "wir uns waschen", "uns waschen wir"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 43 – Verbi separabili al Perfekt",
+        explanation="Nel Perfekt, il prefisso separabile precede il participio: ich habe angerufen.",
+        questions=[
+            {
+                "question": "Come si traduce 'ha telefonato' (anrufen) al Perfekt?",
+                "options": ["er hat angerufen", "er angerufen hat", "er hat gerufen an"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 44 – Preposizioni con il genitivo",
+        explanation="Preposizioni wie während, trotz, aufgrund richiedono il genitivo.",
+        questions=[
+            {
+                "question": "Quale preposizione regge il genitivo?",
+                "options": ["wegen", "mit", "zu"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 45 – Verbi transitivi e intransitivi",
+        explanation="I verbi transitivi hanno un oggetto; gli intransitivi no.",
+        questions=[
+            {
+                "question": "Quale verbo è intransitivo?",
+                "options": ["schlafen", "lesen", "essen"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 46 – Posizione di 'auch'",
+        explanation="Auch si posiziona dopo il verbo o prima dell'elemento a cui si riferisce.",
+        questions=[
+            {
+                "question": "Quale frase è corretta?",
+                "options": ["Ich auch komme", "Ich komme auch", "Auch ich komme"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 47 – Pronomi indefiniti",
+        explanation="Pronomi indefiniti: man (si), jemand (qualcuno), niemand (nessuno), etwas (qualcosa).",
+        questions=[
+            {
+                "question": "Quale pronome significa 'qualcuno'?",
+                "options": ["niemand", "jemand", "nichts"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 48 – Comparativo di uguaglianza",
+        explanation="Il comparativo di uguaglianza usa so … wie: Er ist so groß wie sein Bruder.",
+        questions=[
+            {
+                "question": "Quale frase esprime correttamente un confronto di uguaglianza?",
+                "options": ["Er ist größer als ich", "Er ist so groß wie ich", "Er ist am größten"],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 49 – Frasi relative con preposizione",
+        explanation="Se una relativa richiede una preposizione, questa precede il pronome relativo.",
+        questions=[
+            {
+                "question": "Quale frase è corretta?",
+                "options": ["Das ist der Freund, ich spreche mit dem.", "Das ist der Freund, mit dem ich spreche.", "Das ist der Freund, mit ich spreche dem."],
+                "correct_index": 1,
+            }
+        ],
+    ),
+    GrammarLevel(
+        name="Grammatica 50 – Particelle modali comuni",
+        explanation="Particelle come mal, doch, eben attenuano o rafforzano il significato di una frase.",
+        questions=[
+            {
+                "question": "Quale particella modale si usa spesso per attenuare una richiesta?",
+                "options": ["mal", "doch", "denn"],
+                "correct_index": 0,
+            }
+        ],
+    ),
+]
+
+# ---------------------- DATI DI COMPRENSIONE ---------------------- #
+comprehension_levels = [
+    ComprehensionLevel(
+        name="Comprensione 01 – Nel magazzino",
+        passage="Tom arbeitet seit zwei Jahren in einem großen Lager. Jeden Morgen überprüft er die Lieferungen und sortiert die Pakete. Er benutzt oft einen Gabelstapler, um schwere Paletten zu bewegen.",
+        questions=[
+            {"question": "Was macht Tom jeden Morgen?", "options": ["Er überprüft die Lieferungen", "Er fährt zur Schule", "Er ruht sich aus"], "correct_index": 0},
+            {"question": "Welches Gerät benutzt er, um Paletten zu bewegen?", "options": ["einen Aufzug", "einen Gabelstapler", "eine Waage"], "correct_index": 1},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 02 – Einkaufen",
+        passage="Anna geht heute in die Stadt, um ein neues Handy zu kaufen. Sie besucht verschiedene Geschäfte und vergleicht die Preise. Schließlich findet sie ein günstiges Angebot und bezahlt an der Kasse.",
+        questions=[
+            {"question": "Was möchte Anna kaufen?", "options": ["ein Handy", "ein Buch", "eine Uhr"], "correct_index": 0},
+            {"question": "Was macht sie, bevor sie bezahlt?", "options": ["Sie vergleicht die Preise", "Sie ruft ihren Freund an", "Sie geht nach Hause"], "correct_index": 0},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 03 – Der Freund",
+        passage="Peter besucht seinen Freund Max, der in einem kleinen Dorf wohnt. Sie sitzen im Garten, trinken Kaffee und sprechen über ihre Arbeit. Peter erzählt von seinem neuen Projekt im Lager.",
+        questions=[
+            {"question": "Wo wohnt Max?", "options": ["in einer Stadt", "in einem Dorf", "in einem Haus am See"], "correct_index": 1},
+            {"question": "Worüber sprechen sie?", "options": ["über ihre Arbeit", "über das Wetter", "über Sport"], "correct_index": 0},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 04 – Das Paket",
+        passage="Im Büro ist ein Paket angekommen. Die Sekretärin legt es auf den Tisch und informiert den Chef. Er öffnet die Verpackung und findet darin neue Computer für das Lager.",
+        questions=[
+            {"question": "Wer informiert den Chef über das Paket?", "options": ["die Sekretärin", "der Fahrer", "der Lagerarbeiter"], "correct_index": 0},
+            {"question": "Was befindet sich im Paket?", "options": ["Bücher", "Computer", "Kleider"], "correct_index": 1},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 05 – Der Hund und die Katze",
+        passage="Im Park spielen ein Hund und eine Katze miteinander. Der Hund bringt einen Ball, und die Katze jagt den Schatten. Viele Kinder stehen um sie herum und lachen.",
+        questions=[
+            {"question": "Was bringt der Hund?", "options": ["einen Stock", "einen Ball", "eine Flasche"], "correct_index": 1},
+            {"question": "Wer lacht im Park?", "options": ["die Tiere", "die Kinder", "die Eltern"], "correct_index": 1},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 06 – Ein neues Regal",
+        passage="Im Lager wurde ein neues Regal aufgebaut. Jetzt gibt es mehr Platz für Kisten und Pakete. Die Mitarbeiter freuen sich, weil die Arbeit leichter wird.",
+        questions=[
+            {"question": "Was wurde aufgebaut?", "options": ["ein Regal", "eine Palette", "ein Karton"], "correct_index": 0},
+            {"question": "Warum freuen sich die Mitarbeiter?", "options": ["weil sie Urlaub machen", "weil die Arbeit leichter wird", "weil sie Pizza essen"], "correct_index": 1},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 07 – Der Aufzug",
+        passage="Im Lager gibt es einen alten Aufzug. Eines Tages bleibt er zwischen zwei Stockwerken stehen. Die Mitarbeiter müssen die Pakete über die Treppe tragen, bis der Techniker den Aufzug repariert.",
+        questions=[
+            {"question": "Was passiert mit dem Aufzug?", "options": ["Er fährt zu schnell", "Er bleibt stehen", "Er wird größer"], "correct_index": 1},
+            {"question": "Wie transportieren die Mitarbeiter die Pakete?", "options": ["mit dem Aufzug", "über die Treppe", "mit dem Auto"], "correct_index": 1},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 08 – Die Lieferung",
+        passage="Heute kommt eine große Lieferung im Lager an. Drei LKW bringen Paletten mit Waren. Die Lagerarbeiter überprüfen die Lieferung und tragen alles ins Lagerhaus.",
+        questions=[
+            {"question": "Womit wird die Lieferung gebracht?", "options": ["mit Lastwagen", "mit Flugzeugen", "mit Fahrrädern"], "correct_index": 0},
+            {"question": "Was machen die Lagerarbeiter mit der Lieferung?", "options": ["Sie werfen sie weg", "Sie überprüfen und lagern sie", "Sie schicken sie zurück"], "correct_index": 1},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 09 – Freizeit",
+        passage="Am Wochenende fährt Maria gern mit ihrem Auto zum See. Sie nimmt ein Buch, eine Flasche Wasser und ihren Hund mit. Dort liest sie, wandert ein bisschen und genießt die Natur.",
+        questions=[
+            {"question": "Wohin fährt Maria am Wochenende?", "options": ["zum Meer", "zum See", "in die Stadt"], "correct_index": 1},
+            {"question": "Was nimmt sie mit?", "options": ["ein Buch und Wasser", "nur ihren Hund", "einen Computer"], "correct_index": 0},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 10 – Das Büro",
+        passage="Im Büro arbeiten fünf Personen. Jeden Montag haben sie eine Besprechung. Der Chef lobt die Mitarbeiter für ihre Arbeit und plant neue Projekte.",
+        questions=[
+            {"question": "Wann haben sie eine Besprechung?", "options": ["Jeden Tag", "Jeden Montag", "Jeden Freitag"], "correct_index": 1},
+            {"question": "Was macht der Chef?", "options": ["Er lobt die Mitarbeiter", "Er schläft", "Er macht Urlaub"], "correct_index": 0},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 11 – Die Familie",
+        passage="Die Familie Müller wohnt in einem großen Haus. Im Garten stehen viele Bäume. Jeden Sonntag kochen sie gemeinsam und sitzen am Tisch.",
+        questions=[
+            {"question": "Was gibt es im Garten?", "options": ["Blumen", "Bäume", "Autos"], "correct_index": 1},
+            {"question": "Was machen sie sonntags?", "options": ["Sie gehen schwimmen", "Sie kochen gemeinsam", "Sie arbeiten"], "correct_index": 1},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 12 – Der Umzug",
+        passage="Julia zieht in eine neue Wohnung um. Viele Freunde helfen ihr, die Möbel zu transportieren. Der Aufzug ist klein, deshalb benutzen sie die Treppe.",
+        questions=[
+            {"question": "Warum benutzen sie die Treppe?", "options": ["weil es regnet", "weil der Aufzug klein ist", "weil sie Sport machen wollen"], "correct_index": 1},
+            {"question": "Wer hilft Julia?", "options": ["Ihre Kollegen", "Ihre Freunde", "Niemand"], "correct_index": 1},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 13 – Der Urlaub",
+        passage="Nächstes Jahr möchte die Familie Becker eine Reise nach Italien machen. Sie wollen Rom besuchen, Pizza essen und viel Zeit am Meer verbringen.",
+        questions=[
+            {"question": "Wohin möchte die Familie fahren?", "options": ["nach Spanien", "nach Italien", "nach Frankreich"], "correct_index": 1},
+            {"question": "Was wollen sie machen?", "options": ["Bücher lesen", "Pizza essen und Rom besuchen", "Ski fahren"], "correct_index": 1},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 14 – Am Wochenende",
+        passage="Paul bleibt am Wochenende zu Hause. Er repariert sein Fahrrad, liest ein interessantes Buch und ruft seine Freunde an. Am Sonntag kocht er einen großen Kuchen.",
+        questions=[
+            {"question": "Was repariert Paul?", "options": ["sein Auto", "sein Fahrrad", "seinen Computer"], "correct_index": 1},
+            {"question": "Was macht er am Sonntag?", "options": ["Er kocht einen Kuchen", "Er geht spazieren", "Er arbeitet im Lager"], "correct_index": 0},
+        ],
+    ),
+    ComprehensionLevel(
+        name="Comprensione 15 – Die Bibliothek",
+        passage="In der Bibliothek ist es ruhig. Viele Studenten sitzen an den Tischen und lernen. Die Bibliothekarin hilft einem Kind, ein passendes Buch zu finden.",
+        questions=[
+            {"question": "Was macht die Bibliothekarin?", "options": ["Sie liest Bücher", "Sie hilft einem Kind", "Sie schläft"], "correct_index": 1},
+            {"question": "Wer lernt in der Bibliothek?", "options": ["Studenten", "Tiere", "Lehrer"], "correct_index": 0},
+        ],
+    ),
+]
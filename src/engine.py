@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+Motore delle sessioni di Deutschland B2.
+
+Le sessioni di livello e di ripasso (i generatori *_session di game_cli) non
+fanno I/O: producono passi che questo modulo esegue. Il collegamento con il
+mondo esterno passa per un adattatore SessionIO:
+
+* ConsoleIO – il terminale (print/input), usato dal gioco interattivo;
+* BatchIO – risposte pre-registrate, per correggere fogli di risposte in
+  blocco senza alcuna interazione.
+
+I passi di salvataggio vengono inoltrati al progress store ricevuto; i passi
+"answer" (una risposta data) al registro delle risposte, se presente, insieme
+al tempo impiegato a rispondere. Questa parte è in dispatch_steps(), comune a
+run_session() e al driver asincrono del server, che eseguono solo l'I/O.
+
+Con la strumentazione attiva (vedi instrumentation.py) vengono misurati il
+tempo di risposta ("ask") e i salvataggi ("store.*"), e contate le risposte.
+"""
+
+import functools
+import time
+
+from instrumentation import count, observe, timer
+
+# passi che vanno inoltrati al progress store
+STORE_STEPS = ("record_level", "record_review", "record_stats")
+
+
+class SessionIO:
+    """Adapter between a session generator and its user."""
+
+    def say(self, text):
+        raise NotImplementedError
+
+    def wait(self, prompt):
+        raise NotImplementedError
+
+    def ask(self, question, options):
+        """Return the index of the chosen option."""
+        raise NotImplementedError
+
+    def read(self, prompt):
+        """Return a line of free text (menu commands, searches)."""
+        raise NotImplementedError
+
+
+class ConsoleIO(SessionIO):
+    """Interactive terminal I/O."""
+
+    def say(self, text):
+        print(text)
+
+    def wait(self, prompt):
+        input(prompt)
+
+    def read(self, prompt):
+        return input(prompt)
+
+    def ask(self, question, options):
+        print()
+        print(question)
+        for idx, opt in enumerate(options, start=1):
+            print(f"{idx}. {opt}")
+        while True:
+            choice = input(f"Scegli l'opzione corretta (1-{len(options)}): ")
+            if choice.isdigit() and 1 <= int(choice) <= len(options):
+                return int(choice) - 1
+            print("Scelta non valida. Riprova.")
+
+
+class BatchIO(SessionIO):
+    """Feeds pre-recorded answers to a session and discards all output.
+
+    Answers are either the text of the chosen option (robust to shuffled
+    options) or its 0-based index. A missing or unknown answer counts as
+    wrong.
+    """
+
+    def __init__(self, answers):
+        self.answers = iter(answers)
+
+    def say(self, text):
+        pass
+
+    def wait(self, prompt):
+        pass
+
+    def ask(self, question, options):
+        answer = next(self.answers, None)
+        if isinstance(answer, int) and not isinstance(answer, bool):
+            return answer
+        if isinstance(answer, str) and answer in options:
+            return options.index(answer)
+        return -1
+
+    def read(self, prompt):
+        answer = next(self.answers, None)
+        # senza risposte registrate si esce dai menu ("b" = indietro)
+        return "b" if answer is None else str(answer)
+
+
+class ResultCollector:
+    """A progress store that only remembers the level results it receives."""
+
+    def __init__(self):
+        self.results = []
+
+    def record_level(self, progress, track, level_id, new_review_items, correct, total, passed):
+        self.results.append({
+            "track": track,
+            "level": level_id,
+            "correct": correct,
+            "total": total,
+            "passed": passed,
+        })
+
+    def record_review(self, progress, updated_keys=()):
+        pass
+
+    def record_stats(self, progress, keys):
+        pass
+
+    def save(self, progress):
+        pass
+
+    def close(self):
+        pass
+
+
+def dispatch_steps(session, progress, store, events=None, learner=None):
+    """Handle the bookkeeping steps of a session and yield only its I/O.
+
+    The driver receives ("say", text), ("wait", prompt), ("ask", question,
+    options) and ("input", prompt), sending back the chosen index or the text
+    read, and ("store", call), a bound progress-store call it must run. The
+    answers go to ``events`` with their response time; the return value is
+    the session's. run_session() and the server's async driver share it.
+    """
+    answer = None
+    response_time = 0.0
+    while True:
+        try:
+            step = session.send(answer)
+        except StopIteration as stop:
+            return stop.value
+        answer = None
+        kind = step[0]
+        if kind == "ask":
+            asked = time.perf_counter()
+            answer = yield step
+            response_time = time.perf_counter() - asked
+            observe("ask", response_time)
+        elif kind == "answer":
+            count("answer.correct" if step[3] else "answer.wrong")
+            if events is not None:
+                events.answer(*step[1:], rt=response_time, learner=learner)
+        elif kind in STORE_STEPS:
+            with timer(f"store.{kind}"):
+                yield ("store", functools.partial(getattr(store, kind), progress, *step[1:]))
+        else:
+            answer = yield step
+
+
+def run_session(session, progress, store, io, events=None, learner=None):
+    """Drive a session generator to completion and return its value.
+
+    ``events`` is an optional event_log.EventLogWriter receiving every answer.
+    """
+    steps = dispatch_steps(session, progress, store, events, learner)
+    reply = None
+    while True:
+        try:
+            step = steps.send(reply)
+        except StopIteration as stop:
+            return stop.value
+        reply = None
+        kind = step[0]
+        if kind == "say":
+            io.say(step[1])
+        elif kind == "wait":
+            io.wait(step[1])
+        elif kind == "ask":
+            reply = io.ask(step[1], step[2])
+        elif kind == "input":
+            reply = io.read(step[1])
+        elif kind == "store":
+            step[1]()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Registro delle risposte di Deutschland B2.
+
+Ogni risposta data durante una sessione diventa una riga JSON in un file a
+sola aggiunta:
+
+    {"ts": 1760780000.12, "learner": "anna", "question": "vocabulary:Lager:plural",
+     "choice": 2, "option": "Lager", "correct": true, "rt_ms": 2140, "seed": 5}
+
+"choice" è la posizione dell'opzione scelta, che da sola non basta: l'ordine
+delle opzioni cambia da una sessione all'altra. "option" ne riporta il testo,
+per ogni tipo di domanda; "seed" (quando c'è) permette di rigenerare la
+domanda intera.
+
+La scrittura passa per un buffer svuotato ogni EVENT_FLUSH_EVERY eventi o
+ogni EVENT_FLUSH_SECONDS secondi; la lettura è in streaming, riga per riga,
+quindi le statistiche si calcolano anche su milioni di eventi con memoria
+proporzionale al numero di domande distinte, non alla lunghezza del file.
+
+    python3 event_log.py stats events_b2.jsonl --top 20
+"""
+
+import argparse
+import json
+import time
+
+EVENT_FLUSH_EVERY = 100
+EVENT_FLUSH_SECONDS = 5.0
+
+
+class EventLogWriter:
+    """Buffered, append-only writer of answer events."""
+
+    def __init__(self, path, flush_every=EVENT_FLUSH_EVERY, flush_seconds=EVENT_FLUSH_SECONDS):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        # il file viene aperto alla prima scrittura effettiva
+        self._file = None
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def write(self, event):
+        self._buffer.append(json.dumps(event, ensure_ascii=False, separators=(",", ":")))
+        if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def answer(self, question_id, choice, correct, seed=None, hard=False, option=None, rt=0.0, learner=None):
+        event = {
+            "ts": round(time.time(), 3),
+            "learner": learner,
+            "question": question_id,
+            "choice": choice,
+            "option": option,
+            "correct": correct,
+            "rt_ms": round(rt * 1000),
+        }
+        # variante della banca delle domande, per rigenerarle (question_bank.py)
+        if seed is not None:
+            event["seed"] = seed
+            if hard:
+                event["hard"] = True
+        self.write(event)
+
+    def flush(self):
+        if self._buffer:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def iter_events(path):
+    """Yield the events of a log one at a time, skipping malformed lines.
+
+    A line cut short by a crash is simply ignored.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(event, dict) and "question" in event:
+                yield event
+
+
+def aggregate(events):
+    """Per-question totals over an event stream.
+
+    Returns {question_id: {"attempts", "correct", "rt_ms_total"}} plus the
+    number of distinct learners, without keeping the events in memory.
+    """
+    stats = {}
+    learners = set()
+    for event in events:
+        entry = stats.get(event["question"])
+        if entry is None:
+            entry = stats[event["question"]] = {"attempts": 0, "correct": 0, "rt_ms_total": 0}
+        entry["attempts"] += 1
+        entry["correct"] += bool(event.get("correct"))
+        entry["rt_ms_total"] += event.get("rt_ms") or 0
+        if event.get("learner") is not None:
+            learners.add(event["learner"])
+    return stats, len(learners)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistiche sul registro delle risposte di Deutschland B2")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stats_cmd = sub.add_parser("stats", help="aggrega il registro per domanda")
+    stats_cmd.add_argument("paths", nargs="+")
+    stats_cmd.add_argument("--top", type=int, default=20, help="quante domande più difficili mostrare")
+    stats_cmd.add_argument("--json", action="store_true", help="stampa tutte le statistiche in JSON")
+    args = parser.parse_args()
+
+    def all_events():
+        for path in args.paths:
+            yield from iter_events(path)
+
+    stats, n_learners = aggregate(all_events())
+    if args.json:
+        print(json.dumps({"learners": n_learners, "questions": stats}, ensure_ascii=False, indent=2))
+        return
+    attempts = sum(s["attempts"] for s in stats.values())
+    correct = sum(s["correct"] for s in stats.values())
+    print(f"{attempts} risposte, {len(stats)} domande, {n_learners} studenti")
+    if attempts:
+        print(f"Risposte corrette: {correct / attempts:.1%}")
+    hardest = sorted(stats.items(), key=lambda kv: (kv[1]["correct"] / kv[1]["attempts"], -kv[1]["attempts"]))
+    for question_id, s in hardest[:args.top]:
+        print(
+            f"{s['correct'] / s['attempts']:6.1%}  {s['attempts']:>7} risposte  "
+            f"{s['rt_ms_total'] / s['attempts']:>7.0f} ms  {question_id}"
+        )
+
+
+if __name__ == "__main__":
+    main()
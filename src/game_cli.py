@@ -10,996 +10,1000 @@ ognuno suddiviso in livelli progressivi. I primi 30 livelli di vocabolario
 si concentrano sul lessico del magazzino e i successivi 20 su vocaboli di uso
 comune. I livelli di grammatica introducono una nuova regola alla volta,
 mentre quelli di comprensione presentano brevi brani seguiti da domande.
-Il gioco salva automaticamente i tuoi progressi nel file progress_b2.json.
+All'avvio si sceglie (o si crea) il profilo dello studente; il gioco salva
+automaticamente i progressi di ciascuno nella cartella profili_b2.
 """
 
-import json
+import atexit
+import collections
+import itertools
 import os
 import random
+import time
 from datetime import datetime
 
-# ---------------------- DATI DI VOCABOLARIO ---------------------- #
-
-warehouse_vocab = [
-    {"word": "Gabelstapler", "plural": "Gabelstapler", "article": "der", "translation": "carrello elevatore"},
-    {"word": "Lager", "plural": "Lager", "article": "das", "translation": "magazzino"},
-    {"word": "Palette", "plural": "Paletten", "article": "die", "translation": "pallet"},
-    {"word": "Lagerarbeiter", "plural": "Lagerarbeiter", "article": "der", "translation": "magazziniere"},
-    {"word": "Regal", "plural": "Regale", "article": "das", "translation": "scaffale"},
-    {"word": "Kiste", "plural": "Kisten", "article": "die", "translation": "cassa/scatola"},
-    {"word": "Paket", "plural": "Pakete", "article": "das", "translation": "pacco"},
-    {"word": "Waage", "plural": "Waagen", "article": "die", "translation": "bilancia"},
-    {"word": "Verpackung", "plural": "Verpackungen", "article": "die", "translation": "imballaggio"},
-    {"word": "Karton", "plural": "Kartons", "article": "der", "translation": "cartone"},
-    {"word": "Schachtel", "plural": "Schachteln", "article": "die", "translation": "scatola"},
-    {"word": "Lieferung", "plural": "Lieferungen", "article": "die", "translation": "consegna"},
-    {"word": "Lagerhaus", "plural": "Lagerhäuser", "article": "das", "translation": "deposito"},
-    {"word": "Versand", "plural": "Versände", "article": "der", "translation": "spedizione"},
-    {"word": "Wareneingang", "plural": "Wareneingänge", "article": "der", "translation": "arrivo merci"},
-    {"word": "Warenausgang", "plural": "Warenausgänge", "article": "der", "translation": "uscita merci"},
-    {"word": "Gut", "plural": "Güter", "article": "das", "translation": "bene/merce"},
-    {"word": "Warensendung", "plural": "Warensendungen", "article": "die", "translation": "spedizione"},
-    {"word": "Kommissionierer", "plural": "Kommissionierer", "article": "der", "translation": "addetto al picking"},
-    {"word": "Kommissionierung", "plural": "Kommissionierungen", "article": "die", "translation": "picking"},
-    {"word": "Lagerverwaltung", "plural": "Lagerverwaltungen", "article": "die", "translation": "gestione del magazzino"},
-    {"word": "Gepäck", "plural": "Gepäcke", "article": "das", "translation": "bagaglio"},
-    {"word": "Förderband", "plural": "Förderbänder", "article": "das", "translation": "nastro trasportatore"},
-    {"word": "Hubwagen", "plural": "Hubwagen", "article": "der", "translation": "transpallet"},
-    {"word": "Transporter", "plural": "Transporter", "article": "der", "translation": "furgone"},
-    {"word": "Container", "plural": "Container", "article": "der", "translation": "container"},
-    {"word": "Laderampe", "plural": "Laderampen", "article": "die", "translation": "rampa di carico"},
-    {"word": "Aufzug", "plural": "Aufzüge", "article": "der", "translation": "ascensore"},
-    {"word": "Arbeitskleidung", "plural": "Arbeitskleidungen", "article": "die", "translation": "abbigliamento da lavoro"},
-    {"word": "Staplerfahrer", "plural": "Staplerfahrer", "article": "der", "translation": "carrellista"},
-]
-
-general_vocab = [
-    {"word": "Haus", "plural": "Häuser", "article": "das", "translation": "casa"},
-    {"word": "Auto", "plural": "Autos", "article": "das", "translation": "auto"},
-    {"word": "Straße", "plural": "Straßen", "article": "die", "translation": "strada"},
-    {"word": "Familie", "plural": "Familien", "article": "die", "translation": "famiglia"},
-    {"word": "Freund", "plural": "Freunde", "article": "der", "translation": "amico"},
-    {"word": "Stadt", "plural": "Städte", "article": "die", "translation": "città"},
-    {"word": "Arbeit", "plural": "Arbeiten", "article": "die", "translation": "lavoro"},
-    {"word": "Zimmer", "plural": "Zimmer", "article": "das", "translation": "stanza"},
-    {"word": "Buch", "plural": "Bücher", "article": "das", "translation": "libro"},
-    {"word": "Tisch", "plural": "Tische", "article": "der", "translation": "tavolo"},
-    {"word": "Stuhl", "plural": "Stühle", "article": "der", "translation": "sedia"},
-    {"word": "Fenster", "plural": "Fenster", "article": "das", "translation": "finestra"},
-    {"word": "Baum", "plural": "Bäume", "article": "der", "translation": "albero"},
-    {"word": "Tür", "plural": "Türen", "article": "die", "translation": "porta"},
-    {"word": "Computer", "plural": "Computer", "article": "der", "translation": "computer"},
-    {"word": "Handy", "plural": "Handys", "article": "das", "translation": "cellulare"},
-    {"word": "Uhr", "plural": "Uhren", "article": "die", "translation": "orologio"},
-    {"word": "Flasche", "plural": "Flaschen", "article": "die", "translation": "bottiglia"},
-    {"word": "Hund", "plural": "Hunde", "article": "der", "translation": "cane"},
-    {"word": "Katze", "plural": "Katzen", "article": "die", "translation": "gatto"},
-]
-
-# Build vocabulary levels (30 warehouse + 20 general = 50)
+from adaptive import AccuracyTable, accuracy, is_mastered, is_weak, item_key
+from cloze import ClozeIndex
+from content_pack import DEFAULT_PACK, builtin_sections, open_pack
+from engine import ConsoleIO, run_session
+from event_log import EventLogWriter
+from grammar_drills import DrillGenerator
+from instrumentation import add_sink, profiled, sink_for, timed
+from level_builder import build_vocabulary_levels
+from level_search import LevelSearchIndex
+from passage_index import PassageIndex
+from question_bank import GENERATED_VARIANTS, QUESTION_VARIANTS, QuestionBank, question_rng
+from profiles import ProfileDirectory, valid_name
+from progress_store import TRACKS, JournalProgressStore, JsonProgressStore, SqliteProgressStore, migrate_json_to_sqlite
+from scheduler import add_item, forget, grade, next_due, parse_review_key, pop_due, review_key
+from similarity import SimilarityIndex
+
+# ---------------------- CATALOGO ---------------------- #
+# Il catalogo viene da un pacchetto compilato (caricato in modo pigro, record
+# per record) se presente, altrimenti dai dati definiti in data.py.
+CONTENT_PACK = os.environ.get("B2_CONTENT_PACK", DEFAULT_PACK)
+# vocaboli per livello e criterio di raggruppamento (vedi level_builder.py);
+# con i valori predefiniti si usano i livelli del catalogo così come sono
+VOCAB_LEVEL_SIZE = int(os.environ.get("B2_VOCAB_LEVEL_SIZE", "1"))
+VOCAB_GROUP_BY = os.environ.get("B2_VOCAB_GROUP_BY", "category")
+
+warehouse_vocab = []
+general_vocab = []
 vocabulary_levels = []
-for idx, item in enumerate(warehouse_vocab, start=1):
-    vocabulary_levels.append({"name": f"Vocabolario magazzino {idx:02d}", "items": [item]})
-for idx, item in enumerate(general_vocab, start=1):
-    vocabulary_levels.append({"name": f"Vocabolario generale {idx:02d}", "items": [item]})
-
-# ---------------------- DATI DI GRAMMATICA ---------------------- #
-grammar_levels = [
-    {
-        "name": "Grammatica 01 – Articoli determinativi",
-        "explanation": "Gli articoli determinativi sono der (maschile), die (femminile e plurale) e das (neutro).",
-        "questions": [
-            {
-                "question": "Quale articolo determinativo è corretto per una parola femminile al singolare?",
-                "options": ["der", "die", "das"],
-                "correct_index": 1,
-            },
-        ],
-    },
-    {
-        "name": "Grammatica 02 – Articoli indeterminativi",
-        "explanation": "Gli articoli indeterminativi sono ein (maschile/neutro) e eine (femminile). Non esistono in plurale.",
-        "questions": [
-            {
-                "question": "Come si dice 'una casa' in tedesco?",
-                "options": ["ein Haus", "eine Haus", "einen Haus"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 03 – Verbo sein (presente)",
-        "explanation": "Il verbo sein (essere) si coniuga: ich bin, du bist, er/sie/es ist, wir sind, ihr seid, sie/Sie sind.",
-        "questions": [
-            {
-                "question": "Qual è la forma corretta per 'noi siamo'?",
-                "options": ["wir sind", "wir seid", "wir sindet"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 04 – Verbo haben (presente)",
-        "explanation": "Il verbo haben (avere) si coniuga: ich habe, du hast, er/sie/es hat, wir haben, ihr habt, sie/Sie haben.",
-        "questions": [
-            {
-                "question": "Qual è la forma corretta per 'lui ha'?",
-                "options": ["er habt", "er hat", "er habe"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 05 – Verbi regolari al presente",
-        "explanation": "I verbi regolari aggiungono le desinenze -e, -st, -t, -en, -t, -en.",
-        "questions": [
-            {
-                "question": "Quale desinenza si usa con 'du' per un verbo regolare?",
-                "options": ["-st", "-t", "-en"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 06 – Verbi modali",
-        "explanation": "I verbi modali comuni sono können (potere), wollen (volere), müssen (dovere), dürfen (permesso), sollen (dovere).",
-        "questions": [
-            {
-                "question": "Quale verbo modale esprime un obbligo (dovere)?",
-                "options": ["können", "müssen", "wollen"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 07 – Pronomi personali (nominativo)",
-        "explanation": "I pronomi personali al nominativo sono: ich, du, er/sie/es, wir, ihr, sie, Sie.",
-        "questions": [
-            {
-                "question": "Qual è il pronome corrispondente a 'voi' in tedesco?",
-                "options": ["wir", "ihr", "sie"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 08 – Casi nominativo e accusativo",
-        "explanation": "Il nominativo è usato per il soggetto; l'accusativo per l'oggetto diretto. Alcuni articoli cambiano: der→den, ein→einen.",
-        "questions": [
-            {
-                "question": "Qual è la forma accusativa di 'der Hund'?",
-                "options": ["der Hund", "den Hund", "dem Hund"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 09 – Caso dativo",
-        "explanation": "Il dativo indica il complemento di termine. Gli articoli cambiano: der→dem, die→der, das→dem, die(plur.)→den + -n.",
-        "questions": [
-            {
-                "question": "Qual è l'articolo dativo per una parola femminile?",
-                "options": ["der", "dem", "die"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 10 – Pronomi possessivi",
-        "explanation": "I pronomi possessivi variano con genere e numero: mein/meine, dein/deine, sein/seine, unser/unsere, euer/eure, ihr/ihre.",
-        "questions": [
-            {
-                "question": "Quale pronome possessivo corrisponde a 'nostro' per un sostantivo neutro?",
-                "options": ["unser", "unsere", "euer"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 11 – Formazione del plurale",
-        "explanation": "Le regole del plurale variano: -e, -er (spesso con umlaut), -n/-en, -s, o nessuna desinenza.",
-        "questions": [
-            {
-                "question": "Quale forma plurale è corretta per 'Buch'?",
-                "options": ["Buche", "Bücher", "Buchen"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 12 – Perfekt con haben",
-        "explanation": "Il Perfekt si forma con haben e il participio passato: ich habe gearbeitet.",
-        "questions": [
-            {
-                "question": "Qual è il participio passato di 'arbeiten'?",
-                "options": ["arbeitet", "gearbeitet", "arbeitete"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 13 – Perfekt con sein",
-        "explanation": "Alcuni verbi di movimento o cambiamento usano sein come ausiliare: ich bin gegangen.",
-        "questions": [
-            {
-                "question": "Quale ausiliare si usa per 'gehen' al perfetto?",
-                "options": ["haben", "sein", "werden"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 14 – Präteritum di sein e haben",
-        "explanation": "Il Präteritum di sein è ich war, du warst, er war...; di haben è ich hatte, du hattest, er hatte...",
-        "questions": [
-            {
-                "question": "Come si dice 'noi eravamo' in tedesco?",
-                "options": ["wir waren", "wir seid", "wir wären"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 15 – Negazione con nicht",
-        "explanation": "Nicht si posiziona alla fine della frase principale o davanti all'elemento da negare.",
-        "questions": [
-            {
-                "question": "In quale posizione si colloca 'nicht' in 'Ich sehe den Mann' quando si nega il complemento?",
-                "options": ["Ich sehe nicht den Mann", "Ich nicht sehe den Mann", "Nicht ich sehe den Mann"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 16 – Comparativo e superlativo",
-        "explanation": "Il comparativo aggiunge -er, il superlativo usa am + -sten: schnell, schneller, am schnellsten.",
-        "questions": [
-            {
-                "question": "Quale frase esprime il superlativo di 'klein'?",
-                "options": ["am kleinsten", "kleiner", "kleinste"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 17 – Preposizioni con accusativo",
-        "explanation": "Preposizioni wie durch, für, gegen, ohne, um richiedono l'accusativo.",
-        "questions": [
-            {
-                "question": "Quale preposizione richiede l'accusativo?",
-                "options": ["mit", "für", "aus"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 18 – Preposizioni con dativo",
-        "explanation": "Preposizioni come aus, bei, mit, nach, seit, von, zu richiedono il dativo.",
-        "questions": [
-            {
-                "question": "Quale preposizione richiede il dativo?",
-                "options": ["durch", "zu", "für"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 19 – Preposizioni duali",
-        "explanation": "Preposizioni an, auf, in, über, unter ecc. richiedono accusativo (moto) o dativo (stato).",
-        "questions": [
-            {
-                "question": "Quando si usa l'accusativo con le preposizioni duali?",
-                "options": ["per il moto a luogo", "per lo stato in luogo", "mai"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 20 – Verbi separabili",
-        "explanation": "I verbi con prefisso separabile pongono il prefisso alla fine: anrufen → ich rufe dich an.",
-        "questions": [
-            {
-                "question": "Qual è la forma corretta di 'anrufen' con 'ich'?",
-                "options": ["ich anrufe", "ich rufe an", "ich rufen an"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 21 – Verbi inseparabili",
-        "explanation": "I prefissi be-, ent-, er-, ver-, zer-, miss- non si separano: verstehen → ich verstehe.",
-        "questions": [
-            {
-                "question": "Quale frase è corretta per 'verstehen' con 'wir'?",
-                "options": ["wir stehen ver", "wir verstehe", "wir verstehen"],
-                "correct_index": 2,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 22 – Ordine delle parole (verbo in seconda posizione)",
-        "explanation": "Nelle frasi principali il verbo coniugato è in seconda posizione: Heute gehe ich ins Kino.",
-        "questions": [
-            {
-                "question": "Quale frase rispetta l'ordine corretto?",
-                "options": ["Heute ich gehe ins Kino", "Heute gehe ich ins Kino", "Ich gehe oggi Kino ins"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 23 – Congiunzioni subordinanti",
-        "explanation": "Le congiunzioni weil, dass, obwohl ecc. mandano il verbo alla fine della proposizione subordinata.",
-        "questions": [
-            {
-                "question": "Quale frase è corretta?",
-                "options": ["Ich bleibe zu Hause, weil regnet es.", "Ich bleibe zu Hause, weil es regnet.", "Ich bleibe weil es regnet zu Hause."],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 24 – Futuro con werden",
-        "explanation": "Il futuro si forma con werden + infinito alla fine: ich werde gehen.",
-        "questions": [
-            {
-                "question": "Come si traduce 'lei andrà'?",
-                "options": ["sie wird gehen", "sie geht werden", "sie wird gehet"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 25 – Perfekt vs Präteritum",
-        "explanation": "Il Perfekt si usa nel parlato, il Präteritum nello scritto e nei racconti.",
-        "questions": [
-            {
-                "question": "Quale tempo si usa di solito nel parlato quotidiano?",
-                "options": ["Perfekt", "Präteritum", "Plusquamperfekt"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 26 – Aggettivi con articolo determinativo",
-        "explanation": "Gli aggettivi con articolo determinativo prendono desinenze deboli (-e/-en): der große Hund.",
-        "questions": [
-            {
-                "question": "Qual è la forma corretta?",
-                "options": ["der groß Hund", "der große Hund", "den großen Hund"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 27 – Aggettivi senza articolo",
-        "explanation": "Senza articolo, l'aggettivo ha desinenze forti: großer Hund, große Katze.",
-        "questions": [
-            {
-                "question": "Come si dice 'cane grande' senza articolo?",
-                "options": ["großer Hund", "große Hund", "groß Hund"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 28 – Pronomi relativi",
-        "explanation": "I pronomi relativi der, die, das concordano con il genere/numero dell'antecedente.",
-        "questions": [
-            {
-                "question": "Quale pronome relativo si usa per un nome neutro al nominativo?",
-                "options": ["der", "die", "das"],
-                "correct_index": 2,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 29 – Clausole infinitive con zu",
-        "explanation": "Le frasi con zu + infinito mettono il verbo all'ultimo: Ich hoffe, dich bald zu sehen.",
-        "questions": [
-            {
-                "question": "Quale frase è corretta?",
-                "options": ["Ich freue mich, dich zu treffen.", "Ich freue mich dich treffen zu.", "Ich freue mich, zu treffen dich."],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 30 – Voce passiva (Präsens)",
-        "explanation": "La passiva presente: werden + participio passato: Das Paket wird geliefert.",
-        "questions": [
-            {
-                "question": "Come si forma la passiva di 'Der Kurier liefert das Paket' (presente)?",
-                "options": ["Der Paket wird geliefert vom Kurier.", "Das Paket wird vom Kurier geliefert.", "Das Paket ist geliefert vom Kurier."],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 31 – Voce passiva (Perfekt)",
-        "explanation": "La passiva del Perfekt usa sein + participio passato + worden: Das Paket ist geliefert worden.",
-        "questions": [
-            {
-                "question": "Quale forma è corretta?",
-                "options": ["Das Paket ist geliefert worden.", "Das Paket wurde geliefert worden.", "Das Paket hat geliefert worden."],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 32 – Konjunktiv II (cortesia)",
-        "explanation": "Il Konjunktiv II esprime desideri/cortesia: ich würde gehen, ich hätte, ich wäre.",
-        "questions": [
-            {
-                "question": "Come si dice 'Vorrei un caffè'?",
-                "options": ["Ich hätte einen Kaffee", "Ich habe einen Kaffee", "Ich war einen Kaffee"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 33 – Konjunktiv II (ipotesi)",
-        "explanation": "Konjunktiv II per situazioni ipotetiche: Wenn ich Zeit hätte, würde ich reisen.",
-        "questions": [
-            {
-                "question": "Quale frase usa correttamente il Konjunktiv II?",
-                "options": ["Wenn ich Geld hätte, würde ich ein Auto kaufen.", "Wenn ich Geld habe, kaufe ich ein Auto.", "Wenn ich Geld hätte, ich kaufe ein Auto."],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 34 – Genitivo",
-        "explanation": "Il genitivo indica possesso: des Autos, der Freundin.",
-        "questions": [
-            {
-                "question": "Quale forma genitiva è corretta per 'das Auto'?",
-                "options": ["des Autos", "des Auto", "der Autos"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 35 – Espressioni di tempo",
-        "explanation": "Preposizioni temporali: seit (da), vor (fa), nach (dopo), in (tra).",
-        "questions": [
-            {
-                "question": "Quale preposizione indica 'da due anni'?",
-                "options": ["seit", "vor", "nach"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 36 – Connettivi avversativi",
-        "explanation": "Aber, sondern, jedoch introducono un contrasto; non cambiano l'ordine del verbo.",
-        "questions": [
-            {
-                "question": "Quale congiunzione significa 'ma' e non altera l'ordine del verbo?",
-                "options": ["aber", "weil", "dass"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 37 – Ordine TMP (tempo-modo-luogo)",
-        "explanation": "L'ordine degli avverbi è tempo-modo-luogo: Ich arbeite morgen gern im Lager.",
-        "questions": [
-            {
-                "question": "Quale ordine è corretto in 'Ich arbeite morgen gerne im Lager'?",
-                "options": ["Tempo-Modo-Luogo", "Modo-Luogo-Tempo", "Luogo-Tempo-Modo"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 38 – Partizip I e II come aggettivi",
-        "explanation": "Il Partizip I/II può essere usato come aggettivo: die laufende Maschine, die geschlossene Tür.",
-        "questions": [
-            {
-                "question": "Quale frase usa il Partizip II come aggettivo?",
-                "options": ["die laufende Maschine", "die geschlossene Tür", "die spielende Kinder"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 39 – Verbi con preposizioni fisse",
-        "explanation": "Alcuni verbi richiedono preposizioni: warten auf (+akk), helfen bei (+dat).",
-        "questions": [
-            {
-                "question": "Quale preposizione si usa con 'warten'?",
-                "options": ["auf", "mit", "zu"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 40 – Futuro composto",
-        "explanation": "Futuro composto: werden + participio passato + haben/sein: Ich werde gearbeitet haben.",
-        "questions": [
-            {
-                "question": "Quale forma è corretta?",
-                "options": ["Ich werde gearbeitet haben", "Ich habe arbeiten werden", "Ich werde haben gearbeitet"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 41 – Sostantivazione di verbi e aggettivi",
-        "explanation": "I verbi e aggettivi possono diventare sostantivi: das Lesen, das Neue.",
-        "questions": [
-            {
-                "question": "Quale parola è una sostantivazione corretta?",
-                "options": ["lesen", "Lesen", "lesung"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 42 – Verbi riflessivi",
-        "explanation": "I verbi riflessivi usano un pronome riflessivo: ich wasche mich.",
-        "questions": [
-            {
-                "question": "Quale forma è corretta per 'noi ci laviamo'?",
-                "options": ["wir waschen uns", "wir uns waschen", "uns waschen wir"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 43 – Verbi separabili al Perfekt",
-        "explanation": "Nel Perfekt, il prefisso separabile precede il participio: ich habe angerufen.",
-        "questions": [
-            {
-                "question": "Come si traduce 'ha telefonato' (anrufen) al Perfekt?",
-                "options": ["er hat angerufen", "er angerufen hat", "er hat gerufen an"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 44 – Preposizioni con il genitivo",
-        "explanation": "Preposizioni wie während, trotz, aufgrund richiedono il genitivo.",
-        "questions": [
-            {
-                "question": "Quale preposizione regge il genitivo?",
-                "options": ["wegen", "mit", "zu"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 45 – Verbi transitivi e intransitivi",
-        "explanation": "I verbi transitivi hanno un oggetto; gli intransitivi no.",
-        "questions": [
-            {
-                "question": "Quale verbo è intransitivo?",
-                "options": ["schlafen", "lesen", "essen"],
-                "correct_index": 0,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 46 – Posizione di 'auch'",
-        "explanation": "Auch si posiziona dopo il verbo o prima dell'elemento a cui si riferisce.",
-        "questions": [
-            {
-                "question": "Quale frase è corretta?",
-                "options": ["Ich auch komme", "Ich komme auch", "Auch ich komme"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 47 – Pronomi indefiniti",
-        "explanation": "Pronomi indefiniti: man (si), jemand (qualcuno), niemand (nessuno), etwas (qualcosa).",
-        "questions": [
-            {
-                "question": "Quale pronome significa 'qualcuno'?",
-                "options": ["niemand", "jemand", "nichts"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 48 – Comparativo di uguaglianza",
-        "explanation": "Il comparativo di uguaglianza usa so … wie: Er ist so groß wie sein Bruder.",
-        "questions": [
-            {
-                "question": "Quale frase esprime correttamente un confronto di uguaglianza?",
-                "options": ["Er ist größer als ich", "Er ist so groß wie ich", "Er ist am größten"],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 49 – Frasi relative con preposizione",
-        "explanation": "Se una relativa richiede una preposizione, questa precede il pronome relativo.",
-        "questions": [
-            {
-                "question": "Quale frase è corretta?",
-                "options": ["Das ist der Freund, ich spreche mit dem.", "Das ist der Freund, mit dem ich spreche.", "Das ist der Freund, mit ich spreche dem."],
-                "correct_index": 1,
-            }
-        ],
-    },
-    {
-        "name": "Grammatica 50 – Particelle modali comuni",
-        "explanation": "Particelle come mal, doch, eben attenuano o rafforzano il significato di una frase.",
-        "questions": [
-            {
-                "question": "Quale particella modale si usa spesso per attenuare una richiesta?",
-                "options": ["mal", "doch", "denn"],
-                "correct_index": 0,
-            }
-        ],
-    },
-]
-
-# ---------------------- DATI DI COMPRENSIONE ---------------------- #
-comprehension_levels = [
-    {
-        "name": "Comprensione 01 – Nel magazzino",
-        "passage": "Tom arbeitet seit zwei Jahren in einem großen Lager. Jeden Morgen überprüft er die Lieferungen und sortiert die Pakete. Er benutzt oft einen Gabelstapler, um schwere Paletten zu bewegen.",
-        "questions": [
-            {"question": "Was macht Tom jeden Morgen?", "options": ["Er überprüft die Lieferungen", "Er fährt zur Schule", "Er ruht sich aus"], "correct_index": 0},
-            {"question": "Welches Gerät benutzt er, um Paletten zu bewegen?", "options": ["einen Aufzug", "einen Gabelstapler", "eine Waage"], "correct_index": 1},
-        ],
-    },
-    {
-        "name": "Comprensione 02 – Einkaufen",
-        "passage": "Anna geht heute in die Stadt, um ein neues Handy zu kaufen. Sie besucht verschiedene Geschäfte und vergleicht die Preise. Schließlich findet sie ein günstiges Angebot und bezahlt an der Kasse.",
-        "questions": [
-            {"question": "Was möchte Anna kaufen?", "options": ["ein Handy", "ein Buch", "eine Uhr"], "correct_index": 0},
-            {"question": "Was macht sie, bevor sie bezahlt?", "options": ["Sie vergleicht die Preise", "Sie ruft ihren Freund an", "Sie geht nach Hause"], "correct_index": 0},
-        ],
-    },
-    {
-        "name": "Comprensione 03 – Der Freund",
-        "passage": "Peter besucht seinen Freund Max, der in einem kleinen Dorf wohnt. Sie sitzen im Garten, trinken Kaffee und sprechen über ihre Arbeit. Peter erzählt von seinem neuen Projekt im Lager.",
-        "questions": [
-            {"question": "Wo wohnt Max?", "options": ["in einer Stadt", "in einem Dorf", "in einem Haus am See"], "correct_index": 1},
-            {"question": "Worüber sprechen sie?", "options": ["über ihre Arbeit", "über das Wetter", "über Sport"], "correct_index": 0},
-        ],
-    },
-    {
-        "name": "Comprensione 04 – Das Paket",
-        "passage": "Im Büro ist ein Paket angekommen. Die Sekretärin legt es auf den Tisch und informiert den Chef. Er öffnet die Verpackung und findet darin neue Computer für das Lager.",
-        "questions": [
-            {"question": "Wer informiert den Chef über das Paket?", "options": ["die Sekretärin", "der Fahrer", "der Lagerarbeiter"], "correct_index": 0},
-            {"question": "Was befindet sich im Paket?", "options": ["Bücher", "Computer", "Kleider"], "correct_index": 1},
-        ],
-    },
-    {
-        "name": "Comprensione 05 – Der Hund und die Katze",
-        "passage": "Im Park spielen ein Hund und eine Katze miteinander. Der Hund bringt einen Ball, und die Katze jagt den Schatten. Viele Kinder stehen um sie herum und lachen.",
-        "questions": [
-            {"question": "Was bringt der Hund?", "options": ["einen Stock", "einen Ball", "eine Flasche"], "correct_index": 1},
-            {"question": "Wer lacht im Park?", "options": ["die Tiere", "die Kinder", "die Eltern"], "correct_index": 1},
-        ],
-    },
-    {
-        "name": "Comprensione 06 – Ein neues Regal",
-        "passage": "Im Lager wurde ein neues Regal aufgebaut. Jetzt gibt es mehr Platz für Kisten und Pakete. Die Mitarbeiter freuen sich, weil die Arbeit leichter wird.",
-        "questions": [
-            {"question": "Was wurde aufgebaut?", "options": ["ein Regal", "eine Palette", "ein Karton"], "correct_index": 0},
-            {"question": "Warum freuen sich die Mitarbeiter?", "options": ["weil sie Urlaub machen", "weil die Arbeit leichter wird", "weil sie Pizza essen"], "correct_index": 1},
-        ],
-    },
-    {
-        "name": "Comprensione 07 – Der Aufzug",
-        "passage": "Im Lager gibt es einen alten Aufzug. Eines Tages bleibt er zwischen zwei Stockwerken stehen. Die Mitarbeiter müssen die Pakete über die Treppe tragen, bis der Techniker den Aufzug repariert.",
-        "questions": [
-            {"question": "Was passiert mit dem Aufzug?", "options": ["Er fährt zu schnell", "Er bleibt stehen", "Er wird größer"], "correct_index": 1},
-            {"question": "Wie transportieren die Mitarbeiter die Pakete?", "options": ["mit dem Aufzug", "über die Treppe", "mit dem Auto"], "correct_index": 1},
-        ],
-    },
-    {
-        "name": "Comprensione 08 – Die Lieferung",
-        "passage": "Heute kommt eine große Lieferung im Lager an. Drei LKW bringen Paletten mit Waren. Die Lagerarbeiter überprüfen die Lieferung und tragen alles ins Lagerhaus.",
-        "questions": [
-            {"question": "Womit wird die Lieferung gebracht?", "options": ["mit Lastwagen", "mit Flugzeugen", "mit Fahrrädern"], "correct_index": 0},
-            {"question": "Was machen die Lagerarbeiter mit der Lieferung?", "options": ["Sie werfen sie weg", "Sie überprüfen und lagern sie", "Sie schicken sie zurück"], "correct_index": 1},
-        ],
-    },
-    {
-        "name": "Comprensione 09 – Freizeit",
-        "passage": "Am Wochenende fährt Maria gern mit ihrem Auto zum See. Sie nimmt ein Buch, eine Flasche Wasser und ihren Hund mit. Dort liest sie, wandert ein bisschen und genießt die Natur.",
-        "questions": [
-            {"question": "Wohin fährt Maria am Wochenende?", "options": ["zum Meer", "zum See", "in die Stadt"], "correct_index": 1},
-            {"question": "Was nimmt sie mit?", "options": ["ein Buch und Wasser", "nur ihren Hund", "einen Computer"], "correct_index": 0},
-        ],
-    },
-    {
-        "name": "Comprensione 10 – Das Büro",
-        "passage": "Im Büro arbeiten fünf Personen. Jeden Montag haben sie eine Besprechung. Der Chef lobt die Mitarbeiter für ihre Arbeit und plant neue Projekte.",
-        "questions": [
-            {"question": "Wann haben sie eine Besprechung?", "options": ["Jeden Tag", "Jeden Montag", "Jeden Freitag"], "correct_index": 1},
-            {"question": "Was macht der Chef?", "options": ["Er lobt die Mitarbeiter", "Er schläft", "Er macht Urlaub"], "correct_index": 0},
-        ],
-    },
-    {
-        "name": "Comprensione 11 – Die Familie",
-        "passage": "Die Familie Müller wohnt in einem großen Haus. Im Garten stehen viele Bäume. Jeden Sonntag kochen sie gemeinsam und sitzen am Tisch.",
-        "questions": [
-            {"question": "Was gibt es im Garten?", "options": ["Blumen", "Bäume", "Autos"], "correct_index": 1},
-            {"question": "Was machen sie sonntags?", "options": ["Sie gehen schwimmen", "Sie kochen gemeinsam", "Sie arbeiten"], "correct_index": 1},
-        ],
-    },
-    {
-        "name": "Comprensione 12 – Der Umzug",
-        "passage": "Julia zieht in eine neue Wohnung um. Viele Freunde helfen ihr, die Möbel zu transportieren. Der Aufzug ist klein, deshalb benutzen sie die Treppe.",
-        "questions": [
-            {"question": "Warum benutzen sie die Treppe?", "options": ["weil es regnet", "weil der Aufzug klein ist", "weil sie Sport machen wollen"], "correct_index": 1},
-            {"question": "Wer hilft Julia?", "options": ["Ihre Kollegen", "Ihre Freunde", "Niemand"], "correct_index": 1},
-        ],
-    },
-    {
-        "name": "Comprensione 13 – Der Urlaub",
-        "passage": "Nächstes Jahr möchte die Familie Becker eine Reise nach Italien machen. Sie wollen Rom besuchen, Pizza essen und viel Zeit am Meer verbringen.",
-        "questions": [
-            {"question": "Wohin möchte die Familie fahren?", "options": ["nach Spanien", "nach Italien", "nach Frankreich"], "correct_index": 1},
-            {"question": "Was wollen sie machen?", "options": ["Bücher lesen", "Pizza essen und Rom besuchen", "Ski fahren"], "correct_index": 1},
-        ],
-    },
-    {
-        "name": "Comprensione 14 – Am Wochenende",
-        "passage": "Paul bleibt am Wochenende zu Hause. Er repariert sein Fahrrad, liest ein interessantes Buch und ruft seine Freunde an. Am Sonntag kocht er einen großen Kuchen.",
-        "questions": [
-            {"question": "Was repariert Paul?", "options": ["sein Auto", "sein Fahrrad", "seinen Computer"], "correct_index": 1},
-            {"question": "Was macht er am Sonntag?", "options": ["Er kocht einen Kuchen", "Er geht spazieren", "Er arbeitet im Lager"], "correct_index": 0},
-        ],
-    },
-    {
-        "name": "Comprensione 15 – Die Bibliothek",
-        "passage": "In der Bibliothek ist es ruhig. Viele Studenten sitzen an den Tischen und lernen. Die Bibliothekarin hilft einem Kind, ein passendes Buch zu finden.",
-        "questions": [
-            {"question": "Was macht die Bibliothekarin?", "options": ["Sie liest Bücher", "Sie hilft einem Kind", "Sie schläft"], "correct_index": 1},
-            {"question": "Wer lernt in der Bibliothek?", "options": ["Studenten", "Tiere", "Lehrer"], "correct_index": 0},
-        ],
-    },
-]
+grammar_levels = []
+comprehension_levels = []
+
+# indici derivati dal catalogo, costruiti al primo utilizzo
+_indexes = {}
+
+def install_catalogue(sections):
+    """Make ``sections`` the active catalogue and drop every derived index."""
+    global warehouse_vocab, general_vocab, vocabulary_levels, grammar_levels, comprehension_levels
+    warehouse_vocab = sections["warehouse_vocab"]
+    general_vocab = sections["general_vocab"]
+    vocabulary_levels = sections["vocabulary_levels"]
+    grammar_levels = sections["grammar_levels"]
+    comprehension_levels = sections["comprehension_levels"]
+    _indexes.clear()
+
+def load_catalogue(pack_path=None, level_size=None, group_by=None):
+    """Load the compiled content pack if it exists, else the catalogue in data.py.
+
+    A non-default ``level_size``/``group_by`` regroups the vocabulary levels.
+    Completed vocabulary levels are saved by their words, so a level of the
+    new layout shows as completed once all its words were completed.
+    """
+    pack_path = pack_path or CONTENT_PACK
+    level_size = level_size or VOCAB_LEVEL_SIZE
+    group_by = group_by or VOCAB_GROUP_BY
+    if os.path.exists(pack_path):
+        sections = open_pack(pack_path)
+    else:
+        sections = builtin_sections()
+    if level_size != 1 or group_by != "category":
+        sections = dict(sections)
+        sections["vocabulary_levels"] = build_vocabulary_levels(
+            sections["warehouse_vocab"], sections["general_vocab"], level_size, group_by
+        )
+    install_catalogue(sections)
+
+def all_vocab():
+    return itertools.chain(warehouse_vocab, general_vocab)
+
+def cached_index(name, build):
+    """Return the derived index ``name``, building it on first use."""
+    if name not in _indexes:
+        _indexes[name] = build()
+    return _indexes[name]
+
+load_catalogue()
 
 # ---------------------- GESTIONE PROGRESSO ---------------------- #
 PROGRESS_FILE = "progress_b2.json"
+PROGRESS_DB = "progress_b2.db"
+# "json" (predefinito), "journal" oppure "sqlite"
+PROGRESS_BACKEND = os.environ.get("B2_PROGRESS_BACKEND", "json")
+
+progress_store = None
+
+def open_progress_store(backend=None):
+    """Create the progress store for the configured backend."""
+    backend = backend or PROGRESS_BACKEND
+    if backend == "sqlite":
+        store = SqliteProgressStore(PROGRESS_DB)
+        # migrazione una tantum dal vecchio file JSON
+        migrate_json_to_sqlite(PROGRESS_FILE, store)
+        return store
+    if backend == "json":
+        return JsonProgressStore(PROGRESS_FILE)
+    if backend == "journal":
+        return JournalProgressStore(PROGRESS_FILE)
+    raise ValueError(f"Backend di salvataggio sconosciuto: {backend}")
+
+def get_progress_store():
+    global progress_store
+    if progress_store is None:
+        progress_store = open_progress_store()
+    return progress_store
+
+def set_progress_store(store):
+    global progress_store
+    progress_store = store
+
+# ---------------------- PROFILI ---------------------- #
+# un progresso per studente nella cartella dei profili, con lo stesso backend;
+# il catalogo caricato resta condiviso tra tutti (vedi profiles.py)
+PROFILES_DIR = os.environ.get("B2_PROFILES_DIR", "profili_b2")
+DEFAULT_PROFILE = "predefinito"
+
+profile_directory = None
+current_profile = None
+
+def get_profiles():
+    global profile_directory
+    if profile_directory is None:
+        profile_directory = ProfileDirectory(PROFILES_DIR, PROGRESS_BACKEND)
+        # il progresso del gioco a studente singolo diventa un profilo
+        profile_directory.adopt(DEFAULT_PROFILE, PROGRESS_FILE, PROGRESS_DB)
+    return profile_directory
 
-def load_progress():
-    if os.path.exists(PROGRESS_FILE):
-        try:
-            with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    # default progress structure
-    return {
-        "vocabulary_completed": [],
-        "grammar_completed": [],
-        "comprehension_completed": [],
-        "review_vocab": [],
-        "review_grammar": [],
-        "review_comp": [],
-        "last_review": None,
+def switch_profile(name):
+    """Make ``name`` the active learner and return their progress.
+
+    Only the progress store changes: catalogue, indexes and question bank
+    stay loaded.
+    """
+    global current_profile
+    if progress_store is not None:
+        progress_store.close()
+    set_progress_store(get_profiles().open(name))
+    current_profile = name
+    progress = load_progress()
+    prefetch_questions(progress)
+    return progress
+
+# ---------------------- STRUMENTAZIONE ---------------------- #
+# tempi per fase in un file JSON ("-" per un riepilogo a fine partita) e
+# profilo cProfile dell'intera partita; vuoti = disattivati (vedi instrumentation.py)
+STATS_FILE = os.environ.get("B2_STATS", "")
+PROFILE_FILE = os.environ.get("B2_PROFILE", "")
+
+# ---------------------- REGISTRO DELLE RISPOSTE ---------------------- #
+# ogni risposta viene aggiunta a questo file (vedi event_log.py); "" lo disattiva
+EVENT_LOG = os.environ.get("B2_EVENT_LOG", "events_b2.jsonl")
+
+_event_log = None
+
+def get_event_log():
+    """The shared answer log, or None if disabled."""
+    global _event_log
+    if _event_log is None and EVENT_LOG:
+        _event_log = EventLogWriter(EVENT_LOG)
+        # svuota il buffer anche se il gioco termina con Ctrl+C
+        atexit.register(_event_log.close)
+    return _event_log
+
+def _level_key(entry, track):
+    """Map a legacy completion or review entry to its level key.
+
+    Older files stored a level's position in the catalogue (or, before
+    that, the whole level dict); positions are read against the catalogue
+    as loaded now. Returns None for a level that no longer exists.
+    """
+    registry = get_registry(track)
+    if isinstance(entry, str) and entry.isdigit() and registry.id_of_key(entry) is None:
+        # posizione importata in una colonna di testo (SQLite)
+        entry = int(entry)
+    if isinstance(entry, dict):
+        level_id = registry.id_of(entry.get("name"))
+    elif isinstance(entry, int) and not isinstance(entry, bool):
+        level_id = entry if registry.get(entry) is not None else None
+    else:
+        return entry
+    return None if level_id is None else registry.key(level_id)
+
+def _upgrade_item_key(key):
+    """Map a positional review key ("grammar:3") to the level key; else unchanged."""
+    track, item_id = parse_review_key(key)
+    if track == "vocabulary" or not item_id.isdigit() or get_registry(track).id_of_key(item_id) is not None:
+        return key
+    level_key = _level_key(int(item_id), track)
+    return key if level_key is None else review_key(track, level_key)
+
+def _upgrade_item_keys(table):
+    """Rename positional keys of a key -> value dict in place; True if any changed."""
+    renamed = {key: _upgrade_item_key(key) for key in table}
+    renamed = {old: new for old, new in renamed.items() if new != old}
+    for old, new in renamed.items():
+        table.setdefault(new, table.pop(old))
+    return bool(renamed)
+
+def upgrade_progress(progress):
+    """Turn completion and review lists into sets of level keys and words.
+
+    Legacy entries (level positions, or review entries that embed whole
+    catalogue dicts) are converted, and so are positional review and
+    accuracy keys.
+
+    Review items that have no spaced-repetition state yet (older progress
+    files) are scheduled as due now. Returns True when the stored layout was
+    outdated and has to be rewritten.
+    """
+    changed = False
+    now = time.time()
+    accuracy = progress.get("accuracy") or {}
+    if isinstance(accuracy, AccuracyTable):
+        accuracy = accuracy.to_json()
+    changed |= _upgrade_item_keys(accuracy)
+    progress["accuracy"] = AccuracyTable.from_json(accuracy)
+    if _upgrade_item_keys(progress["srs"]):
+        changed = True
+        # la coda di priorità va ricostruita con le nuove chiavi
+        progress.pop("_srs_queue", None)
+    for track, (completed_key, _) in TRACKS.items():
+        keys = set()
+        for entry in progress[completed_key]:
+            key = _level_key(entry, track)
+            changed |= key != entry
+            if key is not None:
+                keys.add(key)
+        progress[completed_key] = keys
+    converters = {
+        "review_vocab": ("vocabulary", lambda e: e.get("word") if isinstance(e, dict) else e),
+        "review_grammar": ("grammar", lambda e: _level_key(e, "grammar")),
+        "review_comp": ("comprehension", lambda e: _level_key(e, "comprehension")),
     }
+    for key, (track, to_id) in converters.items():
+        ids = set()
+        for entry in progress[key]:
+            entry_id = to_id(entry)
+            changed |= entry_id != entry
+            if entry_id is not None:
+                ids.add(entry_id)
+                if add_item(progress, review_key(track, entry_id), now):
+                    changed = True
+        progress[key] = ids
+    return changed
+
+@timed()
+def load_progress(store=None):
+    store = store or get_progress_store()
+    progress = store.load()
+    if getattr(store, "corrupt_copy", None):
+        print(f"⚠️ Il file dei progressi era danneggiato (copia conservata in {store.corrupt_copy}).")
+        if store.recovered_from:
+            print(f"Progressi recuperati dalla copia di sicurezza {store.recovered_from}.")
+    # riscrive subito un layout datato o un file appena recuperato dal backup
+    if upgrade_progress(progress) or getattr(store, "recovered_from", None):
+        store.save(progress)
+    return progress
 
+@timed()
 def save_progress(progress):
-    with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
-        json.dump(progress, f, ensure_ascii=False, indent=2)
+    get_progress_store().save(progress)
+
+# ---------------------- INDICE DEI DISTRATTORI ---------------------- #
+class DistractorIndex:
+    """Per-field pools of distractor values, built once over the vocabulary.
+
+    Every field (plural, translation) keeps the list of its distinct values and
+    a map from each word to the position of its own value, so sampling k
+    distractors that exclude the correct answer costs O(k) instead of a scan
+    of the whole vocabulary.
+    """
+
+    FIELDS = ("plural", "translation")
+
+    def __init__(self, items):
+        items = list(items)
+        self.values = {}
+        self.positions = {}
+        for field in self.FIELDS:
+            values = []
+            value_pos = {}
+            word_pos = {}
+            for it in items:
+                value = getattr(it, field)
+                if value not in value_pos:
+                    value_pos[value] = len(values)
+                    values.append(value)
+                word_pos[it.word] = value_pos[value]
+            self.values[field] = values
+            self.positions[field] = word_pos
+
+    def sample(self, field, item, k, rng=random):
+        """Return k distinct values of ``field`` different from the item's own."""
+        values = self.values[field]
+        own = getattr(item, field)
+        pos = self.positions[field].get(item.word)
+        if pos is None or values[pos] != own:
+            # parola non presente nell'indice (es. ripasso di un vecchio salvataggio)
+            pool = [v for v in values if v != own]
+            return rng.sample(pool, k=min(k, len(pool)))
+        # campiona tra n-1 posizioni e salta quella della risposta corretta
+        picks = rng.sample(range(len(values) - 1), k=min(k, len(values) - 1))
+        return [values[i if i < pos else i + 1] for i in picks]
+
+def get_distractor_index():
+    return cached_index("distractors", lambda: DistractorIndex(all_vocab()))
+
+def get_similarity_index():
+    return cached_index("similarity", lambda: SimilarityIndex(all_vocab()))
+
+def pick_distractors(field, item, k, hard=False, rng=random):
+    """k distractors for ``field``: one near miss (all of them if ``hard``), the rest random."""
+    similarity = get_similarity_index()
+    near = similarity.near_misses(field, item, k if hard else 1, rng)
+    # qualche valore in più, per sostituire i sinonimi scartati
+    rest = [
+        v for v in get_distractor_index().sample(field, item, 2 * k, rng)
+        if v not in near and not similarity.is_alternative(field, item, v)
+    ]
+    return near + rest[:k - len(near)]
+
+# ---------------------- TABELLE DI LOOKUP ---------------------- #
+# Il progresso memorizza solo ID compatti: la parola per i vocaboli e la
+# posizione del livello per grammatica e comprensione. Queste tabelle li
+# risolvono nel catalogo caricato in memoria.
+def get_vocab_by_word():
+    return cached_index("vocab_by_word", lambda: {it.word: it for it in all_vocab()})
+
+def get_passage_index():
+    """Words and vocabulary lemmas -> sentences of the comprehension passages."""
+    return cached_index("passages", lambda: PassageIndex(comprehension_levels, all_vocab()))
+
+def get_cloze_index():
+    """Gaps and distractor pools of the comprehension passages (see cloze.py)."""
+    return cached_index("cloze", lambda: ClozeIndex(comprehension_levels, all_vocab()))
+
+def get_drill_generator():
+    """Conjugation, article-case and comparative drills for the grammar levels."""
+    return cached_index("drills", lambda: DrillGenerator(all_vocab()))
+
+# ---------------------- REGISTRO DEI LIVELLI ---------------------- #
+class LevelRegistry:
+    """The levels of one track, addressed by integer IDs.
+
+    A level's ID is its position in the loaded catalogue, so lookups by ID
+    are O(1); it is only used in memory. The progress stores the level's
+    stable key (records.py, from its name or its words), so inserting or
+    reordering levels in a content pack does not move anybody's progress.
+    Lookups by name or key go through hash indexes built on first use.
+    """
+
+    def __init__(self, track, levels):
+        self.track = track
+        self.levels = levels
+        self.completed_key, self.review_key = TRACKS[track]
+        self._id_by_name = None
+        self._id_by_key = None
+        self._levels_by_word = None
+        self._search_index = None
+
+    def __len__(self):
+        return len(self.levels)
+
+    def __getitem__(self, level_id):
+        return self.levels[level_id]
+
+    def get(self, level_id):
+        if isinstance(level_id, int) and 0 <= level_id < len(self.levels):
+            return self.levels[level_id]
+        return None
+
+    def id_of(self, name):
+        if self._id_by_name is None:
+            self._id_by_name = {lvl.name: i for i, lvl in enumerate(self.levels)}
+        return self._id_by_name.get(name)
+
+    def key(self, level_id):
+        return self.levels[level_id].key
+
+    def id_of_key(self, key):
+        if self._id_by_key is None:
+            self._id_by_key = {lvl.key: i for i, lvl in enumerate(self.levels)}
+        return self._id_by_key.get(key)
+
+    def search(self, query):
+        """Level IDs whose name (or vocabulary) matches ``query``."""
+        if self._search_index is None:
+            self._search_index = LevelSearchIndex(self.levels)
+        return self._search_index.search(query)
+
+    def first_uncompleted(self, completed, start=0):
+        for level_id in range(start, len(self.levels)):
+            if level_id not in completed:
+                return level_id
+        return None
+
+    def completed(self, progress):
+        """IDs of the completed levels that are in the loaded catalogue.
+
+        Vocabulary keys list the level's words, so keys saved under another
+        level layout (B2_VOCAB_LEVEL_SIZE, B2_VOCAB_GROUP_BY) still count: a
+        current level is completed once all its words were completed.
+        """
+        done = set()
+        words = set()
+        for key in progress[self.completed_key]:
+            level_id = self.id_of_key(key)
+            if level_id is not None:
+                done.add(level_id)
+            elif self.track == "vocabulary":
+                words.update(key.split("+"))
+        if words:
+            done.update(self._covered_levels(words))
+        return done
+
+    def _covered_levels(self, words):
+        if self._levels_by_word is None:
+            self._levels_by_word = {}
+            for i, lvl in enumerate(self.levels):
+                for it in lvl.items:
+                    self._levels_by_word.setdefault(it.word, []).append(i)
+        counts = collections.Counter(
+            level_id for word in words for level_id in self._levels_by_word.get(word, ())
+        )
+        return {level_id for level_id, n in counts.items() if n == len(self.levels[level_id].items)}
+
+    def mark_completed(self, progress, level_id):
+        """Record a completed level; returns False if it already was."""
+        completed = progress[self.completed_key]
+        key = self.key(level_id)
+        if key in completed:
+            return False
+        completed.add(key)
+        return True
+
+def get_registry(track):
+    levels = {
+        "vocabulary": vocabulary_levels,
+        "grammar": grammar_levels,
+        "comprehension": comprehension_levels,
+    }[track]
+    return cached_index(f"registry:{track}", lambda: LevelRegistry(track, levels))
 
 # ---------------------- UTILITIES ---------------------- #
+console_io = ConsoleIO()
+
 def ask_multiple_choice(question, options, correct_index):
-    print()
-    print(question)
-    for idx, opt in enumerate(options, start=1):
-        print(f"{idx}. {opt}")
-    while True:
-        choice = input("Scegli l'opzione corretta (1-3): ")
-        if choice.isdigit() and 1 <= int(choice) <= len(options):
-            return int(choice) - 1 == correct_index
-        print("Scelta non valida. Riprova.")
+    return console_io.ask(question, options) == correct_index
+
+def play(session, progress, store=None, io=None):
+    """Run a session on the terminal (or another adapter), saving through ``store``."""
+    return run_session(session, progress, store or get_progress_store(), io or console_io, get_event_log(), current_profile)
 
-def generate_vocab_questions(item):
-    """Generate a mix of questions for a single vocabulary item."""
+@timed()
+def generate_vocab_questions(item, hard=False, rng=random):
+    """Generate a mix of questions for a single vocabulary item.
+
+    Plural and translation options always include a near miss; with ``hard``
+    every distractor is one (see similarity.py). All randomness comes from
+    ``rng``, so a seeded generator reproduces the same questions.
+    """
     questions = []
     # Plural question
-    plural_options = [item["plural"]]
+    plural_options = [item.plural]
     # choose two other plural forms as distractors
-    all_plurals = [v["plural"] for v in warehouse_vocab + general_vocab if v["word"] != item["word"]]
-    plural_options += random.sample(all_plurals, k=2)
-    random.shuffle(plural_options)
+    plural_options += pick_distractors("plural", item, 2, hard, rng)
+    rng.shuffle(plural_options)
     questions.append({
-        "question": f"Qual è il plurale di '{item['word']}'?",
+        "id": f"{review_key('vocabulary', item.word)}:plural",
+        "question": f"Qual è il plurale di '{item.word}'?",
         "options": plural_options,
-        "correct_index": plural_options.index(item["plural"]),
+        "correct_index": plural_options.index(item.plural),
     })
     # Article question
     article_options = ["der", "die", "das"]
     questions.append({
-        "question": f"Qual è l'articolo determinativo corretto per '{item['word']}'?",
+        "id": f"{review_key('vocabulary', item.word)}:article",
+        "question": f"Qual è l'articolo determinativo corretto per '{item.word}'?",
         "options": article_options,
-        "correct_index": article_options.index(item["article"]),
+        "correct_index": article_options.index(item.article),
     })
     # Translation question
-    translations = [v["translation"] for v in warehouse_vocab + general_vocab if v["word"] != item["word"]]
-    trans_options = [item["translation"]] + random.sample(translations, k=2)
-    random.shuffle(trans_options)
+    trans_options = [item.translation] + pick_distractors("translation", item, 2, hard, rng)
+    rng.shuffle(trans_options)
     questions.append({
-        "question": f"Cosa significa '{item['word']}'?",
+        "id": f"{review_key('vocabulary', item.word)}:translation",
+        "question": f"Cosa significa '{item.word}'?",
         "options": trans_options,
-        "correct_index": trans_options.index(item["translation"]),
+        "correct_index": trans_options.index(item.translation),
     })
     return questions
 
+# ---------------------- BANCA DELLE DOMANDE ---------------------- #
+# le sessioni prendono le domande dei vocaboli dalla banca (vedi
+# question_bank.py): stesse (parola, variante, difficoltà), stesse domande
+PREFETCH_LEVELS = 3
+
+def _bank_questions(item, seed, hard):
+    questions = generate_vocab_questions(item, hard, question_rng(item.word, seed, hard))
+    for q in questions:
+        q["seed"] = seed
+        q["hard"] = hard
+    return questions
+
+def get_question_bank():
+    return cached_index("question_bank", lambda: QuestionBank(_bank_questions))
+
+# frasi da completare di ogni variante: le sessioni ne usano al più tante
+CLOZE_PER_LEVEL = 3
+
+def _cloze_questions(level_id, seed, hard=False):
+    rng = question_rng(review_key("comprehension", comprehension_levels[level_id].key), seed, hard)
+    questions = get_cloze_index().questions(level_id, CLOZE_PER_LEVEL, rng)
+    for q in questions:
+        q["seed"] = seed
+    return questions
+
+def get_cloze_bank():
+    return cached_index("cloze_bank", lambda: QuestionBank(_cloze_questions, key=int))
+
+def cloze_questions(level_id, seed=None):
+    """The cloze questions of a comprehension level for variant ``seed`` (random if None)."""
+    if seed is None:
+        seed = random.randrange(GENERATED_VARIANTS)
+    return get_cloze_bank().get(level_id, seed)
+
+# esercizi di grammatica di ogni variante, per i livelli che ne hanno
+DRILLS_PER_LEVEL = 4
+
+def _drill_questions(level_id, seed, hard=False):
+    rng = question_rng(review_key("grammar", grammar_levels[level_id].key), seed, hard)
+    drills = get_drill_generator().questions(grammar_levels[level_id].drills, DRILLS_PER_LEVEL, rng)
+    return [dict(q, id=question_id("grammar", level_id, q["drill"]), seed=seed) for q in drills]
+
+def get_drill_bank():
+    return cached_index("drill_bank", lambda: QuestionBank(_drill_questions, key=int))
+
+def level_drills(level_id, seed=None):
+    """The generated drills of a grammar level for variant ``seed`` (random if None)."""
+    if seed is None:
+        seed = random.randrange(GENERATED_VARIANTS)
+    return get_drill_bank().get(level_id, seed)
+
+def vocab_questions(item, seed=None, hard=False):
+    """The questions of a vocabulary item for variant ``seed`` (random if None)."""
+    if seed is None:
+        seed = random.randrange(QUESTION_VARIANTS)
+    return get_question_bank().get(item, seed, hard)
+
+def prefetch_questions(progress):
+    """Pre-generate in the background the questions of the next vocabulary levels."""
+    registry = get_registry("vocabulary")
+    first = registry.first_uncompleted(registry.completed(progress))
+    if first is None:
+        return None
+    levels = vocabulary_levels[first:first + PREFETCH_LEVELS]
+    return get_question_bank().prefetch(it for level in levels for it in level.items)
+
 # ---------------------- SESSIONI DI LIVELLO ---------------------- #
-def run_vocab_level(index, progress):
+# Le sessioni sono generatori che non fanno I/O: producono passi
+#   ("say", testo)                  -> mostra un testo
+#   ("wait", prompt)                -> attende che l'utente prema Invio
+#   ("ask", domanda, opzioni)       -> riceve con send() l'indice scelto
+#   ("input", prompt)               -> riceve con send() una riga di testo
+#   ("answer", id, scelta, esito, variante, difficile, opzione)
+#                                   -> una risposta data, per il registro degli eventi
+#                                      (opzione è il testo scelto: l'ordine delle
+#                                      opzioni cambia da una sessione all'altra)
+#   ("record_level", ...) / ("record_review", ...) / ("record_stats", ...)
+#                                   -> salvataggio del progresso
+# e vengono eseguite da engine.run_session() con un adattatore di I/O
+# (terminale o correzione in blocco), oppure dal server asyncio di server.py.
+#
+# Con adaptive=True (predefinito) le sessioni usano l'accuratezza registrata
+# (vedi adaptive.py): distrattori più difficili per gli elementi ormai
+# padroneggiati e, a fine sessione, una seconda occasione per le domande
+# sbagliate sugli elementi deboli. La correzione in blocco la disattiva, così
+# un foglio produce sempre le stesse domande.
+
+# accuratezza per elemento di tutti gli studenti di questo processo
+population_stats = AccuracyTable()
+
+def item_accuracy(progress, key):
+    return accuracy(progress["accuracy"], population_stats, key)
+
+def hard_distractors(progress, key):
+    """True when the learner (or, lacking data, everyone) masters ``key``."""
+    return is_mastered(item_accuracy(progress, key))
+
+def question_id(track, level_id, qi):
+    """ID of the ``qi``-th question of a grammar or comprehension level (by level key)."""
+    return f"{review_key(track, get_registry(track).key(level_id))}:{qi}"
+
+def level_questions(track, index):
+    """The questions of a grammar or comprehension level, tagged with their IDs."""
+    levels = grammar_levels if track == "grammar" else comprehension_levels
+    return [dict(q, id=question_id(track, index, qi)) for qi, q in enumerate(levels[index].questions)]
+
+def ask_question(q, progress=None, record=True):
+    """Ask one question and give feedback; evaluates to True if correct.
+
+    With ``progress`` the answer also updates the accuracy statistics; with
+    ``record=False`` it is neither counted there nor logged.
+    """
+    choice = yield ("ask", q["question"], q["options"])
+    ok = choice == q["correct_index"]
+    if record:
+        option = q["options"][choice] if isinstance(choice, int) and 0 <= choice < len(q["options"]) else None
+        yield ("answer", q.get("id"), choice, ok, q.get("seed"), q.get("hard", False), option)
+    if record and progress is not None and q.get("id"):
+        key = item_key(q["id"])
+        progress["accuracy"].record(key, ok)
+        population_stats.record(key, ok)
+    if ok:
+        yield ("say", "✅ Corretto!")
+        return True
+    yield ("say", f"❌ Sbagliato! La risposta corretta è: {q['options'][q['correct_index']]}")
+    return False
+
+def retry_variant(q):
+    """Another version of ``q`` for a second chance: new distractors where the
+    question has variants, and in any case the options in a different order."""
+    variant = q
+    if q.get("seed") is not None and q["id"].startswith("vocabulary:"):
+        item = get_vocab_by_word().get(parse_review_key(item_key(q["id"]))[1])
+        if item is not None:
+            seed = (q["seed"] + random.randrange(1, QUESTION_VARIANTS)) % QUESTION_VARIANTS
+            variant = next(
+                (v for v in vocab_questions(item, seed, q.get("hard", False)) if v["id"] == q["id"]), q
+            )
+    answer = variant["options"][variant["correct_index"]]
+    options = list(variant["options"])
+    random.shuffle(options)
+    if options == q["options"]:
+        options = options[1:] + options[:1]
+    return dict(variant, options=options, correct_index=options.index(answer))
+
+def retry_weak_session(missed, progress):
+    """Ask again the missed questions whose item is still weak.
+
+    Second chances are not scored and, coming right after the correct answer
+    was shown, not counted in the accuracy statistics or the answer log.
+    """
+    retry = [q for q in missed if is_weak(item_accuracy(progress, item_key(q["id"])))]
+    if retry:
+        yield ("say", "\nUn'altra occasione per le domande sbagliate:")
+        for q in retry:
+            yield from ask_question(retry_variant(q), record=False)
+
+def quiz_session(questions, progress, adaptive=True):
+    """Ask every question once; evaluates to the number of correct answers."""
+    correct = 0
+    missed = []
+    for q in questions:
+        if (yield from ask_question(q, progress)):
+            correct += 1
+        else:
+            missed.append(q)
+    if adaptive:
+        yield from retry_weak_session(missed, progress)
+    yield ("record_stats", sorted({item_key(q["id"]) for q in questions}))
+    return correct
+
+EXAMPLES_PER_WORD = 1
+
+def vocab_level_session(index, progress, adaptive=True):
     level = vocabulary_levels[index]
-    items = level["items"]
-    print("\n" + "=" * 60)
-    print(f"Inizio {level['name']}")
-    print("Vocaboli introdotti:")
+    items = level.items
+    yield ("say", "\n" + "=" * 60)
+    yield ("say", f"Inizio {level.name}")
+    yield ("say", "Vocaboli introdotti:")
+    passages = get_passage_index()
     for it in items:
-        print(f" - {it['article']} {it['word']} | plurale: {it['plural']} | traduzione: {it['translation']}")
-    input("Premi Invio per iniziare gli esercizi...")
-    correct = 0
-    total = 0
-    for item in items:
-        qs = generate_vocab_questions(item)
-        for q in qs:
-            total += 1
-            if ask_multiple_choice(q["question"], q["options"], q["correct_index"]):
-                print("✅ Corretto!")
-                correct += 1
-            else:
-                print(f"❌ Sbagliato! La risposta corretta è: {q['options'][q['correct_index']]}" )
+        yield ("say", f" - {it.article} {it.word} | plurale: {it.plural} | traduzione: {it.translation}")
+        # una frase vera dai testi di comprensione, se il vocabolo vi compare
+        for sentence in passages.examples(it.word, EXAMPLES_PER_WORD):
+            yield ("say", f"   «{sentence}»")
+    yield ("wait", "Premi Invio per iniziare gli esercizi...")
+    # tutte le domande del livello in un solo passaggio; con più vocaboli
+    # vengono mescolate, così non arrivano raggruppate per parola
+    questions = [
+        q
+        for item in items
+        for q in vocab_questions(
+            item, hard=adaptive and hard_distractors(progress, review_key("vocabulary", item.word))
+        )
+    ]
+    if len(items) > 1:
+        random.shuffle(questions)
+    total = len(questions)
+    correct = yield from quiz_session(questions, progress, adaptive)
     score = correct / total
-    if score >= 0.8:
-        print(f"Hai superato il livello! Punteggio {correct}/{total}")
-        level_id = vocabulary_levels.index(level)
-        if level_id not in progress["vocabulary_completed"]:
-            progress["vocabulary_completed"].append(level_id)
+    passed = score >= 0.8
+    new_review = []
+    if passed:
+        yield ("say", f"Hai superato il livello! Punteggio {correct}/{total}")
+        if get_registry("vocabulary").mark_completed(progress, index):
             # Aggiungi item al ripasso
             for it in items:
-                if it not in progress["review_vocab"]:
-                    progress["review_vocab"].append(it)
+                if it.word not in progress["review_vocab"]:
+                    progress["review_vocab"].add(it.word)
+                    add_item(progress, review_key("vocabulary", it.word), time.time())
+                    new_review.append(it.word)
     else:
-        print(f"Non hai raggiunto il punteggio sufficiente ({correct}/{total}). Ritenta questo livello.")
-    save_progress(progress)
+        yield ("say", f"Non hai raggiunto il punteggio sufficiente ({correct}/{total}). Ritenta questo livello.")
+    yield ("record_level", "vocabulary", level.key, new_review, correct, total, passed)
 
-def run_grammar_level(index, progress):
+def grammar_level_session(index, progress, adaptive=True, drills=DRILLS_PER_LEVEL):
     level = grammar_levels[index]
-    print("\n" + "=" * 60)
-    print(f"Inizio {level['name']}")
-    print("Regola:")
-    print(level["explanation"])
-    input("Premi Invio per iniziare gli esercizi...")
-    correct = 0
-    total = 0
-    for q in level["questions"]:
-        total += 1
-        if ask_multiple_choice(q["question"], q["options"], q["correct_index"]):
-            print("✅ Corretto!")
-            correct += 1
-        else:
-            print(f"❌ Sbagliato! La risposta corretta è: {q['options'][q['correct_index']]}" )
+    yield ("say", "\n" + "=" * 60)
+    yield ("say", f"Inizio {level.name}")
+    yield ("say", "Regola:")
+    yield ("say", level.explanation)
+    yield ("wait", "Premi Invio per iniziare gli esercizi...")
+    # esercizi generati aggiunti alla domanda fissa, nuovi a ogni sessione
+    questions = level_questions("grammar", index) + level_drills(index)[:drills]
+    total = len(questions)
+    correct = yield from quiz_session(questions, progress, adaptive)
     score = correct / total
-    if score >= 0.8:
-        print(f"Hai superato il livello! Punteggio {correct}/{total}")
-        if index not in progress["grammar_completed"]:
-            progress["grammar_completed"].append(index)
-            progress["review_grammar"].append(level)
+    passed = score >= 0.8
+    new_review = []
+    if passed:
+        yield ("say", f"Hai superato il livello! Punteggio {correct}/{total}")
+        if get_registry("grammar").mark_completed(progress, index):
+            progress["review_grammar"].add(level.key)
+            add_item(progress, review_key("grammar", level.key), time.time())
+            new_review.append(level.key)
     else:
-        print(f"Non hai raggiunto il punteggio sufficiente ({correct}/{total}). Ritenta questo livello.")
-    save_progress(progress)
+        yield ("say", f"Non hai raggiunto il punteggio sufficiente ({correct}/{total}). Ritenta questo livello.")
+    yield ("record_level", "grammar", level.key, new_review, correct, total, passed)
 
-def run_comprehension_level(index, progress):
+def comprehension_level_session(index, progress, adaptive=True, cloze=CLOZE_PER_LEVEL):
     level = comprehension_levels[index]
-    print("\n" + "=" * 60)
-    print(f"Inizio {level['name']}")
-    print("\nTesto:")
-    print(level["passage"])
-    input("Premi Invio per rispondere alle domande...")
-    correct = 0
-    total = 0
-    for q in level["questions"]:
-        total += 1
-        if ask_multiple_choice(q["question"], q["options"], q["correct_index"]):
-            print("✅ Corretto!")
-            correct += 1
-        else:
-            print(f"❌ Sbagliato! La risposta corretta è: {q['options'][q['correct_index']]}" )
+    yield ("say", "\n" + "=" * 60)
+    yield ("say", f"Inizio {level.name}")
+    yield ("say", "\nTesto:")
+    yield ("say", level.passage)
+    yield ("wait", "Premi Invio per rispondere alle domande...")
+    # frasi da completare aggiunte alle domande del testo, nuove a ogni sessione
+    questions = level_questions("comprehension", index) + cloze_questions(index)[:cloze]
+    total = len(questions)
+    correct = yield from quiz_session(questions, progress, adaptive)
     score = correct / total
-    if score >= 0.8:
-        print(f"Hai superato il livello! Punteggio {correct}/{total}")
-        if index not in progress["comprehension_completed"]:
-            progress["comprehension_completed"].append(index)
-            progress["review_comp"].append(level)
+    passed = score >= 0.8
+    new_review = []
+    if passed:
+        yield ("say", f"Hai superato il livello! Punteggio {correct}/{total}")
+        if get_registry("comprehension").mark_completed(progress, index):
+            progress["review_comp"].add(level.key)
+            add_item(progress, review_key("comprehension", level.key), time.time())
+            new_review.append(level.key)
     else:
-        print(f"Non hai raggiunto il punteggio sufficiente ({correct}/{total}). Ritenta questo livello.")
-    save_progress(progress)
+        yield ("say", f"Non hai raggiunto il punteggio sufficiente ({correct}/{total}). Ritenta questo livello.")
+    yield ("record_level", "comprehension", level.key, new_review, correct, total, passed)
+
+def run_vocab_level(index, progress):
+    play(vocab_level_session(index, progress), progress)
+
+def run_grammar_level(index, progress):
+    play(grammar_level_session(index, progress), progress)
+
+def run_comprehension_level(index, progress):
+    play(comprehension_level_session(index, progress), progress)
 
 # ---------------------- RIPASSO QUOTIDIANO ---------------------- #
-def daily_review(progress):
-    today = datetime.today().strftime("%Y-%m-%d")
-    if progress["last_review"] == today:
-        print("Hai già effettuato il ripasso oggi. Riprova domani.")
-        return
+REVIEW_SESSION_SIZE = 6
+
+def review_question(key, hard=False):
+    """Build one question for a scheduled review key, or None if it no longer exists."""
+    track, item_id = parse_review_key(key)
+    if track == "vocabulary":
+        vocab_by_word = get_vocab_by_word()
+        if item_id not in vocab_by_word:
+            return None
+        return random.choice(vocab_questions(vocab_by_word[item_id], hard=hard))
+    level_id = get_registry(track).id_of_key(item_id)
+    if level_id is None:
+        return None
+    # una volta su due un esercizio generato (frase da completare o esercizio
+    # di grammatica) invece delle domande fisse, se il livello ne ha
+    if random.random() < 0.5:
+        if track == "grammar":
+            generated = level_drills(level_id)[:1]
+        else:
+            generated = cloze_questions(level_id)[:1]
+        if generated:
+            return generated[0]
+    questions = get_registry(track)[level_id].questions
+    qi = random.randrange(len(questions))
+    return dict(questions[qi], id=question_id(track, level_id, qi))
+
+def daily_review_session(progress, adaptive=True):
     if not progress["review_vocab"] and not progress["review_grammar"] and not progress["review_comp"]:
-        print("Non ci sono ancora elementi da ripassare. Completa alcuni livelli prima!")
+        yield ("say", "Non ci sono ancora elementi da ripassare. Completa alcuni livelli prima!")
+        return
+    now = time.time()
+    due = pop_due(progress, now, REVIEW_SESSION_SIZE)
+    if not due:
+        when = next_due(progress)
+        if when is not None:
+            yield ("say", f"Nessun elemento da ripassare ora. Prossimo ripasso: {datetime.fromtimestamp(when):%d/%m/%Y %H:%M}.")
+        else:
+            yield ("say", "Nessun elemento da ripassare ora.")
         return
-    print("\n" + "=" * 60)
-    print("Sessione di ripasso quotidiano")
-    # Vocab review
-    if progress["review_vocab"]:
-        sample = random.sample(progress["review_vocab"], k=min(3, len(progress["review_vocab"])) )
-        for it in sample:
-            qs = generate_vocab_questions(it)
-            q = random.choice(qs)
-            if ask_multiple_choice(q["question"], q["options"], q["correct_index"]):
-                print("✅ Corretto!")
-            else:
-                print(f"❌ Sbagliato! La risposta corretta è: {q['options'][q['correct_index']]}" )
-    # Grammar review
-    if progress["review_grammar"]:
-        sample = random.sample(progress["review_grammar"], k=min(2, len(progress["review_grammar"])) )
-        for lvl in sample:
-            q = random.choice(lvl["questions"])
-            if ask_multiple_choice(q["question"], q["options"], q["correct_index"]):
-                print("✅ Corretto!")
-            else:
-                print(f"❌ Sbagliato! La risposta corretta è: {q['options'][q['correct_index']]}" )
-    # Comprehension review
-    if progress["review_comp"]:
-        sample = random.sample(progress["review_comp"], k=min(1, len(progress["review_comp"])) )
-        for lvl in sample:
-            q = random.choice(lvl["questions"])
-            if ask_multiple_choice(q["question"], q["options"], q["correct_index"]):
-                print("✅ Corretto!")
-            else:
-                print(f"❌ Sbagliato! La risposta corretta è: {q['options'][q['correct_index']]}" )
-    progress["last_review"] = today
-    save_progress(progress)
-    print("Ripasso completato! Continua così 🎉")
+    yield ("say", "\n" + "=" * 60)
+    yield ("say", "Sessione di ripasso")
+    updated = []
+    missed = []
+    for key in due:
+        q = review_question(key, adaptive and hard_distractors(progress, key))
+        if q is None:
+            forget(progress, key)
+            updated.append(key)
+            continue
+        ok = yield from ask_question(q, progress)
+        grade(progress, key, ok, now)
+        updated.append(key)
+        if not ok:
+            missed.append(q)
+    if adaptive:
+        yield from retry_weak_session(missed, progress)
+    yield ("record_stats", [key for key in updated if key in progress["srs"]])
+    progress["last_review"] = datetime.today().strftime("%Y-%m-%d")
+    yield ("record_review", updated)
+    yield ("say", "Ripasso completato! Continua così 🎉")
+
+def daily_review(progress):
+    play(daily_review_session(progress), progress)
 
 # ---------------------- MENU PRINCIPALE ---------------------- #
-def choose_level(levels, completed):
-    for idx, lvl in enumerate(levels):
-        status = "✅" if idx in completed else " "
-        print(f"{idx+1:02d}. {lvl['name']} {status}")
+PAGE_SIZE = 20
+PICKER_PROMPT = "Numero del livello, n/p per cambiare pagina, /testo per cercare, u per il prossimo da completare, b per tornare indietro: "
+
+def level_picker_session(registry, completed):
+    """Paginated, searchable level picker; evaluates to a level ID or None.
+
+    Only the visible page is rendered, so the cost of a visit does not grow
+    with the catalogue.
+    """
+    matches = range(len(registry))
+    query = None
+    first = registry.first_uncompleted(completed)
+    page = (first or 0) // PAGE_SIZE
     while True:
-        choice = input(f"Scegli un livello (1-{len(levels)}) o 'b' per tornare indietro: ").strip()
+        pages = max(1, -(-len(matches) // PAGE_SIZE))
+        page = max(0, min(page, pages - 1))
+        header = f"Pagina {page + 1}/{pages}"
+        if query:
+            header += f" – ricerca '{query}': {len(matches)} livelli"
+        lines = [header]
+        for idx in matches[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]:
+            status = "✅" if idx in completed else " "
+            lines.append(f"{idx+1:02d}. {registry[idx].name} {status}")
+        if not matches:
+            lines.append("Nessun livello trovato.")
+        yield ("say", "\n".join(lines))
+        choice = (yield ("input", PICKER_PROMPT)).strip()
         if choice.lower() == 'b':
             return None
-        if choice.isdigit() and 1 <= int(choice) <= len(levels):
+        if choice.lower() == 'n':
+            page += 1
+        elif choice.lower() == 'p':
+            page -= 1
+        elif choice.lower() == 'u':
+            level_id = registry.first_uncompleted(completed)
+            if level_id is not None:
+                return level_id
+            yield ("say", "Hai già completato tutti i livelli di questo percorso!")
+        elif choice.startswith('/'):
+            query = choice[1:].strip() or None
+            matches = registry.search(query) if query else range(len(registry))
+            page = 0
+        elif choice.isdigit() and 1 <= int(choice) <= len(registry):
             return int(choice) - 1
-        print("Scelta non valida. Riprova.")
+        else:
+            yield ("say", "Scelta non valida. Riprova.")
+
+def choose_level(registry, completed):
+    return play(level_picker_session(registry, completed), None)
+
+def profile_picker_session(names, current=None):
+    """Pick an existing profile by number or create one by name; evaluates to a name or None."""
+    while True:
+        lines = ["Profili:"]
+        for idx, name in enumerate(names, start=1):
+            marker = " (attivo)" if name == current else ""
+            lines.append(f"{idx:02d}. {name}{marker}")
+        if not names:
+            lines.append("Nessun profilo ancora.")
+        yield ("say", "\n".join(lines))
+        prompt = "Numero del profilo o nome di un nuovo profilo"
+        choice = (yield ("input", prompt + (", b per tornare indietro: " if current else ": "))).strip()
+        if current and choice.lower() == 'b':
+            return None
+        if choice.isdigit() and 1 <= int(choice) <= len(names):
+            return names[int(choice) - 1]
+        if valid_name(choice):
+            if choice not in names:
+                yield ("say", f"Nuovo profilo: {choice}")
+            return choice
+        yield ("say", "Scelta non valida: usa un numero oppure lettere, numeri, - e _.")
+
+SEARCH_PROMPT = "Parola da cercare nei testi (Invio per tornare indietro): "
+SEARCH_RESULTS = 10
+
+def text_search_session():
+    """Look words up in the vocabulary and in the comprehension passages."""
+    passages = get_passage_index()
+    registry = get_registry("comprehension")
+    while True:
+        query = (yield ("input", SEARCH_PROMPT)).strip()
+        if not query:
+            return
+        lines = []
+        for term in dict.fromkeys(query.split()):
+            lemma = passages.lemma(term)
+            if lemma is not None:
+                it = get_vocab_by_word()[lemma]
+                lines.append(f"{it.article} {it.word} | plurale: {it.plural} | traduzione: {it.translation}")
+        hits = passages.search(query)
+        if not hits:
+            lines.append("Nessuna frase trovata.")
+        else:
+            lines.append("1 frase trovata" if len(hits) == 1 else f"{len(hits)} frasi trovate")
+        for level_id, n in hits[:SEARCH_RESULTS]:
+            lines.append(f" - {registry[level_id].name}: {passages.sentence(level_id, n)}")
+        yield ("say", "\n".join(lines))
+
+def choose_profile(current=None):
+    return play(profile_picker_session(get_profiles().names(), current), None)
 
 def main():
+    sink = sink_for(STATS_FILE)
+    if sink is not None:
+        add_sink(sink)
+    try:
+        with profiled(PROFILE_FILE):
+            main_menu()
+    finally:
+        if sink is not None:
+            sink.close()
+
+def main_menu():
     print("✨ Benvenuto in Deutschland B2! ✨")
-    progress = load_progress()
+    progress = switch_profile(choose_profile())
     while True:
-        print("\nMenù principale:")
+        print(f"\nMenù principale ({current_profile}):")
         print("1. Percorso Vocabolario")
         print("2. Percorso Grammatica")
         print("3. Comprensione del testo")
         print("4. Ripasso quotidiano")
-        print("5. Esci")
-        sel = input("Scegli un'opzione (1-5): ").strip()
+        print("5. Cerca nei testi")
+        print("6. Cambia profilo")
+        print("7. Esci")
+        sel = input("Scegli un'opzione (1-7): ").strip()
         if sel == '1':
-            idx = choose_level(vocabulary_levels, progress["vocabulary_completed"])
+            registry = get_registry("vocabulary")
+            idx = choose_level(registry, registry.completed(progress))
             if idx is not None:
                 run_vocab_level(idx, progress)
         elif sel == '2':
-            idx = choose_level(grammar_levels, progress["grammar_completed"])
+            registry = get_registry("grammar")
+            idx = choose_level(registry, registry.completed(progress))
             if idx is not None:
                 run_grammar_level(idx, progress)
         elif sel == '3':
-            idx = choose_level(comprehension_levels, progress["comprehension_completed"])
+            registry = get_registry("comprehension")
+            idx = choose_level(registry, registry.completed(progress))
             if idx is not None:
                 run_comprehension_level(idx, progress)
         elif sel == '4':
             daily_review(progress)
         elif sel == '5':
+            play(text_search_session(), None)
+        elif sel == '6':
+            name = choose_profile(current_profile)
+            if name is not None and name != current_profile:
+                progress = switch_profile(name)
+                print(f"Ciao {name}!")
+        elif sel == '7':
             print("Auf Wiedersehen! Buono studio 👋")
+            get_progress_store().close()
+            if _event_log is not None:
+                _event_log.close()
             break
         else:
             print("Scelta non valida. Riprova.")
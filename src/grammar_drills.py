@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+"""
+Esercizi di grammatica generati da regole per Deutschland B2.
+
+Invece di una domanda fissa, un livello di grammatica può indicare uno o più
+tipi di esercizio (campo "drills" del livello):
+
+* sein, haben, regular_verbs, modal_verbs – coniugazione al presente;
+* nominative, accusative, dative, genitive – articolo e sostantivo nel caso
+  richiesto, con i vocaboli del catalogo e il loro articolo (singolare con
+  articolo determinativo o indeterminativo, plurale);
+* comparative – comparativo e superlativo degli aggettivi.
+
+Le tabelle (coniugazioni, declinazioni, gradi dell'aggettivo) si calcolano
+con poche regole più le eccezioni elencate qui sotto e vengono memorizzate
+alla prima richiesta, quindi generare un esercizio costa una scelta a caso e
+qualche accesso a tupla: migliaia di esercizi diversi al secondo.
+"""
+
+import random
+from functools import lru_cache
+
+PRONOUNS = ("ich", "du", "er", "wir", "ihr", "sie")
+# "sie" plurale, da non confondere con "sie" (lei)
+PERSON_HINTS = ("", "", "", "", "", " (loro)")
+
+IRREGULAR_VERBS = {
+    "sein": ("bin", "bist", "ist", "sind", "seid", "sind"),
+    "haben": ("habe", "hast", "hat", "haben", "habt", "haben"),
+}
+MODAL_VERBS = {
+    "können": ("kann", "kannst", "kann", "können", "könnt", "können"),
+    "müssen": ("muss", "musst", "muss", "müssen", "müsst", "müssen"),
+    "wollen": ("will", "willst", "will", "wollen", "wollt", "wollen"),
+    "dürfen": ("darf", "darfst", "darf", "dürfen", "dürft", "dürfen"),
+    "sollen": ("soll", "sollst", "soll", "sollen", "sollt", "sollen"),
+    "mögen": ("mag", "magst", "mag", "mögen", "mögt", "mögen"),
+}
+REGULAR_VERBS = (
+    "arbeiten", "kaufen", "lernen", "machen", "spielen", "wohnen", "packen", "bestellen",
+    "sortieren", "prüfen", "zählen", "suchen", "brauchen", "kochen", "öffnen", "warten",
+    "reisen", "tanzen", "liefern", "lächeln",
+)
+
+CASES = ("nominative", "accusative", "dative", "genitive")
+CASE_NAMES = {"nominative": "al nominativo", "accusative": "all'accusativo", "dative": "al dativo", "genitive": "al genitivo"}
+DEFINITE = {
+    "der": ("der", "den", "dem", "des"),
+    "die": ("die", "die", "der", "der"),
+    "das": ("das", "das", "dem", "des"),
+}
+INDEFINITE = {
+    "der": ("ein", "einen", "einem", "eines"),
+    "die": ("eine", "eine", "einer", "einer"),
+    "das": ("ein", "ein", "einem", "eines"),
+}
+PLURAL = ("die", "die", "den", "der")
+# varianti del sostantivo nell'esercizio: (chiave, descrizione)
+NUMBERS = (
+    ("definite", "singolare, con l'articolo determinativo"),
+    ("indefinite", "singolare, con l'articolo indeterminativo"),
+    ("plural", "plurale"),
+)
+
+# aggettivo -> (comparativo, superlativo) per le eccezioni alle regole
+IRREGULAR_ADJECTIVES = {
+    "gut": ("besser", "am besten"),
+    "viel": ("mehr", "am meisten"),
+    "gern": ("lieber", "am liebsten"),
+    "hoch": ("höher", "am höchsten"),
+    "nah": ("näher", "am nächsten"),
+    "groß": ("größer", "am größten"),
+}
+# aggettivi monosillabici che prendono l'Umlaut
+UMLAUT_ADJECTIVES = ("alt", "jung", "kurz", "lang", "warm", "kalt", "stark", "arm", "krank", "hart", "klug", "schwach")
+ADJECTIVES = tuple(IRREGULAR_ADJECTIVES) + UMLAUT_ADJECTIVES + (
+    "klein", "schnell", "billig", "teuer", "schwer", "leicht", "schön", "breit", "dunkel",
+    "leise", "wichtig", "heiß", "laut", "spät", "interessant", "voll",
+)
+
+CONJUGATION_DRILLS = {
+    "sein": ("sein",),
+    "haben": ("haben",),
+    "regular_verbs": REGULAR_VERBS,
+    "modal_verbs": tuple(MODAL_VERBS),
+}
+DRILL_KINDS = tuple(CONJUGATION_DRILLS) + CASES + ("comparative",)
+
+
+# ---------------------- PARADIGMI ---------------------- #
+@lru_cache(maxsize=None)
+def conjugate(verb):
+    """Present tense of ``verb`` for ich, du, er, wir, ihr, sie."""
+    if verb in IRREGULAR_VERBS:
+        return IRREGULAR_VERBS[verb]
+    if verb in MODAL_VERBS:
+        return MODAL_VERBS[verb]
+    if verb.endswith(("ern", "eln")):
+        # liefern: ich liefere, wir liefern; lächeln: ich lächle
+        stem = verb[:-1]
+        ich = verb[:-3] + "le" if verb.endswith("eln") else stem + "e"
+        return (ich, stem + "st", stem + "t", verb, stem + "t", verb)
+    stem = verb[:-2]
+    # arbeiten, öffnen: e di raccordo davanti a -st e -t
+    if stem.endswith(("d", "t")) or (stem.endswith(("m", "n")) and stem[-2] not in "aeiouäöülrhm"):
+        return (stem + "e", stem + "est", stem + "et", verb, stem + "et", verb)
+    # reisen, tanzen: du reist
+    du = stem + "t" if stem.endswith(("s", "ß", "x", "z")) else stem + "st"
+    return (stem + "e", du, stem + "t", verb, stem + "t", verb)
+
+
+def _genitive(word, article):
+    if article == "die":
+        return word
+    if word.endswith("nis"):
+        return word + "ses"
+    if word.endswith(("s", "ß", "x", "z", "sch")):
+        return word + "es"
+    return word + "s"
+
+
+@lru_cache(maxsize=None)
+def declension(item):
+    """Noun phrases of a vocabulary item in the four cases.
+
+    Returns a dict "definite"/"indefinite"/"plural" -> (nominative,
+    accusative, dative, genitive); treat it as read-only, it is shared.
+    """
+    word, plural, article = item.word, item.plural, item.article
+    singular = (word, word, word, _genitive(word, article))
+    dative_plural = plural if plural.endswith(("n", "s")) else plural + "n"
+    plurals = (plural, plural, dative_plural, plural)
+    return {
+        "definite": tuple(f"{a} {w}" for a, w in zip(DEFINITE[article], singular)),
+        "indefinite": tuple(f"{a} {w}" for a, w in zip(INDEFINITE[article], singular)),
+        "plural": tuple(f"{a} {w}" for a, w in zip(PLURAL, plurals)),
+    }
+
+
+def _umlaut(adjective):
+    for i in range(len(adjective) - 1, -1, -1):
+        if adjective[i] in "aou":
+            if adjective[i] == "u" and i and adjective[i - 1] == "a":
+                i -= 1  # au -> äu
+            return adjective[:i] + {"a": "ä", "o": "ö", "u": "ü"}[adjective[i]] + adjective[i + 1:]
+    return adjective
+
+
+@lru_cache(maxsize=None)
+def compare(adjective):
+    """(comparative, superlative) of ``adjective``, e.g. ("älter", "am ältesten")."""
+    if adjective in IRREGULAR_ADJECTIVES:
+        return IRREGULAR_ADJECTIVES[adjective]
+    base = _umlaut(adjective) if adjective in UMLAUT_ADJECTIVES else adjective
+    if base.endswith("e"):
+        comparative = base + "r"
+    elif base.endswith(("el", "euer", "auer")):
+        # dunkel -> dunkler, teuer -> teurer
+        comparative = base[:-2] + base[-1] + "er"
+    else:
+        comparative = base + "er"
+    if base.endswith("e"):
+        superlative = base + "sten"
+    elif base.endswith(("d", "t", "s", "ß", "x", "z", "sch")):
+        superlative = base + "esten"
+    else:
+        superlative = base + "sten"
+    return comparative, "am " + superlative
+
+
+# ---------------------- ESERCIZI ---------------------- #
+def _options(answer, candidates, rng, k=2):
+    """``answer`` and up to ``k`` distinct wrong ``candidates``, shuffled."""
+    wrong = list(dict.fromkeys(c for c in candidates if c != answer))
+    options = [answer] + rng.sample(wrong, min(k, len(wrong)))
+    rng.shuffle(options)
+    return options
+
+
+class DrillGenerator:
+    """Builds drill questions of the kinds in DRILL_KINDS."""
+
+    def __init__(self, vocab=()):
+        self.nouns = [it for it in vocab if it.article in DEFINITE]
+
+    def conjugation(self, kind, rng=random):
+        verb = rng.choice(CONJUGATION_DRILLS[kind])
+        person = rng.randrange(len(PRONOUNS))
+        forms = conjugate(verb)
+        return {
+            "drill": f"{verb}.{person}",
+            "question": f"Coniuga «{verb}»: {PRONOUNS[person]}{PERSON_HINTS[person]} _____",
+            "options": _options(forms[person], forms, rng),
+            "answer": forms[person],
+        }
+
+    def noun_case(self, case, rng=random):
+        if not self.nouns:
+            return None
+        item = rng.choice(self.nouns)
+        number, description = rng.choice(NUMBERS)
+        ci = CASES.index(case)
+        forms = declension(item)[number]
+        answer = forms[ci]
+        # prima gli altri casi, poi lo stesso caso con gli articoli degli altri generi
+        noun = answer.split(" ", 1)[1]
+        articles = DEFINITE if number != "indefinite" else INDEFINITE
+        others = [f"{a[ci]} {noun}" for a in articles.values()]
+        wrong = [f for f in dict.fromkeys(forms) if f != answer]
+        options = _options(answer, wrong, rng)
+        if len(options) < 3:
+            options = _options(answer, wrong + rng.sample(others, len(others)), rng)
+        return {
+            "drill": f"{case}.{item.word}.{number}",
+            "question": f"«{item.word}» {CASE_NAMES[case]} {description}:",
+            "options": options,
+            "answer": answer,
+        }
+
+    def comparison(self, rng=random):
+        adjective = rng.choice(ADJECTIVES)
+        comparative, superlative = compare(adjective)
+        naive = (adjective + "er", f"am {adjective}sten", "mehr " + adjective)
+        if rng.random() < 0.5:
+            degree, answer = "Comparativo", comparative
+        else:
+            degree, answer = "Superlativo", superlative
+        return {
+            "drill": f"{degree.lower()}.{adjective}",
+            "question": f"{degree} di «{adjective}»:",
+            "options": _options(answer, (comparative, superlative) + naive, rng),
+            "answer": answer,
+        }
+
+    def question(self, kind, rng=random):
+        """One drill of ``kind``, or None if it cannot be built with this catalogue.
+
+        The question dict has "drill" (what was asked, unique per drill) in
+        place of an ID, and "correct_index".
+        """
+        if kind in CONJUGATION_DRILLS:
+            q = self.conjugation(kind, rng)
+        elif kind in CASES:
+            q = self.noun_case(kind, rng)
+        elif kind == "comparative":
+            q = self.comparison(rng)
+        else:
+            raise ValueError(f"tipo di esercizio sconosciuto: {kind!r}")
+        if q is None:
+            return None
+        q["correct_index"] = q["options"].index(q.pop("answer"))
+        return q
+
+    def questions(self, kinds, n, rng=random):
+        """``n`` drills of the given kinds, never the same drill twice when avoidable."""
+        questions = []
+        seen = set()
+        for _ in range(3 * n):
+            if len(questions) == n or not kinds:
+                break
+            q = self.question(rng.choice(kinds), rng)
+            if q is None or q["drill"] in seen:
+                continue
+            seen.add(q["drill"])
+            questions.append(q)
+        return questions
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+Strumentazione facoltativa di Deutschland B2.
+
+Timer e contatori sono disattivati finché non viene registrato almeno un
+"sink": in quel caso `timer()` restituisce un context manager vuoto condiviso
+e le funzioni decorate con `@timed` costano una sola verifica in più, quindi
+il gioco normale non paga quasi nulla.
+
+Sink disponibili:
+
+* HistogramSink – istogramma in memoria (bucket a potenze di due di
+  microsecondi), con riepilogo testuale di conteggi, media, p50/p95 e massimo;
+* StatsFileSink – lo stesso istogramma, scritto in JSON alla chiusura.
+
+Qualsiasi oggetto con i metodi observe(name, seconds), count(name, n) e
+close() può fare da sink. `profiled(path)` avvolge un'intera sessione in
+cProfile e ne salva le statistiche (leggibili con `python3 -m pstats`).
+
+Dal gioco: B2_STATS=stats.json (oppure B2_STATS=- per il riepilogo a fine
+partita) e B2_PROFILE=sessione.prof.
+"""
+
+import contextlib
+import cProfile
+import functools
+import json
+import sys
+import time
+
+_sinks = []
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def add_sink(sink):
+    _sinks.append(sink)
+
+
+def remove_sink(sink):
+    _sinks.remove(sink)
+
+
+def enabled():
+    return bool(_sinks)
+
+
+def observe(name, seconds):
+    """Report a duration measured elsewhere."""
+    for sink in _sinks:
+        sink.observe(name, seconds)
+
+
+def count(name, n=1):
+    for sink in _sinks:
+        sink.count(name, n)
+
+
+class _Timer:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def timer(name):
+    """Context manager timing its block under ``name``."""
+    return _Timer(name) if _sinks else _NULL_TIMER
+
+
+def timed(name=None):
+    """Decorator timing every call of the function (under its name by default)."""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(label, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def profiled(path):
+    """Run the block under cProfile and dump the stats to ``path`` (no-op if empty)."""
+    if not path:
+        yield None
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+
+
+# ---------------------- SINK ---------------------- #
+class HistogramSink:
+    """In-process timings and counters; prints a summary on close if ``out`` is given."""
+
+    BUCKETS = 40   # 2**39 µs ≈ 6 giorni
+
+    def __init__(self, out=None):
+        self.out = out
+        self.timings = {}
+        self.counters = {}
+
+    def observe(self, name, seconds):
+        entry = self.timings.get(name)
+        if entry is None:
+            entry = self.timings[name] = {"count": 0, "total": 0.0, "max": 0.0, "buckets": [0] * self.BUCKETS}
+        entry["count"] += 1
+        entry["total"] += seconds
+        if seconds > entry["max"]:
+            entry["max"] = seconds
+        bucket = min(int(seconds * 1_000_000).bit_length(), self.BUCKETS - 1)
+        entry["buckets"][bucket] += 1
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @staticmethod
+    def percentile(entry, p):
+        """Upper bound of the bucket holding the p-th percentile, in seconds."""
+        rank = p / 100 * entry["count"]
+        seen = 0
+        for bucket, n in enumerate(entry["buckets"]):
+            seen += n
+            if n and seen >= rank:
+                return min((1 << bucket) / 1_000_000, entry["max"])
+        return entry["max"]
+
+    def summary(self):
+        timings = {
+            name: {
+                "count": e["count"],
+                "total_s": e["total"],
+                "mean_ms": e["total"] / e["count"] * 1000,
+                "p50_ms": self.percentile(e, 50) * 1000,
+                "p95_ms": self.percentile(e, 95) * 1000,
+                "max_ms": e["max"] * 1000,
+            }
+            for name, e in sorted(self.timings.items())
+        }
+        return {"timers": timings, "counters": dict(sorted(self.counters.items()))}
+
+    def report(self):
+        summary = self.summary()
+        lines = [f"{'fase':<28}{'volte':>8}{'totale s':>10}{'media ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        for name, s in summary["timers"].items():
+            lines.append(
+                f"{name:<28}{s['count']:>8}{s['total_s']:>10.3f}{s['mean_ms']:>10.3f}"
+                f"{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['max_ms']:>10.3f}"
+            )
+        for name, n in summary["counters"].items():
+            lines.append(f"{name:<28}{n:>8}")
+        return "\n".join(lines)
+
+    def close(self):
+        if self.out is not None:
+            print(self.report(), file=self.out)
+
+
+class StatsFileSink(HistogramSink):
+    """Histogram written as JSON to ``path`` on close."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def close(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def sink_for(target):
+    """Sink for a B2_STATS-style setting: "" none, "-" summary on stderr, else a JSON file."""
+    if not target:
+        return None
+    if target == "-":
+        return HistogramSink(out=sys.stderr)
+    return StatsFileSink(target)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""
+Costruzione dei livelli di vocabolario.
+
+Per impostazione predefinita ogni livello introduce un solo vocabolo, ma i
+vocaboli possono essere raggruppati in livelli tematici di N parole:
+
+* "category"  – per categoria (magazzino, poi uso generale), nell'ordine del
+  catalogo;
+* "article"   – per articolo (der, die, das), utile per esercitare il genere;
+* "frequency" – dal più al meno frequente, secondo il campo facoltativo
+  "frequency" dei vocaboli (in sua assenza vale l'ordine del catalogo).
+
+Con livelli più grandi si riducono proporzionalmente le sessioni, i
+salvataggi e le righe del menu.
+"""
+
+from records import VocabularyLevel
+
+GROUPINGS = ("category", "article", "frequency")
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _levels(label, items, size):
+    return [
+        VocabularyLevel(f"Vocabolario {label} {n:02d}", chunk)
+        for n, chunk in enumerate(_chunks(items, size), start=1)
+    ]
+
+
+def build_vocabulary_levels(warehouse_vocab, general_vocab, size=1, group_by="category"):
+    """Group the vocabulary into levels of ``size`` words."""
+    if size < 1:
+        raise ValueError("un livello deve contenere almeno un vocabolo")
+    if group_by == "category":
+        return _levels("magazzino", list(warehouse_vocab), size) + _levels("generale", list(general_vocab), size)
+    vocab = list(warehouse_vocab) + list(general_vocab)
+    if group_by == "article":
+        levels = []
+        for article in ("der", "die", "das"):
+            levels += _levels(article, [it for it in vocab if it.article == article], size)
+        return levels
+    if group_by == "frequency":
+        # sort è stabile: a parità di frequenza resta l'ordine del catalogo
+        ranked = sorted(vocab, key=lambda it: -it.frequency)
+        return _levels("frequenza", ranked, size)
+    raise ValueError(f"raggruppamento sconosciuto: {group_by!r} (validi: {', '.join(GROUPINGS)})")
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+"""
+Indice di ricerca dei livelli per il selettore paginato.
+
+Ogni livello viene scomposto in parole: quelle del nome e, per i livelli di
+vocabolario, la parola, il plurale e la traduzione dei vocaboli. L'indice
+associa a ogni parola l'insieme dei livelli che la contengono e tiene una
+lista ordinata delle parole, così una ricerca per prefisso costa una
+bisezione più i risultati. Se nessuna parola inizia con il termine cercato,
+si ripiega sulla ricerca per sottostringa sulle parole distinte.
+"""
+
+import bisect
+import re
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return _WORD.findall(text.lower())
+
+
+def level_terms(level):
+    terms = tokenize(level.name)
+    for it in getattr(level, "items", ()):
+        terms += tokenize(f"{it.word} {it.plural} {it.translation}")
+    return terms
+
+
+class LevelSearchIndex:
+    """Inverted index from lower-case words to level IDs."""
+
+    def __init__(self, levels):
+        self.postings = {}
+        for level_id, level in enumerate(levels):
+            for term in level_terms(level):
+                self.postings.setdefault(term, set()).add(level_id)
+        self.terms = sorted(self.postings)
+
+    def _term_matches(self, term):
+        ids = set()
+        start = bisect.bisect_left(self.terms, term)
+        for t in self.terms[start:]:
+            if not t.startswith(term):
+                break
+            ids |= self.postings[t]
+        if not ids:
+            for t in self.terms:
+                if term in t:
+                    ids |= self.postings[t]
+        return ids
+
+    def search(self, query):
+        """Return the sorted IDs of the levels matching every word of ``query``."""
+        result = None
+        for term in tokenize(query):
+            ids = self._term_matches(term)
+            result = ids if result is None else result & ids
+            if not result:
+                return []
+        return sorted(result) if result else []
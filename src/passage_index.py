@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""
+Indice dei testi di comprensione di Deutschland B2.
+
+I brani vengono divisi in frasi e le frasi in parole. L'indice associa a ogni
+parola (in minuscolo) le frasi che la contengono, come coppie (livello,
+frase), e fa lo stesso per i lemmi dei vocaboli del catalogo: singolare,
+plurale e le loro forme declinate più comuni (dativo plurale in -n,
+genitivo in -s/-es) rimandano tutti al vocabolo, quindi cercando "Buch" si
+trovano anche le frasi con "Bücher".
+
+Nei testi una parola conta come forma di un vocabolo solo se è scritta con
+la maiuscola, come i sostantivi tedeschi, e non apre la frase (dove la
+maiuscola non dice nulla): "arbeiten" in "Im Büro arbeiten fünf Personen" è
+un verbo, non il plurale di Arbeit, e "gut" non è il sostantivo Gut.
+
+La costruzione è lineare nella lunghezza dei testi e nel numero di vocaboli;
+una ricerca di una parola è un accesso a dizionario, una ricerca di più
+parole l'intersezione delle loro liste.
+"""
+
+import re
+
+from level_search import tokenize
+
+_WORD = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text):
+    return [s for s in _SENTENCE_END.split(text.strip()) if s]
+
+
+def noun_forms(item):
+    """Forms of a vocabulary noun that lead back to it, capitalised as in the catalogue."""
+    word, plural = item.word, item.plural
+    forms = [plural, word + "s", word + "es"]
+    if not plural.endswith(("n", "s")):
+        forms.append(plural + "n")
+    return forms
+
+
+class PassageIndex:
+    """Inverted index from words and vocabulary lemmas to passage sentences."""
+
+    def __init__(self, levels, vocab=()):
+        # forma -> vocabolo (la parola così com'è nel catalogo), con le
+        # maiuscole per i testi e in minuscolo per le ricerche; i singolari
+        # hanno la precedenza sulle forme declinate di altre parole
+        self.forms = {}
+        self.lemmas = {}
+        vocab = list(vocab)
+        for it in vocab:
+            self.forms.setdefault(it.word, it.word)
+        for it in vocab:
+            for form in noun_forms(it):
+                self.forms.setdefault(form, it.word)
+        for form, lemma in self.forms.items():
+            self.lemmas.setdefault(form.lower(), lemma)
+        self.sentences = []
+        self.words = {}
+        self.by_lemma = {}
+        for level_id, level in enumerate(levels):
+            sentences = split_sentences(level.passage)
+            self.sentences.append(sentences)
+            for n, sentence in enumerate(sentences):
+                position = (level_id, n)
+                raw = _WORD.findall(sentence)
+                for token in dict.fromkeys(t.lower() for t in raw):
+                    self.words.setdefault(token, []).append(position)
+                lemmas = (self.forms[t] for t in raw[1:] if t[:1].isupper() and t in self.forms)
+                for lemma in dict.fromkeys(lemmas):
+                    self.by_lemma.setdefault(lemma, []).append(position)
+
+    def lemma(self, word):
+        """The vocabulary word ``word`` is a form of, or None."""
+        return self.lemmas.get(word.lower())
+
+    def lookup(self, word):
+        """Positions (level ID, sentence number) of the sentences using ``word``.
+
+        Vocabulary words match in any of their forms, other words exactly;
+        a word that is both ("arbeiten") matches either way.
+        """
+        exact = self.words.get(word.lower(), [])
+        lemma = self.lemma(word)
+        if lemma is None:
+            return exact
+        return sorted(set(self.by_lemma.get(lemma, [])).union(exact))
+
+    def search(self, query):
+        """Sorted positions of the sentences containing every word of ``query``."""
+        result = None
+        for term in tokenize(query):
+            positions = self.lookup(term)
+            result = set(positions) if result is None else result.intersection(positions)
+            if not result:
+                return []
+        return sorted(result) if result else []
+
+    def sentence(self, level_id, n):
+        return self.sentences[level_id][n]
+
+    def examples(self, word, k=1):
+        """Up to ``k`` sentences of the passages using the vocabulary noun ``word``."""
+        return [self.sentence(*position) for position in self.by_lemma.get(word, [])[:k]]
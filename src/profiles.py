@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""
+Profili degli studenti di Deutschland B2.
+
+Ogni profilo ha un nome e il proprio progresso in una cartella comune
+(<nome>.json, oppure <nome>.db con il backend SQLite). Il catalogo invece è
+uno solo: viene caricato una volta per processo e condiviso in sola lettura
+da tutti i profili, quindi un chiosco o il server possono passare da uno
+studente all'altro (per esempio al cambio turno) senza ricaricare i
+contenuti.
+
+Il vecchio progress_b2.json di un gioco a studente singolo viene importato
+una volta sola come profilo "predefinito".
+"""
+
+import os
+import re
+import shutil
+
+from progress_store import JournalProgressStore, JsonProgressStore, SqliteProgressStore, migrate_json_to_sqlite
+
+PROFILE_NAME = re.compile(r"^[A-Za-z0-9_-]{1,40}$")
+BACKENDS = ("json", "journal", "sqlite")
+
+
+def valid_name(name):
+    return bool(PROFILE_NAME.match(name))
+
+
+class ProfileDirectory:
+    """The learner profiles kept in one folder, for one storage backend."""
+
+    def __init__(self, root, backend="json"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend di salvataggio sconosciuto: {backend}")
+        self.root = root
+        self.backend = backend
+        self.suffix = ".db" if backend == "sqlite" else ".json"
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, name):
+        if not valid_name(name):
+            raise ValueError(f"Nome di profilo non valido: {name!r}")
+        return os.path.join(self.root, name + self.suffix)
+
+    def names(self):
+        """Sorted names of the existing profiles."""
+        names = []
+        for entry in os.listdir(self.root):
+            name, suffix = os.path.splitext(entry)
+            if suffix == self.suffix and valid_name(name):
+                names.append(name)
+        return sorted(names, key=str.lower)
+
+    def exists(self, name):
+        return os.path.exists(self.path(name))
+
+    def open(self, name, check_same_thread=True):
+        """The progress store of ``name`` (created on first save)."""
+        path = self.path(name)
+        if self.backend == "sqlite":
+            return SqliteProgressStore(path, check_same_thread=check_same_thread)
+        if self.backend == "journal":
+            return JournalProgressStore(path)
+        return JsonProgressStore(path)
+
+    def adopt(self, name, json_path, db_path=None):
+        """Import single-learner progress files as profile ``name``, once.
+
+        Returns True if something was imported.
+        """
+        if self.exists(name):
+            return False
+        if self.backend == "sqlite":
+            if db_path and os.path.exists(db_path):
+                shutil.copy2(db_path, self.path(name))
+                return True
+            if not os.path.exists(json_path):
+                return False
+            store = self.open(name)
+            try:
+                return migrate_json_to_sqlite(json_path, store)
+            finally:
+                store.close()
+        if not os.path.exists(json_path):
+            return False
+        shutil.copy2(json_path, self.path(name))
+        if self.backend == "journal" and os.path.exists(json_path + ".journal"):
+            shutil.copy2(json_path + ".journal", self.path(name) + ".journal")
+        return True
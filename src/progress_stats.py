@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Statistiche aggregate sui progressi di molti studenti.
+
+Raccoglie i file di progresso (progress_b2.json dei chioschi, i profili di
+profili_b2, le cartelle del server) da uno o più alberi di cartelle e li
+riassume in un solo passaggio:
+
+* per ogni livello, quanti studenti lo hanno completato e in che percentuale;
+* per ogni elemento da ripassare, quanti studenti lo hanno in ripasso e
+  quante risposte (corrette e totali) ha ricevuto.
+
+I file vengono letti come farebbe load_progress (giornale e copia .bak
+compresi, vecchi formati convertiti) ma senza toccarli: un file illeggibile
+viene contato e saltato. Blocchi di file sono elaborati da un pool di
+processi e ogni processo restituisce solo i propri contatori, quindi la
+memoria dipende dal numero di livelli ed elementi distinti, non da quello
+degli studenti.
+
+    python3 progress_stats.py raccolta_chioschi/ --workers 8
+    python3 progress_stats.py raccolta_chioschi/ --json > riepilogo.json
+"""
+
+import argparse
+import fnmatch
+import itertools
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import game_cli
+from progress_store import TRACKS, apply_change, default_progress
+from scheduler import review_key
+
+CHUNK_SIZE = 200
+# esempi di file scartati conservati nel riepilogo
+MAX_ERRORS = 20
+
+
+# ---------------------- LETTURA ---------------------- #
+def find_progress_files(paths, pattern="*.json"):
+    """Yield the files matching ``pattern`` under ``paths`` (files or folders)."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for directory, subdirs, files in os.walk(path):
+            subdirs.sort()
+            for name in sorted(files):
+                if fnmatch.fnmatch(name, pattern):
+                    yield os.path.join(directory, name)
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _ints(values):
+    return [v for v in values if isinstance(v, int) and not isinstance(v, bool)]
+
+
+def _level_keys(values):
+    # chiavi dei livelli, oppure posizioni dei file più vecchi
+    return [v for v in values if isinstance(v, str)] + _ints(values)
+
+
+def _normalize(data):
+    """Coerce a parsed document into the layout load_progress returns."""
+    progress = default_progress()
+    for key, default in progress.items():
+        value = data.get(key)
+        if default is None:
+            progress[key] = value if isinstance(value, str) else None
+        elif isinstance(value, type(default)):
+            progress[key] = value
+    for completed_key, _ in TRACKS.values():
+        progress[completed_key] = _level_keys(progress[completed_key])
+    progress["review_vocab"] = [e for e in progress["review_vocab"] if isinstance(e, (str, dict))]
+    for key in ("review_grammar", "review_comp"):
+        progress[key] = [e for e in progress[key] if isinstance(e, dict)] + _level_keys(progress[key])
+    progress["srs"] = {
+        key: state for key, state in progress["srs"].items()
+        if isinstance(state, list) and len(state) == 4
+    }
+    progress["accuracy"] = {
+        key: counts for key, counts in progress["accuracy"].items()
+        if isinstance(counts, list) and len(counts) == 2 and len(_ints(counts)) == 2
+    }
+    return progress
+
+
+def read_progress(path):
+    """Parse one progress file, read-only; raises ValueError if it is unusable.
+
+    A damaged file falls back to its ".bak" copy and a journal next to it is
+    replayed, as the stores would do.
+    """
+    try:
+        data = _read_json(path)
+    except (OSError, ValueError) as exc:
+        try:
+            data = _read_json(path + ".bak")
+        except (OSError, ValueError):
+            raise ValueError(f"{type(exc).__name__}: {exc}") from None
+    if not isinstance(data, dict) or not any(key in data for key, _ in TRACKS.values()):
+        raise ValueError("non è un file di progresso")
+    progress = _normalize(data)
+    journal = path + ".journal"
+    if os.path.exists(journal):
+        with open(journal, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    change = json.loads(line)
+                    if isinstance(change, dict):
+                        apply_change(progress, change)
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+    # stessi ID di load_progress, anche per le voci dei vecchi formati
+    game_cli.upgrade_progress(progress)
+    return progress
+
+
+# ---------------------- AGGREGAZIONE ---------------------- #
+def new_summary():
+    return {
+        "learners": 0,
+        "skipped": 0,
+        "errors": [],
+        # percorso -> {chiave del livello: studenti che l'hanno completato}
+        "completed": {track: {} for track in TRACKS},
+        # chiave di ripasso -> [studenti con l'elemento in ripasso, risposte, corrette]
+        "items": {},
+    }
+
+
+def add_progress(summary, progress):
+    summary["learners"] += 1
+    items = summary["items"]
+    for track, (completed_key, review_list) in TRACKS.items():
+        counts = summary["completed"][track]
+        for level_key in progress[completed_key]:
+            counts[level_key] = counts.get(level_key, 0) + 1
+        for item_id in progress[review_list]:
+            key = review_key(track, item_id)
+            entry = items.get(key)
+            if entry is None:
+                entry = items[key] = [0, 0, 0]
+            entry[0] += 1
+    for key, (attempts, correct) in progress["accuracy"].to_json().items():
+        entry = items.get(key)
+        if entry is None:
+            entry = items[key] = [0, 0, 0]
+        entry[1] += attempts
+        entry[2] += correct
+
+
+def aggregate_files(paths):
+    """Summary of a batch of progress files (runs in the worker processes)."""
+    summary = new_summary()
+    for path in paths:
+        try:
+            progress = read_progress(path)
+        except ValueError as exc:
+            summary["skipped"] += 1
+            if len(summary["errors"]) < MAX_ERRORS:
+                summary["errors"].append({"path": path, "message": str(exc)})
+            continue
+        add_progress(summary, progress)
+    return summary
+
+
+def merge(total, part):
+    total["learners"] += part["learners"]
+    total["skipped"] += part["skipped"]
+    total["errors"] += part["errors"][:MAX_ERRORS - len(total["errors"])]
+    for track, counts in part["completed"].items():
+        merged = total["completed"][track]
+        for level_key, n in counts.items():
+            merged[level_key] = merged.get(level_key, 0) + n
+    items = total["items"]
+    for key, entry in part["items"].items():
+        merged = items.get(key)
+        if merged is None:
+            items[key] = entry
+        else:
+            for i, n in enumerate(entry):
+                merged[i] += n
+    return total
+
+
+def _chunks(paths, size):
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def aggregate(paths, workers=None, chunk_size=CHUNK_SIZE, pattern="*.json"):
+    """Aggregate every progress file found under ``paths``.
+
+    At most two batches per worker are in flight, so neither the file list
+    nor the partial results pile up in memory.
+    """
+    total = new_summary()
+    chunks = _chunks(find_progress_files(paths, pattern), chunk_size)
+    first = next(chunks, [])
+    second = next(chunks, None)
+    head = [first] if second is None else [first, second]
+    if workers == 1 or second is None:
+        # pochi file: il pool costerebbe più dell'elaborazione
+        for chunk in itertools.chain(head, chunks):
+            merge(total, aggregate_files(chunk))
+        return total
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(aggregate_files, chunk) for chunk in head}
+        for chunk in chunks:
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(total, future.result())
+            pending.add(pool.submit(aggregate_files, chunk))
+        for future in wait(pending).done:
+            merge(total, future.result())
+    return total
+
+
+def report(total):
+    """The summary with completion rates and accuracies, ready for JSON."""
+    learners = total["learners"]
+    levels = {
+        track: {
+            level_key: {"completed": n, "rate": n / learners}
+            for level_key, n in sorted(counts.items())
+        }
+        for track, counts in total["completed"].items()
+    }
+    items = {
+        key: {"learners": n, "attempts": attempts, "correct": correct}
+        for key, (n, attempts, correct) in sorted(total["items"].items())
+    }
+    return {
+        "learners": learners,
+        "skipped": total["skipped"],
+        "errors": sorted(total["errors"], key=lambda e: e["path"]),
+        "levels": levels,
+        "items": items,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistiche aggregate sui progressi di Deutschland B2")
+    parser.add_argument("paths", nargs="+", help="cartelle (esplorate ricorsivamente) o file di progresso")
+    parser.add_argument("--pattern", default="*.json", help="nomi dei file di progresso (predefinito: *.json)")
+    parser.add_argument("--workers", type=int, default=None, help="processi paralleli (predefinito: CPU)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--top", type=int, default=20, help="quanti livelli ed elementi mostrare per percorso")
+    parser.add_argument("--json", action="store_true", help="stampa tutte le statistiche in JSON")
+    args = parser.parse_args()
+
+    summary = report(aggregate(args.paths, args.workers, args.chunk_size, args.pattern))
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return
+    print(f"{summary['learners']} studenti, {summary['skipped']} file scartati")
+    for error in summary["errors"]:
+        print(f"  {error['path']}: {error['message']}")
+    for track, levels in summary["levels"].items():
+        registry = game_cli.get_registry(track)
+        print(f"\n{track}: {len(levels)} livelli completati da almeno uno studente")
+        for level_key, s in list(levels.items())[:args.top]:
+            level_id = registry.id_of_key(level_key)
+            name = registry[level_id].name if level_id is not None else level_key
+            print(f"  {s['rate']:6.1%}  {s['completed']:>7}  {name}")
+    ranked = sorted(summary["items"].items(), key=lambda kv: (-kv[1]["learners"], kv[0]))
+    print(f"\nElementi in ripasso più diffusi ({len(ranked)} in totale):")
+    for key, s in ranked[:args.top]:
+        accuracy = f"{s['correct'] / s['attempts']:6.1%}" if s["attempts"] else "     –"
+        print(f"  {s['learners']:>7} studenti  {s['attempts']:>8} risposte  {accuracy}  {key}")
+
+
+if __name__ == "__main__":
+    main()
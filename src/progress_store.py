@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Archiviazione del progresso per Deutschland B2.
+
+Il gioco parla con un "progress store" invece di scrivere direttamente su file.
+Sono disponibili tre implementazioni intercambiabili:
+
+* JsonProgressStore – il formato storico progress_b2.json, riscritto per intero
+  ad ogni salvataggio in modo atomico (file temporaneo + rename, con copia
+  di sicurezza .bak e lock consultivo);
+* JournalProgressStore – lo stesso file JSON come istantanea, più un giornale
+  (progress_b2.json.journal) a cui ogni modifica aggiunge una piccola riga;
+  il giornale viene compattato nell'istantanea ogni COMPACT_EVERY modifiche,
+  quindi un salvataggio costa quanto la modifica e non quanto la storia;
+* SqliteProgressStore – un database SQLite con tabelle per livelli completati,
+  elementi da ripassare e risultati delle sessioni, dove ogni livello concluso
+  è un singolo piccolo inserimento transazionale.
+
+Il modulo può essere eseguito da riga di comando per migrare una volta sola
+un file JSON esistente nel database:
+
+    python3 progress_store.py migrate progress_b2.json progress_b2.db
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: niente lock consultivi
+    fcntl = None
+
+from scheduler import review_key
+
+# la umask non si legge senza cambiarla: la si legge una volta all'import
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# percorso -> (chiave dei livelli completati, chiave degli elementi da ripassare)
+TRACKS = {
+    "vocabulary": ("vocabulary_completed", "review_vocab"),
+    "grammar": ("grammar_completed", "review_grammar"),
+    "comprehension": ("comprehension_completed", "review_comp"),
+}
+
+
+def default_progress():
+    """Return an empty progress structure."""
+    return {
+        "vocabulary_completed": [],
+        "grammar_completed": [],
+        "comprehension_completed": [],
+        "review_vocab": [],
+        "review_grammar": [],
+        "review_comp": [],
+        "last_review": None,
+        "srs": {},
+        "accuracy": {},
+    }
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _json_default(obj):
+    # gli elementi da ripassare sono insiemi di ID in memoria
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    # tabelle compatte (es. adaptive.AccuracyTable)
+    if hasattr(obj, "to_json"):
+        return obj.to_json()
+    raise TypeError(f"Tipo non serializzabile: {type(obj).__name__}")
+
+
+def _encode_item(item):
+    # forma canonica: due elementi uguali producono sempre lo stesso testo
+    return json.dumps(item, ensure_ascii=False, sort_keys=True)
+
+
+# ---------------------- RECORD DELLE MODIFICHE ---------------------- #
+# ogni record contiene valori assoluti: riapplicarlo due volte è innocuo
+def apply_change(progress, change):
+    """Apply one change record to a freshly loaded (list-based) progress dict."""
+    op = change.get("op")
+    if op == "level":
+        completed_key, review_list = TRACKS[change["track"]]
+        if change["level"] not in progress[completed_key]:
+            progress[completed_key].append(change["level"])
+        for item in change.get("review", []):
+            if item not in progress[review_list]:
+                progress[review_list].append(item)
+    elif op == "review":
+        progress["last_review"] = change.get("last_review")
+    elif op != "stats":
+        return
+    for key, state in change.get("srs", {}).items():
+        if state is None:
+            progress["srs"].pop(key, None)
+        else:
+            progress["srs"][key] = state
+    progress["accuracy"].update(change.get("accuracy", {}))
+
+
+def level_change(progress, track, level_id, new_review_items):
+    """The change record of a passed level."""
+    srs = progress.get("srs", {})
+    keys = [review_key(track, it) for it in new_review_items]
+    return {
+        "op": "level",
+        "track": track,
+        "level": level_id,
+        "review": list(new_review_items),
+        "srs": {key: srs[key] for key in keys if key in srs},
+    }
+
+
+def review_change(progress, updated_keys):
+    """The change record of a review session."""
+    srs = progress.get("srs", {})
+    return {
+        "op": "review",
+        "last_review": progress.get("last_review"),
+        "srs": {key: srs.get(key) for key in updated_keys},
+    }
+
+
+def stats_change(progress, keys):
+    """The change record of updated accuracy counts."""
+    accuracy = progress["accuracy"]
+    return {"op": "stats", "accuracy": {key: list(accuracy.counts(key)) for key in keys}}
+
+
+# ---------------------- BACKEND JSON ---------------------- #
+@contextmanager
+def _file_lock(path, exclusive):
+    """Advisory lock on ``path`` + ".lock" (no-op where fcntl is unavailable)."""
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", "a") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def _file_mode(path):
+    """Permission bits for a new version of ``path``: the current ones, or 0644 minus the umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o644 & ~_UMASK
+
+
+def _fsync_dir(path):
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JsonProgressStore:
+    """Progress kept in a single JSON document, rewritten on every change.
+
+    Saves are crash-safe: the new document is written to a temporary file,
+    fsynced and renamed over the old one, whose previous version is kept as
+    a ".bak" copy. Loads and saves take an advisory lock so that two
+    processes sharing a kiosk never interleave. A document that fails to
+    parse is recovered from the backup instead of resetting the learner.
+
+    Two processes may load the same file and save in turn. The changes
+    recorded since the last load or save are therefore kept as journal-style
+    records: if another process saved in the meantime, save() re-reads its
+    document under the exclusive lock and replays them on top of it instead
+    of overwriting it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.backup_path = path + ".bak"
+        # testo dell'ultimo salvataggio noto, per saltare scritture inutili
+        self._last_text = None
+        # impostati da load() quando il file principale era danneggiato
+        self.recovered_from = None
+        self.corrupt_copy = None
+        # modifiche registrate dall'ultimo caricamento o salvataggio
+        self._changes = []
+        # vero quando il file contiene modifiche di altri processi assenti in memoria
+        self._diverged = False
+
+    def _read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        return text, json.loads(text)
+
+    def load(self):
+        with _file_lock(self.path, exclusive=False):
+            return self._load_locked()
+
+    def _load_locked(self):
+        progress = default_progress()
+        self.recovered_from = None
+        self.corrupt_copy = None
+        self._changes = []
+        self._diverged = False
+        if not os.path.exists(self.path):
+            return progress
+        try:
+            text, data = self._read(self.path)
+            self._last_text = text
+        except (OSError, ValueError):
+            data = self._recover()
+        if isinstance(data, dict):
+            progress.update(data)
+        return progress
+
+    def _recover(self):
+        # conserva il file rovinato per un'analisi successiva invece di sovrascriverlo
+        self.corrupt_copy = f"{self.path}.corrupt-{datetime.now():%Y%m%d%H%M%S}"
+        try:
+            os.replace(self.path, self.corrupt_copy)
+        except OSError:
+            self.corrupt_copy = None
+        try:
+            _, data = self._read(self.backup_path)
+        except (OSError, ValueError):
+            return None
+        self.recovered_from = self.backup_path
+        return data
+
+    def save(self, progress):
+        text = self._text(progress)
+        if text == self._last_text and not self._changes:
+            return
+        with _file_lock(self.path, exclusive=True):
+            self._save_locked(text)
+
+    def _text(self, progress):
+        # le chiavi con "_" sono strutture derivate, ricostruite al caricamento
+        data = {k: v for k, v in progress.items() if not k.startswith("_")}
+        return json.dumps(data, ensure_ascii=False, indent=2, default=_json_default)
+
+    def _save_locked(self, text):
+        merged = self._merged()
+        if merged is not None:
+            self._diverged = True
+            text = self._text(merged)
+        self._changes = []
+        if text != self._last_text:
+            self._write(text)
+        self._last_text = text
+
+    def _snapshot(self):
+        # (testo, documento) su disco: documento {} se manca, None se illeggibile
+        if not os.path.exists(self.path):
+            return None, {}
+        try:
+            return self._read(self.path)
+        except (OSError, ValueError):
+            return None, None
+
+    def _merged(self):
+        """The saved document with the unsaved changes replayed on top, or
+        None when nobody else saved since our last load or save."""
+        text, data = self._snapshot()
+        if data is None or (not self._diverged and text == self._last_text):
+            return None
+        progress = self._document(data)
+        for change in self._changes:
+            apply_change(progress, change)
+        return progress
+
+    def _document(self, data):
+        progress = default_progress()
+        if isinstance(data, dict):
+            progress.update(data)
+        progress["accuracy"] = dict(progress.get("accuracy") or {})
+        return progress
+
+    def _write(self, text):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp crea il file con permessi 0600: si tengono quelli del file sostituito
+            os.chmod(tmp_path, _file_mode(self.path))
+            if os.path.exists(self.path):
+                self._backup()
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        _fsync_dir(self.path)
+
+    def _backup(self):
+        # un hard link costa O(1); se il filesystem non li supporta si copia
+        tmp_backup = self.backup_path + ".tmp"
+        if os.path.exists(tmp_backup):
+            os.remove(tmp_backup)
+        try:
+            os.link(self.path, tmp_backup)
+        except OSError:
+            shutil.copy2(self.path, tmp_backup)
+        os.replace(tmp_backup, self.backup_path)
+
+    def record_level(self, progress, track, level_id, new_review_items, correct, total, passed):
+        if passed:
+            self._changes.append(level_change(progress, track, level_id, new_review_items))
+        self.save(progress)
+
+    def record_review(self, progress, updated_keys=()):
+        self._changes.append(review_change(progress, updated_keys))
+        self.save(progress)
+
+    def record_stats(self, progress, keys):
+        # le statistiche vengono salvate con il record_level/record_review che segue
+        self._changes.append(stats_change(progress, keys))
+
+    def close(self):
+        pass
+
+
+# ---------------------- BACKEND CON GIORNALE ---------------------- #
+COMPACT_EVERY = 200
+
+class JournalProgressStore(JsonProgressStore):
+    """A JSON snapshot plus an append-only journal of changes.
+
+    Every record_* call appends one small, fsynced JSON line to the journal,
+    so its cost depends on the change and not on the size of the history.
+    Every COMPACT_EVERY records (and on save() and close()) the journal is
+    folded into a new snapshot. Records hold absolute values, so replaying
+    one that already made it into the snapshot is harmless, and a line torn
+    by a crash is skipped.
+
+    A compaction writes the snapshot and empties the journal under a single
+    exclusive lock. If another process appended or compacted since our last
+    load, the new snapshot is the saved one with the whole journal replayed,
+    so none of its records is lost.
+    """
+
+    def __init__(self, path, compact_every=COMPACT_EVERY):
+        super().__init__(path)
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self.pending = 0
+        # ultimo progresso visto, per compattare alla chiusura
+        self._progress = None
+        self._torn = False
+        # byte del giornale già presenti in memoria: oltre, sono di altri processi
+        self._journal_size = 0
+
+    def load(self):
+        # istantanea e giornale sotto lo stesso lock, mai a metà di una compattazione
+        with _file_lock(self.path, exclusive=False):
+            progress = self._load_locked()
+            progress["accuracy"] = dict(progress.get("accuracy") or {})
+            self._replay(progress)
+        return progress
+
+    def _replay(self, progress):
+        self.pending = 0
+        self._torn = False
+        self._journal_size = 0
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                # riga interrotta da un crash: la prossima aggiunta va a capo
+                self._torn = not line.endswith("\n")
+                try:
+                    change = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(change, dict):
+                    apply_change(progress, change)
+                    self.pending += 1
+        self._journal_size = os.path.getsize(self.journal_path)
+
+    def _journal_bytes(self):
+        try:
+            return os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            return 0
+
+    def save(self, progress):
+        # istantanea e svuotamento del giornale sotto un solo lock esclusivo,
+        # così nessuna aggiunta di un altro processo finisce tra i due
+        with _file_lock(self.path, exclusive=True):
+            self._save_locked(self._text(progress))
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "w", encoding="utf-8") as f:
+                    os.fsync(f.fileno())
+        self.pending = 0
+        self._torn = False
+        self._journal_size = 0
+
+    def _merged(self):
+        """The saved snapshot with the whole journal replayed, or None when
+        neither was written by another process since our last load or save."""
+        text, data = self._snapshot()
+        if data is None:
+            return None
+        if not self._diverged and text == self._last_text and self._journal_bytes() == self._journal_size:
+            return None
+        progress = self._document(data)
+        self._replay(progress)
+        return progress
+
+    def _append(self, progress, change):
+        line = json.dumps(change, ensure_ascii=False, separators=(",", ":"), default=_json_default) + "\n"
+        if self._torn:
+            line = "\n" + line
+            self._torn = False
+        with _file_lock(self.path, exclusive=True):
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        self._journal_size += len(line.encode("utf-8"))
+        self.pending += 1
+        self._progress = progress
+        if self.pending >= self.compact_every:
+            self.save(progress)
+
+    def record_level(self, progress, track, level_id, new_review_items, correct, total, passed):
+        if passed:
+            self._append(progress, level_change(progress, track, level_id, new_review_items))
+
+    def record_review(self, progress, updated_keys=()):
+        self._append(progress, review_change(progress, updated_keys))
+
+    def record_stats(self, progress, keys):
+        self._append(progress, stats_change(progress, keys))
+
+    def close(self):
+        if self.pending and self._progress is not None:
+            self.save(self._progress)
+
+
+# ---------------------- BACKEND SQLITE ---------------------- #
+# level_id è la chiave stabile del livello (records.py); i database creati
+# quando era la posizione la dichiarano INTEGER, ma SQLite vi conserva il
+# testo così com'è e load_progress converte le vecchie posizioni
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS completed_levels (
+    track TEXT NOT NULL,
+    level_id TEXT NOT NULL,
+    completed_at TEXT NOT NULL,
+    PRIMARY KEY (track, level_id)
+);
+CREATE TABLE IF NOT EXISTS review_items (
+    track TEXT NOT NULL,
+    item TEXT NOT NULL,
+    added_at TEXT NOT NULL,
+    PRIMARY KEY (track, item)
+);
+CREATE TABLE IF NOT EXISTS session_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    track TEXT NOT NULL,
+    level_id TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    finished_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS review_schedule (
+    item_key TEXT PRIMARY KEY,
+    ease REAL NOT NULL,
+    interval INTEGER NOT NULL,
+    reps INTEGER NOT NULL,
+    due INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS item_stats (
+    item_key TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    correct INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SqliteProgressStore:
+    """Progress kept in SQLite; every change is a small transactional write."""
+
+    def __init__(self, path, check_same_thread=True):
+        self.path = path
+        # check_same_thread=False solo se le chiamate sono già serializzate
+        # (es. il server, che salva da un thread del pool ma una volta alla volta)
+        self.conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def is_empty(self):
+        for table in ("completed_levels", "review_items", "review_schedule", "item_stats", "meta"):
+            if self.conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                return False
+        return True
+
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def load(self):
+        progress = default_progress()
+        for track, (completed_key, review_key) in TRACKS.items():
+            rows = self.conn.execute(
+                "SELECT level_id FROM completed_levels WHERE track = ? ORDER BY rowid", (track,)
+            )
+            progress[completed_key] = [r[0] for r in rows]
+            rows = self.conn.execute(
+                "SELECT item FROM review_items WHERE track = ? ORDER BY rowid", (track,)
+            )
+            progress[review_key] = [json.loads(r[0]) for r in rows]
+        progress["last_review"] = self.get_meta("last_review")
+        rows = self.conn.execute("SELECT item_key, ease, interval, reps, due FROM review_schedule")
+        progress["srs"] = {r[0]: list(r[1:]) for r in rows}
+        rows = self.conn.execute("SELECT item_key, attempts, correct FROM item_stats")
+        progress["accuracy"] = {r[0]: list(r[1:]) for r in rows}
+        return progress
+
+    def save(self, progress):
+        """Replace the whole stored progress (used by the migrator)."""
+        now = _now()
+        with self.conn:
+            self.conn.execute("DELETE FROM completed_levels")
+            self.conn.execute("DELETE FROM review_items")
+            self.conn.execute("DELETE FROM review_schedule")
+            self.conn.execute("DELETE FROM item_stats")
+            self._write_schedule(progress, progress.get("srs", {}))
+            accuracy = progress.get("accuracy", {})
+            if hasattr(accuracy, "to_json"):
+                accuracy = accuracy.to_json()
+            self.conn.executemany(
+                "INSERT INTO item_stats VALUES (?, ?, ?)",
+                [(key, *counts) for key, counts in accuracy.items()],
+            )
+            for track, (completed_key, review_key) in TRACKS.items():
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO completed_levels VALUES (?, ?, ?)",
+                    [(track, level_id, now) for level_id in progress.get(completed_key, [])],
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO review_items VALUES (?, ?, ?)",
+                    [(track, _encode_item(it), now) for it in progress.get(review_key, [])],
+                )
+            self._set_meta("last_review", progress.get("last_review"))
+
+    def record_level(self, progress, track, level_id, new_review_items, correct, total, passed):
+        now = _now()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO session_results (track, level_id, correct, total, passed, finished_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (track, level_id, correct, total, int(passed), now),
+            )
+            if passed:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO completed_levels VALUES (?, ?, ?)", (track, level_id, now)
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO review_items VALUES (?, ?, ?)",
+                    [(track, _encode_item(it), now) for it in new_review_items],
+                )
+                self._write_schedule(progress, [review_key(track, it) for it in new_review_items])
+
+    def record_review(self, progress, updated_keys=()):
+        with self.conn:
+            self._set_meta("last_review", progress.get("last_review"))
+            self._write_schedule(progress, updated_keys)
+
+    def record_stats(self, progress, keys):
+        accuracy = progress["accuracy"]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO item_stats VALUES (?, ?, ?)",
+                [(key, *accuracy.counts(key)) for key in keys],
+            )
+
+    def _write_schedule(self, progress, keys):
+        srs = progress.get("srs", {})
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO review_schedule VALUES (?, ?, ?, ?, ?)",
+            [(key, *srs[key]) for key in keys if key in srs],
+        )
+        self.conn.executemany(
+            "DELETE FROM review_schedule WHERE item_key = ?",
+            [(key,) for key in keys if key not in srs],
+        )
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self.conn.close()
+
+
+# ---------------------- MIGRAZIONE ---------------------- #
+def migrate_json_to_sqlite(json_path, store):
+    """Import a progress_b2.json file into an empty SQLite store, once.
+
+    Returns True when the import happened. A store that already holds data is
+    never overwritten, so calling this at every start is harmless.
+    """
+    if not os.path.exists(json_path) or not store.is_empty():
+        return False
+    progress = JsonProgressStore(json_path).load()
+    store.save(progress)
+    with store.conn:
+        store._set_meta("migrated_from", os.path.abspath(json_path))
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gestione del progresso di Deutschland B2")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="importa progress_b2.json in un database SQLite")
+    migrate.add_argument("json_path", nargs="?", default="progress_b2.json")
+    migrate.add_argument("db_path", nargs="?", default="progress_b2.db")
+    args = parser.parse_args()
+    if args.command == "migrate":
+        store = SqliteProgressStore(args.db_path)
+        try:
+            if migrate_json_to_sqlite(args.json_path, store):
+                print(f"Progresso importato da {args.json_path} in {args.db_path}")
+            else:
+                print("Nulla da importare: file assente o database già popolato.")
+        finally:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Banca delle domande di Deutschland B2.
+
+Le domande di un vocabolo dipendono solo da (vocabolo, variante, difficoltà):
+ogni variante è un seme fisso del generatore casuale, quindi la stessa
+terna produce sempre le stesse opzioni nello stesso ordine. Le sessioni
+scelgono a caso una delle QUESTION_VARIANTS varianti e le domande già
+generate vengono servite da una cache LRU limitata; un thread in background
+può prepararle in anticipo per i prossimi livelli.
+
+Le domande generate per un livello (le frasi da completare dei testi di
+comprensione, gli esercizi di grammatica) seguono lo stesso schema, con la chiave (livello, variante):
+le varianti sono GENERATED_VARIANTS, così ogni sessione ne vede di nuove.
+
+La variante finisce nel registro delle risposte, così un formatore può
+rivedere esattamente le domande viste da uno studente:
+
+    python3 question_bank.py replay vocabulary:Lager:plural --seed 3
+    python3 question_bank.py replay comprehension:comprensione-04-das-paket:cloze14 --seed 40213
+    python3 question_bank.py replay grammar:grammatica-03-verbo-sein-presente:sein.4 --seed 1977
+"""
+
+import argparse
+import random
+import threading
+from collections import OrderedDict
+
+from instrumentation import count
+
+BANK_SIZE = 4096
+QUESTION_VARIANTS = 8
+GENERATED_VARIANTS = 1 << 16
+
+
+def question_rng(word, seed, hard):
+    """The deterministic random generator of one question set."""
+    # i semi stringa sono stabili tra esecuzioni e versioni di Python
+    return random.Random(f"{word}:{seed}:{'h' if hard else 'n'}")
+
+
+def _word(item):
+    return item.word
+
+
+class QuestionBank:
+    """Bounded LRU of generated question sets, keyed by (key(item), seed, hard).
+
+    ``generate(item, seed, hard)`` builds the questions of an item, drawing
+    only from question_rng(). Items are vocabulary items (keyed by word)
+    unless another ``key`` is given. Cached sets are shared: callers must not
+    modify them.
+    """
+
+    def __init__(self, generate, maxsize=BANK_SIZE, key=_word):
+        self.generate = generate
+        self.maxsize = maxsize
+        self.key = key
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.cache)
+
+    def get(self, item, seed, hard=False):
+        key = (self.key(item), seed, hard)
+        with self.lock:
+            questions = self.cache.get(key)
+            if questions is not None:
+                self.cache.move_to_end(key)
+                count("question_bank.hit")
+                return questions
+        count("question_bank.miss")
+        questions = self.generate(item, seed, hard)
+        with self.lock:
+            self.cache[key] = questions
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+        return questions
+
+    def warm(self, items, seeds=range(QUESTION_VARIANTS), hard=False):
+        for item in items:
+            for seed in seeds:
+                self.get(item, seed, hard)
+
+    def prefetch(self, items, seeds=range(QUESTION_VARIANTS), hard=False):
+        """Warm the cache for ``items`` in a daemon thread; returns the thread."""
+        thread = threading.Thread(target=self.warm, args=(list(items), seeds, hard), daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    # import locale: game_cli usa questo modulo
+    import game_cli
+
+    parser = argparse.ArgumentParser(description="Banca delle domande di Deutschland B2")
+    sub = parser.add_subparsers(dest="command", required=True)
+    replay = sub.add_parser("replay", help="rigenera le domande viste da uno studente")
+    replay.add_argument("question", help="ID della domanda (es. vocabulary:Lager:plural) o del vocabolo")
+    replay.add_argument("--seed", type=int, required=True, help="variante registrata nel registro delle risposte")
+    replay.add_argument("--hard", action="store_true", help="la domanda era in modalità difficile")
+    args = parser.parse_args()
+
+    parts = args.question.split(":")
+    if parts[0] == "vocabulary" and len(parts) in (2, 3):
+        item = game_cli.get_vocab_by_word().get(parts[1])
+        if item is None:
+            parser.error(f"vocabolo sconosciuto: {parts[1]}")
+        questions = game_cli.vocab_questions(item, args.seed, args.hard)
+    elif parts[0] in ("comprehension", "grammar") and len(parts) in (2, 3):
+        level_id = game_cli.get_registry(parts[0]).id_of_key(parts[1])
+        if level_id is None:
+            parser.error(f"livello sconosciuto: {parts[1]}")
+        generated = game_cli.cloze_questions if parts[0] == "comprehension" else game_cli.level_drills
+        questions = generated(level_id, args.seed)
+    else:
+        parser.error("hanno varianti solo le domande di vocabolario (vocabulary:<parola>[:<tipo>]), "
+                     "le frasi da completare (comprehension:<chiave del livello>[:cloze<n>]) "
+                     "e gli esercizi di grammatica (grammar:<chiave del livello>[:<esercizio>])")
+    for q in questions:
+        if len(parts) == 3 and q["id"] != args.question:
+            continue
+        print(q["question"])
+        for idx, opt in enumerate(q["options"], start=1):
+            marker = "*" if idx - 1 == q["correct_index"] else " "
+            print(f" {marker} {idx}. {opt}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tipi dei record del catalogo di Deutschland B2.
+
+Vocaboli e livelli sono oggetti immutabili con campi fissi in __slots__
+invece di dizionari: niente chiavi ripetute né tabella hash per record (un
+vocabolo occupa circa un terzo di un dizionario equivalente) e l'accesso ai
+campi è un semplice attributo. Le stringhe dei vocaboli vengono internate,
+quindi le parole, gli articoli e le traduzioni ripetute (anche tra i vocaboli
+e i livelli che li contengono) sono in memoria una volta sola.
+
+Su disco (pacchetti di contenuti, file JSON) i record restano oggetti JSON:
+to_json() e from_json() convertono nei due sensi. Le domande dei livelli di
+grammatica e comprensione restano dizionari.
+
+Ogni livello ha una chiave stabile (key), ricavata dal contenuto e non dalla
+posizione nel catalogo: il nome per grammatica e comprensione
+("grammatica-03-verbo-sein-presente"), i vocaboli per i livelli di
+vocabolario, che hanno solo un nome numerato ("Lager+Palette"). I progressi
+salvano le chiavi, quindi aggiungere o riordinare livelli non li altera.
+"""
+
+import re
+from sys import intern
+
+_NON_WORD = re.compile(r"\W+")
+
+
+def slug(text):
+    """Lower-case ``text`` with every run of non-word characters turned into "-"."""
+    return _NON_WORD.sub("-", text.lower()).strip("-")
+
+
+class Record:
+    """Base of the catalogue records: fixed fields, read-only, compared by value."""
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} è in sola lettura")
+
+    def _values(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __reduce__(self):
+        # pickle e copy ricostruiscono il record con __init__: il protocollo
+        # predefinito imposterebbe i campi con setattr, che è vietato
+        return type(self), self._values()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def to_json(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class VocabularyItem(Record):
+    """A noun with its plural, article and Italian translation.
+
+    ``frequency`` is optional (0 when unknown) and only used to group levels.
+    """
+
+    __slots__ = ("word", "plural", "article", "translation", "frequency")
+
+    def __init__(self, word, plural, article, translation, frequency=0):
+        super().__init__(intern(word), intern(plural), intern(article), intern(translation), frequency)
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def to_json(self):
+        data = super().to_json()
+        if not self.frequency:
+            del data["frequency"]
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["word"], data["plural"], data["article"], data["translation"], data.get("frequency", 0))
+
+
+class VocabularyLevel(Record):
+    """A named group of vocabulary items, introduced together."""
+
+    __slots__ = ("name", "items")
+
+    def __init__(self, name, items):
+        super().__init__(name, tuple(items))
+
+    @property
+    def key(self):
+        return "+".join(it.word for it in self.items)
+
+    def to_json(self):
+        return {"name": self.name, "items": [it.to_json() for it in self.items]}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["name"], [VocabularyItem.from_json(it) for it in data["items"]])
+
+
+class GrammarLevel(Record):
+    """A grammar rule: its explanation and multiple-choice questions.
+
+    ``drills`` optionally names the kinds of generated exercises (see
+    grammar_drills.py) that practise the rule.
+    """
+
+    __slots__ = ("name", "explanation", "questions", "drills")
+
+    def __init__(self, name, explanation, questions, drills=()):
+        super().__init__(name, explanation, tuple(questions), tuple(drills))
+
+    @property
+    def key(self):
+        return slug(self.name)
+
+    def to_json(self):
+        data = {"name": self.name, "explanation": self.explanation, "questions": list(self.questions)}
+        if self.drills:
+            data["drills"] = list(self.drills)
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["name"], data["explanation"], data["questions"], data.get("drills", ()))
+
+
+class ComprehensionLevel(Record):
+    """A short German passage and the questions about it."""
+
+    __slots__ = ("name", "passage", "questions")
+
+    def __init__(self, name, passage, questions):
+        super().__init__(name, passage, tuple(questions))
+
+    @property
+    def key(self):
+        return slug(self.name)
+
+    def to_json(self):
+        return {"name": self.name, "passage": self.passage, "questions": list(self.questions)}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["name"], data["passage"], data["questions"])
+
+
+# il tipo dei record di ogni sezione del catalogo
+SECTION_TYPES = {
+    "warehouse_vocab": VocabularyItem,
+    "general_vocab": VocabularyItem,
+    "vocabulary_levels": VocabularyLevel,
+    "grammar_levels": GrammarLevel,
+    "comprehension_levels": ComprehensionLevel,
+}
+
+
+def to_records(sections):
+    """Convert catalogue sections of JSON objects into records."""
+    return {name: [SECTION_TYPES[name].from_json(rec) for rec in records] for name, records in sections.items()}
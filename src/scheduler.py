@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+Pianificatore di ripasso a ripetizione dilazionata (variante di SM-2).
+
+Ogni elemento da ripassare ha uno stato [facilità, intervallo in giorni,
+ripetizioni consecutive corrette, scadenza come timestamp Unix] salvato in
+progress["srs"] con una chiave "percorso:id" (es. "vocabulary:Lager",
+"grammar:grammatica-03-verbo-sein-presente": la parola o la chiave del
+livello, vedi records.py). Gli elementi scaduti vengono serviti da una coda di priorità
+(heap) ordinata per scadenza, così ogni estrazione costa O(log n) anche con
+centinaia di migliaia di elementi già studiati.
+
+La coda è una struttura derivata: vive in progress["_srs_queue"], non viene
+salvata e si ricostruisce in tempo lineare con rebuild_queue().
+"""
+
+import heapq
+
+DAY = 24 * 60 * 60
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# voti SM-2 assegnati a una risposta corretta o sbagliata
+GOOD = 4
+AGAIN = 1
+
+EASE, INTERVAL, REPS, DUE = range(4)
+
+
+def review_key(track, item_id):
+    return f"{track}:{item_id}"
+
+
+def parse_review_key(key):
+    """Split a review key into (track, item_id): a word or a level key."""
+    track, item_id = key.split(":", 1)
+    return track, item_id
+
+
+def rebuild_queue(progress):
+    """(Re)build the due-time heap from the stored per-item states."""
+    srs = progress.setdefault("srs", {})
+    queue = [(state[DUE], key) for key, state in srs.items()]
+    heapq.heapify(queue)
+    progress["_srs_queue"] = queue
+    return queue
+
+
+def _queue(progress):
+    if "_srs_queue" not in progress:
+        return rebuild_queue(progress)
+    return progress["_srs_queue"]
+
+
+def add_item(progress, key, now):
+    """Schedule a newly learned item as due immediately. Returns True if new."""
+    srs = progress.setdefault("srs", {})
+    if key in srs:
+        return False
+    queue = _queue(progress)
+    srs[key] = [DEFAULT_EASE, 0, 0, int(now)]
+    heapq.heappush(queue, (int(now), key))
+    return True
+
+
+def pop_due(progress, now, limit):
+    """Remove and return up to ``limit`` keys whose due time has passed.
+
+    Popped keys must be given back to grade() (or forget()), which pushes
+    them again with their new due time.
+    """
+    queue = _queue(progress)
+    srs = progress.get("srs", {})
+    due = []
+    while queue and len(due) < limit and queue[0][0] <= now:
+        when, key = heapq.heappop(queue)
+        state = srs.get(key)
+        # voce obsoleta: elemento dimenticato o ripianificato nel frattempo
+        if state is None or state[DUE] != when:
+            continue
+        due.append(key)
+    return due
+
+
+def next_due(progress):
+    """Return the earliest due timestamp, or None when nothing is scheduled."""
+    queue = _queue(progress)
+    srs = progress.get("srs", {})
+    while queue:
+        when, key = queue[0]
+        state = srs.get(key)
+        if state is not None and state[DUE] == when:
+            return when
+        heapq.heappop(queue)
+    return None
+
+
+def grade(progress, key, correct, now):
+    """Apply an SM-2 update for one answer and reschedule the item."""
+    state = progress["srs"][key]
+    quality = GOOD if correct else AGAIN
+    if quality < 3:
+        state[REPS] = 0
+        state[INTERVAL] = 1
+    else:
+        state[REPS] += 1
+        if state[REPS] == 1:
+            state[INTERVAL] = 1
+        elif state[REPS] == 2:
+            state[INTERVAL] = 6
+        else:
+            state[INTERVAL] = round(state[INTERVAL] * state[EASE])
+    state[EASE] = max(MIN_EASE, state[EASE] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    state[EASE] = round(state[EASE], 2)
+    state[DUE] = int(now) + state[INTERVAL] * DAY
+    heapq.heappush(_queue(progress), (state[DUE], key))
+    return state
+
+
+def forget(progress, key):
+    """Drop an item from the schedule (e.g. removed from the catalogue)."""
+    progress.get("srs", {}).pop(key, None)
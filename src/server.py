@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modalità server di Deutschland B2.
+
+Un solo processo ospita molti studenti contemporaneamente su un protocollo TCP
+a righe (va bene anche un semplice `nc` o `telnet`): ogni riga inviata dal
+server è un messaggio, ogni riga ricevuta è una risposta. Le sessioni di
+livello e di ripasso sono le stesse del gioco da terminale (i generatori
+*_session di game_cli); qui vengono guidate con I/O asincrono e ogni studente
+ha il proprio file di progresso nella cartella dei dati.
+
+Avvio:
+
+    python3 server.py --host 127.0.0.1 --port 8765 --data-dir progressi_server
+"""
+
+import argparse
+import asyncio
+import os
+
+import game_cli
+from engine import dispatch_steps
+from event_log import EventLogWriter
+from instrumentation import add_sink, profiled, sink_for
+from game_cli import (
+    comprehension_level_session,
+    daily_review_session,
+    get_registry,
+    grammar_level_session,
+    level_picker_session,
+    text_search_session,
+    vocab_level_session,
+)
+from profiles import BACKENDS, ProfileDirectory, valid_name
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_DATA_DIR = "progressi_server"
+EVENT_LOG_NAME = "events.jsonl"
+
+MAIN_MENU = [
+    "Percorso Vocabolario",
+    "Percorso Grammatica",
+    "Comprensione del testo",
+    "Ripasso quotidiano",
+    "Cerca nei testi",
+    "Esci",
+]
+
+
+class SessionClosed(Exception):
+    """The learner disconnected."""
+
+
+# ---------------------- MENU DELLA SESSIONE ---------------------- #
+def learner_session(progress):
+    """The main menu of one learner, as a session generator."""
+    while True:
+        sel = yield ("ask", "Menù principale:", MAIN_MENU)
+        if sel == 0:
+            registry = get_registry("vocabulary")
+            idx = yield from level_picker_session(registry, registry.completed(progress))
+            if idx is not None:
+                yield from vocab_level_session(idx, progress)
+        elif sel == 1:
+            registry = get_registry("grammar")
+            idx = yield from level_picker_session(registry, registry.completed(progress))
+            if idx is not None:
+                yield from grammar_level_session(idx, progress)
+        elif sel == 2:
+            registry = get_registry("comprehension")
+            idx = yield from level_picker_session(registry, registry.completed(progress))
+            if idx is not None:
+                yield from comprehension_level_session(idx, progress)
+        elif sel == 3:
+            yield from daily_review_session(progress)
+        elif sel == 4:
+            yield from text_search_session()
+        else:
+            yield ("say", "Auf Wiedersehen! Buono studio 👋")
+            return
+
+
+# ---------------------- DRIVER ASINCRONO ---------------------- #
+class LearnerConnection:
+    """Line-based I/O for one connected learner."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, text):
+        for line in text.split("\n"):
+            self.writer.write(line.encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+    async def receive(self):
+        try:
+            line = await self.reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            # riga oltre il limite dello stream: si chiude la sessione invece di far fallire il task
+            await self.send("Riga troppo lunga: connessione chiusa.")
+            raise SessionClosed()
+        if not line:
+            raise SessionClosed()
+        return line.decode("utf-8", errors="replace").strip()
+
+    async def read(self, prompt):
+        await self.send(prompt)
+        return await self.receive()
+
+    async def ask(self, question, options):
+        await self.send(question)
+        for idx, opt in enumerate(options, start=1):
+            await self.send(f"{idx}. {opt}")
+        while True:
+            await self.send(f"Scegli l'opzione corretta (1-{len(options)}):")
+            choice = await self.receive()
+            if choice.isdigit() and 1 <= int(choice) <= len(options):
+                return int(choice) - 1
+            await self.send("Scelta non valida. Riprova.")
+
+
+async def drive(session, progress, store, conn, events=None, learner=None):
+    """Run a session generator against a connection; store calls go to a thread."""
+    loop = asyncio.get_running_loop()
+    steps = dispatch_steps(session, progress, store, events, learner)
+    reply = None
+    while True:
+        try:
+            step = steps.send(reply)
+        except StopIteration as stop:
+            return stop.value
+        reply = None
+        kind = step[0]
+        if kind == "say":
+            await conn.send(step[1])
+        elif kind == "wait":
+            await conn.send(step[1])
+            await conn.receive()
+        elif kind == "ask":
+            reply = await conn.ask(step[1], step[2])
+        elif kind == "input":
+            reply = await conn.read(step[1])
+        elif kind == "store":
+            await loop.run_in_executor(None, step[1])
+
+
+class LearnerServer:
+    """Hosts many concurrent learner sessions, one progress store each.
+
+    The answers of all learners go to a single event log in the data folder.
+    """
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, backend="json"):
+        self.data_dir = data_dir
+        self.backend = backend
+        self.active = set()
+        # stessa struttura della cartella dei profili del gioco da terminale
+        self.profiles = ProfileDirectory(data_dir, backend)
+        self.events = EventLogWriter(os.path.join(data_dir, EVENT_LOG_NAME))
+
+    def open_store(self, name):
+        return self.profiles.open(name, check_same_thread=False)
+
+    async def ask_name(self, conn):
+        while True:
+            await conn.send("Come ti chiami? (lettere, numeri, - e _)")
+            name = await conn.receive()
+            if not valid_name(name):
+                await conn.send("Nome non valido. Riprova.")
+            elif name in self.active:
+                await conn.send("Questo studente è già collegato. Usa un altro nome.")
+            else:
+                return name
+
+    async def handle(self, reader, writer):
+        conn = LearnerConnection(reader, writer)
+        name = None
+        store = None
+        loop = asyncio.get_running_loop()
+        try:
+            await conn.send("✨ Benvenuto in Deutschland B2! ✨")
+            name = await self.ask_name(conn)
+            self.active.add(name)
+            store = self.open_store(name)
+            progress = await loop.run_in_executor(None, game_cli.load_progress, store)
+            game_cli.prefetch_questions(progress)
+            await drive(learner_session(progress), progress, store, conn, self.events, name)
+        except (SessionClosed, ConnectionError):
+            pass
+        finally:
+            if name is not None:
+                self.active.discard(name)
+            if store is not None:
+                # close() può compattare o salvare: come load_progress, fuori dal loop
+                await loop.run_in_executor(None, store.close)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self.events.close()
+
+
+async def serve(host, port, data_dir, backend):
+    learners = LearnerServer(data_dir, backend)
+    server = await learners.start(host, port)
+    addrs = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Server Deutschland B2 in ascolto su {addrs}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        learners.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server multi-studente di Deutschland B2")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--backend", choices=BACKENDS, default="json")
+    parser.add_argument("--stats", default="", help="file JSON dei tempi per fase (- per stamparli all'uscita)")
+    parser.add_argument("--profile", default="", help="salva un profilo cProfile dell'intera esecuzione")
+    args = parser.parse_args()
+    sink = sink_for(args.stats)
+    if sink is not None:
+        add_sink(sink)
+    try:
+        with profiled(args.profile):
+            asyncio.run(serve(args.host, args.port, args.data_dir, args.backend))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sink is not None:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
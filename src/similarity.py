@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+"""
+Indice di somiglianza per i distrattori di Deutschland B2.
+
+Un distrattore casuale si scarta spesso a colpo d'occhio; uno quasi giusto
+obbliga a conoscere davvero la risposta. Per ogni domanda l'indice propone
+i candidati più vicini alla risposta corretta secondo la distanza di
+modifica (Levenshtein):
+
+* plurali – le forme sbagliate ma plausibili della stessa parola, ottenute
+  applicando le altre regole del plurale tedesco (-e, -en/-n, -er, -s,
+  invariato e le varianti con Umlaut: Baum -> Baume, Bäumer, Bäume...), più i
+  plurali veri di altre parole che seguono la stessa regola e finiscono con
+  le stesse lettere. L'Umlaut va solo sulla vocale tematica dell'ultimo
+  membro del composto (Lagerhaus -> Lagerhäuser) e solo dove il tedesco lo
+  usa: mai nei derivati in -er o -ung né nei prestiti (Gabelstapler,
+  Lieferung, Container);
+* traduzioni – le traduzioni che condividono l'inizio o la fine della
+  risposta corretta, da tre lettere fino a una; se non bastano, un campione
+  qualsiasi del catalogo.
+
+Un candidato che potrebbe essere anch'esso giusto non viene mai proposto:
+le traduzioni che hanno una parola in comune con la risposta (Kiste, "cassa/
+scatola", e Schachtel, "scatola") e i plurali attestati della stessa parola
+(Kartons e Kartone, Lager e Läger). Le forme generate dalle regole vengono
+anche confrontate con le parole del catalogo: una forma che è un vocabolo
+vero non è un errore riconoscibile.
+
+I gruppi per regola e per prefisso/suffisso sono calcolati una volta sola;
+per ogni domanda si confronta solo un piccolo campione (MAX_CANDIDATES),
+quindi il costo non dipende dalla dimensione del catalogo.
+"""
+
+import random
+import re
+from functools import lru_cache
+
+MAX_CANDIDATES = 8
+AFFIX = 3
+
+_UMLAUT = str.maketrans("aouAOU", "äöüÄÖÜ")
+_VOWELS = re.compile(r"[aeiouyäöü]+", re.IGNORECASE)
+# suffissi plausibili: le parole che finiscono in -e/-el/-er/-en o in vocale
+# prendono al più -n o -s (Kisten, Lager, Autos), le altre anche -e/-en/-er
+# (Tische, Bilder); l'Umlaut segue le regole di _umlaut_suffixes
+_STRONG_SUFFIXES = ("", "e", "en", "er", "s")
+_WEAK_SUFFIXES = ("", "n", "s")
+_WEAK_ENDINGS = ("e", "el", "er")
+# -ung e i suffissi tonici dei prestiti (Regal, Paket, Karton): plurale senza Umlaut
+_NO_UMLAUT_ENDINGS = ("ung", "al", "at", "on", "or", "ur", "ent", "ant", "ion")
+
+# plurali alternativi attestati (Duden) di parole comuni, oltre a quelli del catalogo
+ALTERNATIVE_PLURALS = {
+    "Karton": ("Kartons", "Kartone"),
+    "Lager": ("Lager", "Läger"),
+    "Hubwagen": ("Hubwagen", "Hubwägen"),
+    "Wagen": ("Wagen", "Wägen"),
+    "Laden": ("Läden", "Laden"),
+    "Kasten": ("Kästen", "Kasten"),
+    "Bogen": ("Bogen", "Bögen"),
+    "Kragen": ("Kragen", "Krägen"),
+    "Balkon": ("Balkons", "Balkone"),
+    "Waggon": ("Waggons", "Waggone"),
+    "Park": ("Parks", "Parke"),
+    "Block": ("Blöcke", "Blocks"),
+    "Tunnel": ("Tunnel", "Tunnels"),
+    "Pizza": ("Pizzas", "Pizzen"),
+    "Komma": ("Kommas", "Kommata"),
+    "Atlas": ("Atlasse", "Atlanten"),
+}
+# parole delle traduzioni che non bastano a renderle sinonimi
+_STOPWORDS = frozenset((
+    "il", "lo", "la", "i", "gli", "le", "l", "un", "uno", "una", "di", "a", "da", "in", "con", "su",
+    "per", "del", "della", "dei", "delle", "al", "alla", "e", "o",
+))
+_TOKEN = re.compile(r"\w+")
+
+
+def umlaut(word):
+    """Umlaut the stem vowel of the compound head, or None.
+
+    The stem vowel is the last vowel before an -e/-el/-er/-en ending
+    (Baum -> Bäum, Lagerhaus -> Lagerhäus, Mantel -> Mäntel); it takes the
+    Umlaut only if it is a, o, u or au, so Arbeit, Container or Waage have none.
+    """
+    stem = word[:-2] if word.endswith(("el", "er", "en")) else word[:-1] if word.endswith("e") else word
+    vowels = _VOWELS.findall(stem)
+    if not vowels or vowels[-1].lower() not in ("a", "o", "u", "au"):
+        return None
+    i = stem.rindex(vowels[-1])
+    return word[:i] + word[i].translate(_UMLAUT) + word[i + 1:]
+
+
+def plural_rule(word, plural):
+    """Classify how ``plural`` is formed from ``word``: "=", "+en", "¨+er", "~" (irregular)..."""
+    if plural == word:
+        return "="
+    if plural.startswith(word):
+        return "+" + plural[len(word):]
+    umlauted = umlaut(word)
+    if umlauted and plural.startswith(umlauted):
+        return "¨+" + plural[len(umlauted):]
+    return "~"
+
+
+def _umlaut_suffixes(word, article):
+    low = word.lower()
+    # Umlaut senza desinenza solo per i maschili in -el/-en (Mäntel, Gärten):
+    # i nomi in -er sono quasi tutti derivati (Stapler, Arbeiter) e non lo prendono
+    if low.endswith(("el", "en")):
+        return ("",) if article in (None, "der") else ()
+    if low.endswith(("e", "er")) or low[-1:] in "aiouy":
+        return ()
+    if low.endswith(_NO_UMLAUT_ENDINGS) and len(_VOWELS.findall(low)) > 1:
+        return ()
+    # femminili solo -e (Städte), neutri solo -er (Häuser)
+    return {"die": ("e",), "das": ("er",)}.get(article, ("e", "er"))
+
+
+def plural_forms(word, article=None):
+    """Every plural a learner might guess for ``word`` (the correct one included).
+
+    Umlaut forms are only generated for the patterns German plurals really
+    use, taking the gender from ``article`` when it is given.
+    """
+    if word.endswith("en"):
+        suffixes = ("", "s")
+    elif word.endswith(_WEAK_ENDINGS) or word[-1:] in "aiouy":
+        suffixes = _WEAK_SUFFIXES
+    else:
+        suffixes = _STRONG_SUFFIXES
+    forms = [word + s for s in suffixes]
+    umlauted = umlaut(word)
+    if umlauted:
+        forms += [umlauted + s for s in _umlaut_suffixes(word, article)]
+    return forms
+
+
+@lru_cache(maxsize=None)
+def translation_tokens(translation):
+    """Content words of a translation ("addetto al picking" -> {"addetto", "picking"})."""
+    return frozenset(t for t in _TOKEN.findall(translation.lower()) if t not in _STOPWORDS)
+
+
+def edit_distance(a, b):
+    """Levenshtein distance between two strings.
+
+    Bit-parallel algorithm of Myers/Hyyrö: one pass over ``b`` with a few
+    integer operations per character, instead of the len(a) x len(b) table.
+    """
+    # il prefisso e il suffisso comuni non cambiano la distanza
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return len(a) + len(b)
+    peq = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = full, 0, len(a)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh = mh << 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+    return score
+
+
+def _affix_keys(low):
+    # chiavi di gruppo per inizio e fine, da AFFIX lettere fino a una
+    keys = []
+    for n in range(AFFIX, 0, -1):
+        keys += [("<", low[:n]), (">", low[-n:])]
+    return keys
+
+
+def _sample(group, k, rng):
+    return group if len(group) <= k else rng.sample(group, k)
+
+
+class SimilarityIndex:
+    """Near-miss distractors for plurals and translations, precomputed per group."""
+
+    def __init__(self, items):
+        plural_groups = {}
+        translation_groups = {}
+        translations = {}
+        # tutte le forme del catalogo e, per parola, i suoi plurali attestati
+        self.attested = set()
+        self.plurals_of = {word: set(plurals) for word, plurals in ALTERNATIVE_PLURALS.items()}
+        for it in items:
+            self.attested.update((it.word, it.plural))
+            self.plurals_of.setdefault(it.word, set()).add(it.plural)
+            plural = it.plural
+            key = (plural_rule(it.word, plural), plural[-2:])
+            plural_groups.setdefault(key, {})[plural] = None
+            translation = it.translation
+            for key in _affix_keys(translation.lower()):
+                translation_groups.setdefault(key, {})[translation] = None
+            translations[translation] = None
+        # dict come insieme ordinato dei valori distinti del gruppo
+        self.plural_groups = {key: list(group) for key, group in plural_groups.items()}
+        self.translation_groups = {key: list(group) for key, group in translation_groups.items()}
+        self.translations = list(translations)
+
+    def is_alternative(self, field, item, value):
+        """Whether ``value`` could also be a right answer for ``field`` of ``item``."""
+        own = getattr(item, field)
+        if value == own:
+            return True
+        if field == "plural":
+            return value in self.plurals_of.get(item.word, ())
+        return not translation_tokens(own).isdisjoint(translation_tokens(value))
+
+    def plural_candidates(self, item, rng=random):
+        plural = item.plural
+        group = self.plural_groups.get((plural_rule(item.word, plural), plural[-2:]), [])
+        # il singolare resta un buon distrattore, le altre forme vere no
+        generated = [f for f in plural_forms(item.word, item.article) if f == item.word or f not in self.attested]
+        return generated + _sample(group, MAX_CANDIDATES, rng)
+
+    def translation_candidates(self, item, rng=random):
+        candidates = {}
+        keys = _affix_keys(item.translation.lower())
+        # dall'inizio/fine più lunga alla più corta, finché il campione non basta
+        for i in range(0, len(keys), 2):
+            for key in keys[i:i + 2]:
+                for c in _sample(self.translation_groups.get(key, []), MAX_CANDIDATES, rng):
+                    if not self.is_alternative("translation", item, c):
+                        candidates[c] = None
+            if len(candidates) >= MAX_CANDIDATES:
+                break
+        else:
+            # nessuna traduzione abbastanza vicina: un campione qualsiasi
+            candidates.update(dict.fromkeys(_sample(self.translations, MAX_CANDIDATES, rng)))
+        return list(candidates)
+
+    def near_misses(self, field, item, k, rng=random):
+        """Up to ``k`` values of ``field`` closest to the item's own, never a right answer."""
+        own = getattr(item, field)
+        if field == "plural":
+            candidates = self.plural_candidates(item, rng)
+        else:
+            candidates = self.translation_candidates(item, rng)
+        # liste e non insiemi: con lo stesso seed si ottengono le stesse domande
+        candidates = [c for c in dict.fromkeys(candidates) if not self.is_alternative(field, item, c)]
+        # a parità di distanza l'ordine è casuale, così le domande variano
+        rng.shuffle(candidates)
+        candidates.sort(key=lambda c: edit_distance(own, c))
+        return candidates[:k]
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Validazione del catalogo di Deutschland B2.
+
+Controlla in un solo passaggio ogni vocabolo, livello e domanda e riporta
+tutti i problemi trovati, uno per riga in JSON:
+
+    {"section": "grammar_levels", "index": 7, "question": 0,
+     "code": "bad_correct_index", "message": "correct_index 3 fuori da 0..2"}
+
+Per i vocaboli vengono anche generate le domande della banca, normali e
+difficili, così emergono i problemi visibili solo a uno studente: opzioni
+duplicate, risposta corretta assente o non univoca, un'altra opzione
+anch'essa giusta (traduzioni con una parola in comune, plurali alternativi).
+Due livelli dello stesso percorso non possono avere la stessa chiave
+(records.py), con cui i progressi ricordano i livelli completati.
+Si controlla la prima variante; con --variants 8 tutte quelle che uno
+studente può vedere.
+
+Le sezioni vengono divise in blocchi e controllate da un pool di processi;
+ogni processo apre il catalogo per conto proprio (un pacchetto si mappa in
+memoria in un attimo), quindi ai processi passano solo gli intervalli.
+
+    python3 validator.py                         # catalogo in uso
+    python3 validator.py --pack content_b2.pack --workers 8
+    python3 validator.py --from-json catalogo.json --format text
+
+Il codice di uscita è 1 se ci sono problemi.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import game_cli
+from content_pack import SECTIONS, builtin_sections, open_pack
+from grammar_drills import DRILL_KINDS
+from question_bank import QUESTION_VARIANTS, question_rng
+from records import VocabularyItem, slug
+
+ARTICLES = ("der", "die", "das")
+VOCAB_FIELDS = ("word", "plural", "article", "translation")
+CHUNK_SIZE = 2000
+# sotto questa soglia il pool costa più di quanto fa risparmiare
+PARALLEL_FROM = 5000
+
+
+# ---------------------- SORGENTI ---------------------- #
+def load_sections(source):
+    """Catalogue sections for ("pack", path), ("json", path) or ("builtin", None).
+
+    Records are returned as plain JSON objects, so that broken ones can be
+    checked field by field.
+    """
+    kind, path = source
+    if kind == "pack":
+        return open_pack(path, raw=True)
+    if kind == "json":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return {name: data.get(name, []) for name in SECTIONS}
+    return {name: [rec.to_json() for rec in records] for name, records in builtin_sections().items()}
+
+
+# il catalogo da controllare, così com'è
+_catalogue = {}
+
+
+def _usable(item):
+    return (
+        isinstance(item, dict)
+        and all(isinstance(item.get(field), str) and item[field].strip() for field in VOCAB_FIELDS)
+        and item["article"] in ARTICLES
+    )
+
+
+def activate(source):
+    """Load ``source`` for checking; game_cli gets the vocabulary without broken words.
+
+    The distractor indexes need every word to have all its fields: the broken
+    ones are reported by the checks, not allowed to break every question.
+    """
+    sections = load_sections(source)
+    _catalogue.clear()
+    _catalogue.update(sections)
+    usable = {name: [] for name in SECTIONS}
+    # i livelli si controllano sui dati grezzi: al gioco servono solo i vocaboli
+    for name in ("warehouse_vocab", "general_vocab"):
+        usable[name] = [VocabularyItem.from_json(it) for it in sections[name] if _usable(it)]
+    game_cli.install_catalogue(usable)
+    return sections
+
+
+# ---------------------- CONTROLLI ---------------------- #
+def _problem(section, index, code, message, **extra):
+    problem = {"section": section, "index": index, "code": code, "message": message}
+    problem.update(extra)
+    return problem
+
+
+def check_question(q, where):
+    """Problems of one multiple-choice question; ``where`` is merged into each."""
+    problems = []
+
+    def report(code, message):
+        problems.append(dict(where, code=code, message=message))
+
+    if not isinstance(q, dict):
+        report("bad_question", "la domanda non è un oggetto")
+        return problems
+    if not isinstance(q.get("question"), str) or not q["question"].strip():
+        report("empty_question", "testo della domanda mancante")
+    options = q.get("options")
+    if not isinstance(options, list) or len(options) < 2:
+        report("too_few_options", "servono almeno due opzioni")
+        return problems
+    if any(not isinstance(opt, str) or not opt.strip() for opt in options):
+        report("empty_option", "opzione vuota o non testuale")
+    duplicates = sorted({opt for opt in options if options.count(opt) > 1}, key=str)
+    if duplicates:
+        report("duplicate_options", f"opzioni ripetute: {duplicates}")
+    index = q.get("correct_index")
+    if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index < len(options):
+        report("bad_correct_index", f"correct_index {index!r} fuori da 0..{len(options) - 1}")
+    return problems
+
+
+def check_vocab_item(section, index, item, variants=QUESTION_VARIANTS):
+    problems = []
+    if not isinstance(item, dict):
+        return [_problem(section, index, "bad_item", "il vocabolo non è un oggetto")]
+    for field in VOCAB_FIELDS:
+        if not isinstance(item.get(field), str) or not item[field].strip():
+            problems.append(_problem(section, index, "missing_field", f"campo '{field}' mancante o vuoto"))
+    if problems:
+        return problems
+    if item["article"] not in ARTICLES:
+        return [_problem(section, index, "bad_article", f"articolo {item['article']!r} non è der/die/das")]
+    # le domande esattamente come le vedrebbe uno studente, per ogni variante
+    # (generate direttamente, senza riempire la cache della banca)
+    record = VocabularyItem.from_json(item)
+    for hard in (False, True):
+        for seed in range(variants):
+            try:
+                questions = game_cli.generate_vocab_questions(record, hard, question_rng(record.word, seed, hard))
+            except Exception as exc:
+                problems.append(_problem(section, index, "generation_failed", f"{type(exc).__name__}: {exc}"))
+                return problems
+            for q in questions:
+                where = {"section": section, "index": index, "question": q["id"], "seed": seed, "hard": hard}
+                problems += check_question(q, where)
+                expected = getattr(record, q["id"].rsplit(":", 1)[1])
+                if q["options"].count(expected) != 1:
+                    problems.append(dict(where, code="answer_not_unique",
+                                         message=f"la risposta {expected!r} compare {q['options'].count(expected)} volte"))
+                field = q["id"].rsplit(":", 1)[1]
+                if field in ("plural", "translation"):
+                    # sinonimi e plurali alternativi: un'altra opzione sarebbe giusta
+                    similarity = game_cli.get_similarity_index()
+                    overlapping = [opt for opt in q["options"]
+                                   if opt != expected and similarity.is_alternative(field, record, opt)]
+                    if overlapping:
+                        problems.append(dict(where, code="ambiguous_option",
+                                             message=f"anche {overlapping} sarebbe una risposta giusta per {expected!r}"))
+    # una volta segnalato un problema per variante basta per vocabolo
+    unique = {}
+    for p in problems:
+        unique.setdefault((p["code"], p.get("question")), p)
+    return list(unique.values())
+
+
+def check_level(section, index, level):
+    if not isinstance(level, dict):
+        return [_problem(section, index, "bad_level", "il livello non è un oggetto")]
+    problems = []
+    if not isinstance(level.get("name"), str) or not level["name"].strip():
+        problems.append(_problem(section, index, "missing_field", "nome del livello mancante"))
+    if section == "vocabulary_levels":
+        items = level.get("items")
+        if not isinstance(items, list) or not items:
+            problems.append(_problem(section, index, "no_items", "livello senza vocaboli"))
+            return problems
+        vocab_by_word = game_cli.get_vocab_by_word()
+        for it in items:
+            word = it.get("word") if isinstance(it, dict) else None
+            if not _usable(it) or vocab_by_word.get(word) != VocabularyItem.from_json(it):
+                problems.append(_problem(section, index, "unknown_item",
+                                         f"vocabolo {word!r} assente o diverso dal catalogo"))
+        return problems
+    text_field = "explanation" if section == "grammar_levels" else "passage"
+    if not isinstance(level.get(text_field), str) or not level[text_field].strip():
+        problems.append(_problem(section, index, "missing_field", f"campo '{text_field}' mancante o vuoto"))
+    if section == "grammar_levels":
+        drills = level.get("drills", [])
+        unknown = [kind for kind in drills if kind not in DRILL_KINDS] if isinstance(drills, list) else [drills]
+        if unknown:
+            problems.append(_problem(section, index, "unknown_drill", f"tipi di esercizio sconosciuti: {unknown!r}"))
+    questions = level.get("questions")
+    if not isinstance(questions, list) or not questions:
+        problems.append(_problem(section, index, "no_questions", "livello senza domande"))
+        return problems
+    for qi, q in enumerate(questions):
+        problems += check_question(q, {"section": section, "index": index, "question": qi})
+    return problems
+
+
+def check_range(task):
+    """Check records [start, stop) of a section of the active catalogue."""
+    section, start, stop, variants = task
+    records = _catalogue[section]
+    problems = []
+    for index in range(start, stop):
+        if section in ("warehouse_vocab", "general_vocab"):
+            problems += check_vocab_item(section, index, records[index], variants)
+        else:
+            problems += check_level(section, index, records[index])
+    return problems
+
+
+def _level_key(section, level):
+    # come la proprietà key dei livelli in records.py, sull'oggetto JSON
+    if section == "vocabulary_levels":
+        items = level.get("items")
+        words = [it.get("word") for it in items if isinstance(it, dict)] if isinstance(items, list) else []
+        return "+".join(w for w in words if isinstance(w, str)) or None
+    name = level.get("name")
+    return slug(name) if isinstance(name, str) and name.strip() else None
+
+
+def check_duplicates():
+    """Words defined more than once, and levels of a track sharing a key.
+
+    The progress files store a level by its key, so two levels with the same
+    key would share their completion.
+    """
+    seen = {}
+    problems = []
+    for section in ("warehouse_vocab", "general_vocab"):
+        for index, item in enumerate(_catalogue[section]):
+            word = item.get("word") if isinstance(item, dict) else None
+            if not isinstance(word, str):
+                continue
+            if word in seen:
+                first = seen[word]
+                problems.append(_problem(section, index, "duplicate_word",
+                                         f"{word!r} già definito in {first[0]}[{first[1]}]"))
+            else:
+                seen[word] = (section, index)
+    for section in ("vocabulary_levels", "grammar_levels", "comprehension_levels"):
+        seen = {}
+        for index, level in enumerate(_catalogue[section]):
+            key = _level_key(section, level) if isinstance(level, dict) else None
+            if key is None:
+                continue
+            if key in seen:
+                problems.append(_problem(section, index, "duplicate_level",
+                                         f"stessa chiave {key!r} del livello {section}[{seen[key]}]"))
+            else:
+                seen[key] = index
+    return problems
+
+
+# ---------------------- ESECUZIONE ---------------------- #
+def tasks(sections, chunk_size, variants):
+    for section in SECTIONS:
+        n = len(sections[section])
+        for start in range(0, n, chunk_size):
+            yield section, start, min(start + chunk_size, n), variants
+
+
+def validate(source, workers=None, chunk_size=CHUNK_SIZE, variants=1):
+    """Validate a catalogue source; returns (problems, records checked per section)."""
+    sections = activate(source)
+    counts = {name: len(sections[name]) for name in SECTIONS}
+    problems = check_duplicates()
+    work = list(tasks(sections, chunk_size, variants))
+    if workers == 1 or sum(counts.values()) < PARALLEL_FROM:
+        for task in work:
+            problems += check_range(task)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=activate, initargs=(source,)) as pool:
+            for chunk in pool.map(check_range, work):
+                problems += chunk
+    return problems, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valida il catalogo di Deutschland B2")
+    parser.add_argument("--pack", help="pacchetto di contenuti da validare")
+    parser.add_argument("--from-json", help="file JSON con le sezioni del catalogo")
+    parser.add_argument("--workers", type=int, default=None, help="processi paralleli (predefinito: CPU)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--variants", type=int, default=1,
+                        help=f"varianti delle domande generate per vocabolo, normali e difficili (max {QUESTION_VARIANTS})")
+    parser.add_argument("--format", choices=("jsonl", "json", "text"), default="jsonl")
+    args = parser.parse_args()
+
+    if args.pack and args.from_json:
+        parser.error("usa --pack oppure --from-json, non entrambi")
+    if args.pack:
+        source = ("pack", args.pack)
+    elif args.from_json:
+        source = ("json", args.from_json)
+    elif os.path.exists(game_cli.CONTENT_PACK):
+        source = ("pack", game_cli.CONTENT_PACK)
+    else:
+        source = ("builtin", None)
+    for path in (args.pack, args.from_json):
+        if path and not os.path.exists(path):
+            parser.error(f"file non trovato: {path}")
+
+    problems, counts = validate(source, args.workers, args.chunk_size, args.variants)
+    if args.format == "json":
+        print(json.dumps({"checked": counts, "problems": problems}, ensure_ascii=False, indent=2))
+    elif args.format == "jsonl":
+        for p in problems:
+            print(json.dumps(p, ensure_ascii=False))
+    else:
+        for p in problems:
+            where = f"{p['section']}[{p['index']}]" + (f" {p['question']}" if "question" in p else "")
+            print(f"{where}: {p['code']} – {p['message']}")
+    checked = ", ".join(f"{name}={n}" for name, n in counts.items())
+    print(f"{len(problems)} problemi ({checked})", file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+# i moduli del gioco si importano per nome, come quando si lancia src/game_cli.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
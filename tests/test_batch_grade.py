@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+
+import game_cli
+from batch_grade import grade_files, grade_sheet, new_progress
+
+
+def right_answers(level_id):
+    return [q["options"][q["correct_index"]] for q in game_cli.grammar_levels[level_id].questions]
+
+
+def test_grade_sheet_by_option_text():
+    sheet = {"sheet": "s1", "learner": "anna", "track": "grammar", "level": 0, "answers": right_answers(0)}
+    progress = new_progress()
+    result = grade_sheet(sheet, progress)
+    assert result["passed"] and result["correct"] == result["total"]
+    assert result["level"] == 0
+    assert game_cli.get_registry("grammar").completed(progress) == {0}
+
+    wrong = dict(sheet, answers=["nessuna"])
+    assert grade_sheet(wrong, new_progress())["correct"] == 0
+
+
+def test_bad_sheets_are_reported():
+    progress = new_progress()
+    assert "error" in grade_sheet({"sheet": "x", "track": "grammar", "level": 10_000}, progress)
+    assert "error" in grade_sheet({"sheet": "x", "track": "music", "level": 0}, progress)
+    assert "error" in grade_sheet({"sheet": "x", "track": "grammar", "level": 0, "answers": "die"}, progress)
+    assert grade_sheet(["not", "a", "sheet"], progress)["error"]
+
+
+def test_grade_files_share_progress_per_learner(tmp_path):
+    path = tmp_path / "fogli.jsonl"
+    lines = [
+        {"sheet": "a1", "learner": "anna", "track": "grammar", "level": 0, "answers": right_answers(0)},
+        {"sheet": "b1", "learner": "ben", "track": "grammar", "level": 1, "answers": right_answers(1)},
+        "riga rotta",
+    ]
+    path.write_text("\n".join(json.dumps(x) if isinstance(x, dict) else x for x in lines) + "\n", encoding="utf-8")
+    out = io.StringIO()
+    assert grade_files([str(path)], out) == 3
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["sheet"] for r in results] == ["a1", "b1", f"{path}:3"]
+    assert results[0]["passed"] and results[1]["passed"]
+    assert results[2]["error"] == "riga JSON non valida"
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+from cloze import ARTICLE_SLOTS, ClozeIndex
+from records import ComprehensionLevel, VocabularyItem
+
+VOCAB = [
+    VocabularyItem("Arbeit", "Arbeiten", "die", "lavoro"),
+    VocabularyItem("Straße", "Straßen", "die", "strada"),
+    VocabularyItem("Palette", "Paletten", "die", "pallet"),
+    VocabularyItem("Lager", "Lager", "das", "magazzino"),
+]
+LEVELS = [
+    ComprehensionLevel("Büro", "Im Büro arbeiten fünf Personen. Die Arbeiten im Lager sind fertig.", []),
+]
+
+
+def categories(index, level_id=0):
+    return {sentence[start:end]: category for sentence, start, end, category in index.gaps(level_id)}
+
+
+def test_verb_is_not_a_plural_gap():
+    found = categories(ClozeIndex(LEVELS, VOCAB))
+    assert "arbeiten" not in found
+    assert found["Arbeiten"] == "plural"
+    assert found["Lager"] == "das"
+
+
+def test_sentence_start_is_never_a_noun_gap():
+    index = ClozeIndex([ComprehensionLevel("x", "Paletten stehen hier. Wir zählen Paletten.", [])], VOCAB)
+    assert [(s, c) for s, _, _, c in index.gaps(0)] == [("Wir zählen Paletten.", "plural")]
+
+
+def test_article_distractors_never_fit_the_same_slot():
+    index = ClozeIndex(LEVELS, VOCAB)
+    rng = random.Random(1)
+    for article in ("dem", "einem", "der", "die"):
+        for _ in range(50):
+            for option in index.distractors(0, "article", article, 2, rng):
+                assert ARTICLE_SLOTS[option.lower()].isdisjoint(ARTICLE_SLOTS[article])
+
+
+def test_noun_distractors_agree_with_the_article():
+    vocab = VOCAB + [
+        VocabularyItem("Tisch", "Tische", "der", "tavolo"),
+        VocabularyItem("Regal", "Regale", "das", "scaffale"),
+        VocabularyItem("Lagerarbeiter", "Lagerarbeiter", "der", "magazziniere"),
+    ]
+    level = ComprehensionLevel("x", "Im Büro arbeiten die Lagerarbeiter. Er bringt den Chef zur Besprechung.", [])
+    index = ClozeIndex([level], vocab)
+    found = categories(index)
+    assert found["Büro"] == "noun:dem"
+    assert found["Lagerarbeiter"] == "plural"
+    rng = random.Random(2)
+    genders = {it.plural: "plural" for it in vocab}
+    genders.update((it.word, it.article) for it in vocab)
+    for _ in range(50):
+        # "im _____": solo maschili e neutri
+        assert {genders[w] for w in index.distractors(0, "noun:dem", "Büro", 2, rng)} <= {"der", "das"}
+        # "zur _____" (zu der): mai neutri
+        assert "das" not in {genders[w] for w in index.distractors(0, "noun:der", "Besprechung", 2, rng)}
+        # "den _____" al plurale è dativo: solo plurali in -n o -s
+        for w in index.distractors(0, "noun:den", "Chef", 2, rng):
+            assert genders[w] == "der" or w.endswith(("n", "s"))
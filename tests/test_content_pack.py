@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from content_pack import ContentPack, ContentPackError, builtin_sections, compile_pack, open_pack
+
+
+def test_pack_round_trip(tmp_path):
+    path = str(tmp_path / "content.pack")
+    sections = builtin_sections()
+    compile_pack(sections, path)
+    loaded = open_pack(path)
+    for name, records in sections.items():
+        assert list(loaded[name]) == list(records)
+    raw = open_pack(path, raw=True)
+    assert raw["warehouse_vocab"][0] == sections["warehouse_vocab"][0].to_json()
+
+
+def test_lazy_section_indexing(tmp_path):
+    path = str(tmp_path / "content.pack")
+    compile_pack({"numbers": [{"n": i} for i in range(5)]}, path)
+    numbers = ContentPack(path).section("numbers")
+    assert len(numbers) == 5
+    assert numbers[-1] == {"n": 4}
+    assert numbers[1:3] == [{"n": 1}, {"n": 2}]
+    # un record già letto non viene decodificato di nuovo
+    assert numbers[2] is numbers[2]
+    with pytest.raises(IndexError):
+        numbers[5]
+
+
+def test_invalid_packs_are_rejected(tmp_path):
+    path = tmp_path / "not-a.pack"
+    path.write_bytes(b"PK\x03\x04 zip, not a pack")
+    with pytest.raises(ContentPackError):
+        ContentPack(str(path))
+    compile_pack({"numbers": []}, str(path))
+    with pytest.raises(ContentPackError):
+        ContentPack(str(path)).section("grammar_levels")
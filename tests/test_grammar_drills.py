@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+
+from grammar_drills import DRILL_KINDS, DrillGenerator, compare, conjugate, declension
+from records import VocabularyItem
+
+VOCAB = [
+    VocabularyItem("Hund", "Hunde", "der", "cane"),
+    VocabularyItem("Kiste", "Kisten", "die", "cassa/scatola"),
+    VocabularyItem("Haus", "Häuser", "das", "casa"),
+]
+
+
+def test_conjugation_rules():
+    assert conjugate("sein") == ("bin", "bist", "ist", "sind", "seid", "sind")
+    assert conjugate("arbeiten")[:3] == ("arbeite", "arbeitest", "arbeitet")
+    assert conjugate("öffnen")[2] == "öffnet"
+    assert conjugate("reisen")[1] == "reist"
+    assert conjugate("liefern")[0] == "liefere"
+    assert conjugate("lächeln")[0] == "lächle"
+
+
+def test_declension():
+    hund, kiste, haus = (declension(it) for it in VOCAB)
+    assert hund["definite"] == ("der Hund", "den Hund", "dem Hund", "des Hunds")
+    assert kiste["indefinite"][2] == "einer Kiste"
+    assert haus["definite"][3] == "des Hauses"
+    assert hund["plural"][2] == "den Hunden"
+    assert kiste["plural"][2] == "den Kisten"
+
+
+def test_comparison():
+    assert compare("gut") == ("besser", "am besten")
+    assert compare("alt") == ("älter", "am ältesten")
+    assert compare("dunkel") == ("dunkler", "am dunkelsten")
+    assert compare("teuer") == ("teurer", "am teuersten")
+    assert compare("leise") == ("leiser", "am leisesten")
+
+
+@pytest.mark.parametrize("kind", DRILL_KINDS)
+def test_every_drill_has_one_right_answer(kind):
+    generator = DrillGenerator(VOCAB)
+    rng = random.Random(3)
+    for _ in range(50):
+        q = generator.question(kind, rng)
+        options = q["options"]
+        assert len(options) == len(set(options)) >= 2
+        assert 0 <= q["correct_index"] < len(options)
+
+
+def test_noun_drills_need_vocabulary():
+    assert DrillGenerator().question("dative") is None
+    with pytest.raises(ValueError):
+        DrillGenerator(VOCAB).question("passive")
+
+
+def test_questions_are_distinct():
+    questions = DrillGenerator(VOCAB).questions(["sein"], 6, random.Random(0))
+    assert len({q["drill"] for q in questions}) == len(questions) == 6
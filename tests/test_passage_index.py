@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+from passage_index import PassageIndex
+from records import ComprehensionLevel, VocabularyItem
+
+VOCAB = [
+    VocabularyItem("Arbeit", "Arbeiten", "die", "lavoro"),
+    VocabularyItem("Gut", "Güter", "das", "bene/merce"),
+    VocabularyItem("Buch", "Bücher", "das", "libro"),
+]
+LEVELS = [
+    ComprehensionLevel("Büro", "Im Büro arbeiten fünf Personen. Der Chef lobt die Arbeit. Die Arbeiten sind fertig.", []),
+    ComprehensionLevel("Bibliothek", "Das Essen ist gut. Wir lesen die Bücher. Bücher sind teuer.", []),
+]
+INDEX = PassageIndex(LEVELS, VOCAB)
+
+
+def test_verb_is_not_a_noun_plural():
+    # "arbeiten" (verbo) non è il plurale di Arbeit, "Arbeiten" sì
+    assert INDEX.examples("Arbeit", 5) == ["Der Chef lobt die Arbeit.", "Die Arbeiten sind fertig."]
+
+
+def test_adjective_is_not_a_noun():
+    assert INDEX.examples("Gut") == []
+
+
+def test_plural_forms_lead_to_the_lemma():
+    assert INDEX.examples("Buch") == ["Wir lesen die Bücher."]
+    assert INDEX.lemma("bücher") == "Buch"
+
+
+def test_search_finds_verbs_and_nouns():
+    assert INDEX.search("arbeiten") == [(0, 0), (0, 1), (0, 2)]
+    assert INDEX.search("fünf Personen") == [(0, 0)]
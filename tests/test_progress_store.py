@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+from adaptive import AccuracyTable
+from progress_store import (
+    JournalProgressStore,
+    JsonProgressStore,
+    SqliteProgressStore,
+    default_progress,
+    migrate_json_to_sqlite,
+)
+
+SRS_STATE = [2.5, 1, 1, 1_760_086_400]
+
+
+def record_levels(store, progress, levels):
+    # come una sessione: prima il progresso in memoria, poi il giornale
+    for level_id in levels:
+        progress["grammar_completed"].append(level_id)
+        progress["review_grammar"].append(level_id)
+        progress["srs"][f"grammar:{level_id}"] = SRS_STATE
+        store.record_level(progress, "grammar", level_id, [level_id], 5, 5, True)
+
+
+def test_journal_replay_skips_truncated_last_line(tmp_path):
+    path = str(tmp_path / "progress.json")
+    store = JournalProgressStore(path, compact_every=100)
+    progress = store.load()
+    record_levels(store, progress, [0, 1])
+    # un crash a metà scrittura lascia l'ultima riga troncata
+    with open(store.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op":"level","track":"grammar","level":2,"rev')
+
+    store = JournalProgressStore(path, compact_every=100)
+    progress = store.load()
+    assert progress["grammar_completed"] == [0, 1]
+    assert progress["review_grammar"] == [0, 1]
+    assert sorted(progress["srs"]) == ["grammar:0", "grammar:1"]
+
+    # la riga successiva non si fonde con quella troncata
+    record_levels(store, progress, [3])
+    progress = JournalProgressStore(path, compact_every=100).load()
+    assert progress["grammar_completed"] == [0, 1, 3]
+    with open(store.journal_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert json.loads(lines[-1])["level"] == 3
+
+
+def test_save_folds_journal_into_snapshot(tmp_path):
+    path = str(tmp_path / "progress.json")
+    store = JournalProgressStore(path, compact_every=100)
+    progress = store.load()
+    record_levels(store, progress, [0])
+    store.close()
+    with open(store.journal_path, encoding="utf-8") as f:
+        assert f.read() == ""
+    assert JournalProgressStore(path).load()["grammar_completed"] == [0]
+
+
+def test_json_save_keeps_changes_saved_by_another_process(tmp_path):
+    path = str(tmp_path / "progress.json")
+    # due chioschi caricano lo stesso file
+    first = JsonProgressStore(path)
+    second = JsonProgressStore(path)
+    progress_a = first.load()
+    progress_b = second.load()
+    record_levels(first, progress_a, ["a"])
+    record_levels(second, progress_b, ["b"])
+    record_levels(first, progress_a, ["c"])
+
+    progress = JsonProgressStore(path).load()
+    assert progress["grammar_completed"] == ["a", "b", "c"]
+    assert sorted(progress["srs"]) == ["grammar:a", "grammar:b", "grammar:c"]
+
+
+def test_journal_compaction_keeps_records_of_another_process(tmp_path):
+    path = str(tmp_path / "progress.json")
+    first = JournalProgressStore(path, compact_every=100)
+    second = JournalProgressStore(path, compact_every=100)
+    progress_a = first.load()
+    progress_b = second.load()
+    record_levels(first, progress_a, ["a"])
+    record_levels(second, progress_b, ["b"])
+    first.save(progress_a)
+    record_levels(second, progress_b, ["c"])
+    second.save(progress_b)
+
+    progress = JournalProgressStore(path).load()
+    assert sorted(progress["grammar_completed"]) == ["a", "b", "c"]
+    assert sorted(progress["srs"]) == ["grammar:a", "grammar:b", "grammar:c"]
+
+
+def test_json_corrupt_file_is_recovered_from_backup(tmp_path):
+    path = str(tmp_path / "progress.json")
+    store = JsonProgressStore(path)
+    progress = store.load()
+    record_levels(store, progress, ["a"])
+    record_levels(store, progress, ["b"])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"grammar_completed": [')
+
+    store = JsonProgressStore(path)
+    progress = store.load()
+    assert store.recovered_from == path + ".bak"
+    assert store.corrupt_copy and os.path.exists(store.corrupt_copy)
+    # la copia di sicurezza è la versione precedente all'ultimo salvataggio
+    assert progress["grammar_completed"] == ["a"]
+
+
+def test_sqlite_records_round_trip(tmp_path):
+    store = SqliteProgressStore(str(tmp_path / "progress.db"))
+    progress = default_progress()
+    progress["accuracy"] = AccuracyTable()
+    record_levels(store, progress, ["a"])
+    store.record_level(progress, "grammar", "b", [], 1, 5, False)
+    progress["accuracy"].record("grammar:a", True)
+    store.record_stats(progress, ["grammar:a"])
+    progress["last_review"] = "2026-10-18"
+    progress["srs"].pop("grammar:a")
+    store.record_review(progress, ["grammar:a"])
+    store.close()
+
+    store = SqliteProgressStore(str(tmp_path / "progress.db"))
+    loaded = store.load()
+    assert loaded["grammar_completed"] == ["a"]
+    assert loaded["review_grammar"] == ["a"]
+    assert loaded["srs"] == {}
+    assert loaded["accuracy"] == {"grammar:a": [1, 1]}
+    assert loaded["last_review"] == "2026-10-18"
+    assert store.conn.execute("SELECT COUNT(*) FROM session_results").fetchone()[0] == 2
+    store.close()
+
+
+def test_migration_runs_once(tmp_path):
+    json_path = str(tmp_path / "progress.json")
+    JsonProgressStore(json_path).save(dict(default_progress(), grammar_completed=["a"]))
+    store = SqliteProgressStore(str(tmp_path / "progress.db"))
+    assert migrate_json_to_sqlite(json_path, store)
+    assert store.load()["grammar_completed"] == ["a"]
+    assert store.get_meta("migrated_from") == os.path.abspath(json_path)
+    assert not migrate_json_to_sqlite(json_path, store)
+    store.close()
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import pickle
+
+import pytest
+
+from records import GrammarLevel, VocabularyItem, VocabularyLevel
+
+ITEM = VocabularyItem("Lager", "Lager", "das", "magazzino", 12)
+RECORDS = [
+    ITEM,
+    VocabularyLevel("Magazzino 1", [ITEM]),
+    GrammarLevel("sein", "Il verbo sein...", [{"question": "ich _____", "options": ["bin", "bist"], "correct_index": 0}], ["sein"]),
+]
+
+
+def test_pickle_round_trip():
+    for record in RECORDS:
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            clone = pickle.loads(pickle.dumps(record, protocol))
+            assert type(clone) is type(record)
+            assert clone == record
+
+
+def test_copy_and_deepcopy():
+    for record in RECORDS:
+        assert copy.copy(record) == record
+        assert copy.deepcopy(record) == record
+
+
+def test_still_read_only_after_copy():
+    clone = copy.copy(ITEM)
+    with pytest.raises(AttributeError):
+        clone.word = "Halle"
+    assert clone.word == "Lager"
@@ -0,0 +1,41 @@
+import game_cli
+from progress_store import default_progress
+from level_builder import build_vocabulary_levels
+from records import GrammarLevel
+
+
+def test_completed_level_survives_an_inserted_level():
+    levels = list(game_cli.get_registry("grammar").levels)
+    progress = default_progress()
+    game_cli.upgrade_progress(progress)
+    before = game_cli.LevelRegistry("grammar", levels)
+    before.mark_completed(progress, 2)
+    assert progress[before.completed_key] == {levels[2].key}
+
+    after = game_cli.LevelRegistry("grammar", [GrammarLevel("Grammatica 00: nuovo", "", [])] + levels)
+    assert after.completed(progress) == {3}
+
+
+def test_positional_progress_is_converted_to_keys():
+    registry = game_cli.get_registry("grammar")
+    progress = default_progress()
+    progress[registry.completed_key] = [0, 2]
+    assert game_cli.upgrade_progress(progress)
+    assert progress[registry.completed_key] == {registry.key(0), registry.key(2)}
+    assert registry.completed(progress) == {0, 2}
+
+
+def test_vocabulary_completion_survives_a_layout_change():
+    warehouse, general = game_cli.warehouse_vocab, game_cli.general_vocab
+    single = game_cli.LevelRegistry("vocabulary", build_vocabulary_levels(warehouse, general))
+    grouped = game_cli.LevelRegistry("vocabulary", build_vocabulary_levels(warehouse, general, 3, "article"))
+    progress = default_progress()
+    game_cli.upgrade_progress(progress)
+    first = grouped.levels[0]
+    for it in first.items[:-1]:
+        single.mark_completed(progress, single.id_of_key(it.word))
+    assert 0 not in grouped.completed(progress)
+
+    single.mark_completed(progress, single.id_of_key(first.items[-1].word))
+    assert 0 in grouped.completed(progress)
+    assert len(single.completed(progress)) == len(first.items)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from scheduler import DAY, DEFAULT_EASE, EASE, INTERVAL, MIN_EASE, REPS, add_item, grade, next_due, pop_due
+
+NOW = 1_760_000_000
+KEY = "vocabulary:Lager"
+
+
+def new_progress(*keys):
+    progress = {"srs": {}}
+    for key in keys:
+        add_item(progress, key, NOW)
+    return progress
+
+
+def test_interval_grows_with_correct_answers():
+    progress = new_progress(KEY)
+    intervals = [grade(progress, KEY, True, NOW)[INTERVAL] for _ in range(4)]
+    # 1 giorno, 6 giorni, poi intervallo precedente per la facilità
+    assert intervals == [1, 6, 15, 38]
+    state = progress["srs"][KEY]
+    assert state[REPS] == 4
+    assert state[EASE] == DEFAULT_EASE
+    assert next_due(progress) == NOW + 38 * DAY
+
+
+def test_lapse_resets_repetitions_and_interval():
+    progress = new_progress(KEY)
+    for _ in range(3):
+        grade(progress, KEY, True, NOW)
+    state = grade(progress, KEY, False, NOW)
+    assert state[REPS] == 0
+    assert state[INTERVAL] == 1
+    assert state[EASE] < DEFAULT_EASE
+    # dopo l'errore si riparte da 1 giorno, poi 6
+    assert grade(progress, KEY, True, NOW)[INTERVAL] == 1
+    assert grade(progress, KEY, True, NOW)[INTERVAL] == 6
+
+
+def test_ease_never_drops_below_minimum():
+    progress = new_progress(KEY)
+    for _ in range(10):
+        state = grade(progress, KEY, False, NOW)
+    assert state[EASE] == MIN_EASE
+
+
+def test_pop_due_skips_rescheduled_entries():
+    progress = new_progress(KEY, "grammar:3")
+    assert sorted(pop_due(progress, NOW, 10)) == ["grammar:3", KEY]
+    grade(progress, KEY, True, NOW)
+    grade(progress, "grammar:3", True, NOW)
+    # ripianificato due volte: la voce più vecchia nella coda va ignorata
+    grade(progress, KEY, True, NOW)
+    assert pop_due(progress, NOW + DAY, 10) == ["grammar:3"]
+    assert pop_due(progress, NOW + 6 * DAY, 10) == [KEY]
+    assert next_due(progress) is None
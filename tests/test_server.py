@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from event_log import iter_events
+from profiles import ProfileDirectory
+from server import EVENT_LOG_NAME, LearnerServer
+
+TIMEOUT = 30
+
+
+class Client:
+    """A learner on the other end of the socket, reading the server line by line."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.lines = []
+
+    @classmethod
+    async def connect(cls, port):
+        return cls(*await asyncio.open_connection("127.0.0.1", port))
+
+    async def line(self):
+        raw = await self.reader.readline()
+        assert raw, "il server ha chiuso la connessione"
+        self.lines.append(raw.decode("utf-8").rstrip("\n"))
+        return self.lines[-1]
+
+    async def until(self, text):
+        while text not in await self.line():
+            pass
+
+    async def send(self, text):
+        self.writer.write(text.encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+    async def login(self, name):
+        await self.until("Come ti chiami")
+        await self.send(name)
+
+    async def play_level(self, track):
+        """Play level 1 of ``track`` always answering 1, then leave."""
+        await self.until("Scegli l'opzione")
+        await self.send(track)
+        await self.until("Numero del livello")
+        await self.send("1")
+        menu = False
+        while True:
+            line = await self.line()
+            if line.startswith("Menù principale"):
+                menu = True
+            elif line.startswith("Premi Invio"):
+                await self.send("")
+            elif line.startswith("Scegli l'opzione"):
+                if menu:
+                    await self.send("6")
+                    break
+                await self.send("1")
+        await self.until("Auf Wiedersehen")
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def run_server(data_dir, scenario):
+    async def main():
+        learners = LearnerServer(str(data_dir))
+        server = await learners.start("127.0.0.1", 0)
+        try:
+            await asyncio.wait_for(scenario(server.sockets[0].getsockname()[1]), TIMEOUT)
+        finally:
+            server.close()
+            await server.wait_closed()
+            learners.close()
+
+    asyncio.run(main())
+
+
+def test_two_learners_and_duplicate_name(tmp_path):
+    async def scenario(port):
+        anna = await Client.connect(port)
+        await anna.login("anna")
+        await anna.until("Menù principale")
+        # anna è collegata: un secondo "anna" viene rifiutato
+        ben = await Client.connect(port)
+        await ben.login("anna")
+        await ben.until("già collegato")
+        await ben.login("ben")
+        await asyncio.gather(anna.play_level("2"), ben.play_level("1"))
+
+    run_server(tmp_path, scenario)
+    assert sorted(ProfileDirectory(str(tmp_path)).names()) == ["anna", "ben"]
+    answers = {}
+    for event in iter_events(str(tmp_path / EVENT_LOG_NAME)):
+        answers.setdefault(event["learner"], []).append(event["question"])
+    assert sorted(answers) == ["anna", "ben"]
+    assert all(q.startswith("grammar:grammatica-01-articoli-determinativi:") for q in answers["anna"])
+    assert all(q.startswith("vocabulary:") for q in answers["ben"])
+
+
+def test_overlong_line_closes_the_session(tmp_path):
+    async def scenario(port):
+        anna = await Client.connect(port)
+        await anna.login("anna")
+        await anna.until("Menù principale")
+        await anna.send("1" * 100_000)
+        await anna.until("Riga troppo lunga")
+        assert await anna.reader.readline() == b""
+        # il nome è di nuovo libero
+        again = await Client.connect(port)
+        await again.login("anna")
+        await again.until("Menù principale")
+        again.writer.close()
+        await again.writer.wait_closed()
+
+    run_server(tmp_path, scenario)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+from records import VocabularyItem
+from similarity import SimilarityIndex, edit_distance, plural_forms, plural_rule, umlaut
+
+VOCAB = [
+    VocabularyItem("Gabelstapler", "Gabelstapler", "der", "carrello elevatore"),
+    VocabularyItem("Lagerhaus", "Lagerhäuser", "das", "deposito"),
+    VocabularyItem("Kiste", "Kisten", "die", "cassa/scatola"),
+    VocabularyItem("Schachtel", "Schachteln", "die", "scatola"),
+    VocabularyItem("Karton", "Kartons", "der", "cartone"),
+    VocabularyItem("Paket", "Pakete", "das", "pacco"),
+    VocabularyItem("Baum", "Bäume", "der", "albero"),
+    VocabularyItem("Tisch", "Tische", "der", "tavolo"),
+]
+
+
+def test_umlaut_goes_on_the_stem_vowel_of_the_head():
+    assert umlaut("Baum") == "Bäum"
+    assert umlaut("Lagerhaus") == "Lagerhäus"
+    assert umlaut("Mantel") == "Mäntel"
+    assert umlaut("Gabelstapler") == "Gabelstäpler"
+    for word in ("Container", "Lagerarbeiter", "Kommissionierer", "Arbeit", "Waage"):
+        assert umlaut(word) is None
+
+
+def test_plural_forms_use_umlaut_only_where_german_does():
+    assert {"Bäume", "Bäumer"} <= set(plural_forms("Baum", "der"))
+    assert "Lagerhäuser" in plural_forms("Lagerhaus", "das")
+    assert "Mäntel" in plural_forms("Mantel", "der")
+    for word, article in (("Gabelstapler", "der"), ("Lieferung", "die"), ("Karton", "der"),
+                          ("Schachtel", "die"), ("Straße", "die"), ("Container", "der")):
+        assert not any(f != word and umlaut(word) and f.startswith(umlaut(word))
+                       for f in plural_forms(word, article)), word
+
+
+def test_plural_rule():
+    assert plural_rule("Lager", "Lager") == "="
+    assert plural_rule("Kiste", "Kisten") == "+n"
+    assert plural_rule("Haus", "Häuser") == "¨+er"
+    assert plural_rule("Mutter", "Mütter") == "¨+"
+
+
+def test_edit_distance():
+    assert edit_distance("Kisten", "Kisten") == 0
+    assert edit_distance("Baume", "Bäume") == 1
+    assert edit_distance("", "abc") == 3
+    assert edit_distance("kitten", "sitting") == 3
+
+
+def test_near_misses_never_offer_a_right_answer():
+    index = SimilarityIndex(VOCAB)
+    kiste, karton = VOCAB[2], VOCAB[4]
+    for seed in range(20):
+        rng = random.Random(seed)
+        assert "scatola" not in index.near_misses("translation", kiste, 3, rng)
+        assert "Kartone" not in index.near_misses("plural", karton, 3, rng)
+
+
+def test_every_translation_has_a_near_miss():
+    index = SimilarityIndex(VOCAB)
+    for it in VOCAB:
+        assert index.near_misses("translation", it, 1, random.Random(0)), it.word
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+import game_cli
+from validator import load_sections, validate
+
+
+@pytest.fixture(autouse=True)
+def restore_catalogue():
+    yield
+    game_cli.load_catalogue()
+
+
+def write_catalogue(tmp_path, sections):
+    path = tmp_path / "catalogo.json"
+    path.write_text(json.dumps(sections, ensure_ascii=False), encoding="utf-8")
+    return ("json", str(path))
+
+
+def codes(problems):
+    return {(p["section"], p["index"], p["code"]) for p in problems}
+
+
+def test_builtin_catalogue_is_valid():
+    problems, counts = validate(("builtin", None), workers=1)
+    assert problems == []
+    assert counts["grammar_levels"] > 0
+
+
+def test_problems_are_reported(tmp_path):
+    sections = load_sections(("builtin", None))
+    sections["general_vocab"].append(dict(sections["warehouse_vocab"][0]))
+    sections["warehouse_vocab"][1]["article"] = "dem"
+    sections["grammar_levels"][0]["questions"][0]["correct_index"] = 9
+    sections["grammar_levels"][1]["drills"] = ["passive"]
+    sections["comprehension_levels"].append(dict(sections["comprehension_levels"][0]))
+    problems, _ = validate(write_catalogue(tmp_path, sections), workers=1)
+    found = codes(problems)
+    assert ("general_vocab", len(sections["general_vocab"]) - 1, "duplicate_word") in found
+    assert ("grammar_levels", 0, "bad_correct_index") in found
+    assert ("grammar_levels", 1, "unknown_drill") in found
+    assert ("comprehension_levels", len(sections["comprehension_levels"]) - 1, "duplicate_level") in found
+    assert any(p["section"] == "warehouse_vocab" and p["index"] == 1 for p in problems)